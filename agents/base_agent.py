@@ -1,24 +1,23 @@
 import json
 import jsonschema
-from jsonschema import validate
-from typing import Any
+from typing import Any, Callable, Dict, Generator, Tuple
 from state.agent_state import AgentGraphState
-from services.model_service import ModelService
+from config.app_config import app_config
 from utils.log_utils import log_message
-from tools.tool_registry import (
-    get_tool_descriptions_by_category,
-    get_tool_names_by_category,
-)
+from utils.json_repair import repair_json
+from utils.metrics_utils import increment_counter
+from schemas.validators import get_validator
 from controllers.task_manager import TaskManager
-from controllers.tool_manager import ToolManager
+from controllers.agent_registry import AgentRegistry
 
 class Agent:
     def __init__(self, state: AgentGraphState, role: str, model_config: dict):
         self.state = state
         self.role = role
         self.task_manager = TaskManager(role)
-        self.tool_manager = ToolManager()
-        self.model_service = ModelService(model_config)
+        # State-independent components are shared across invocations, see AgentRegistry
+        self.tool_manager = AgentRegistry.get_tool_manager()
+        self.model_service = AgentRegistry.get_model_service(model_config)
         self.tool_names, self.tool_descriptions = self._get_agent_tools()
 
     def update_state(self, key: str, value: Any):
@@ -75,17 +74,7 @@ class Agent:
         """
         Get the tool names and descriptions available to the agent based on their role.
         """
-        if self.role == "ocp_engineer":
-            tool_names = get_tool_names_by_category("openshift")
-            tool_descriptions = get_tool_descriptions_by_category("openshift")
-        elif self.role == "vsphere_engineer":
-            tool_names = get_tool_names_by_category("vsphere_lifecycle")
-            tool_descriptions = get_tool_descriptions_by_category("vsphere_lifecycle")
-        else:
-            tool_names = []
-            tool_descriptions = []
-
-        return tool_names, tool_descriptions
+        return AgentRegistry.get_agent_tools(self.role)
 
     def invoke_model(self, sys_prompt: str, user_prompt: str, update_state:bool = True):
         """
@@ -107,6 +96,188 @@ class Agent:
         # Process the response
         return response_human_message, response_content
 
+    async def ainvoke_model(self, sys_prompt: str, user_prompt: str, update_state: bool = True):
+        """
+        Async counterpart of `invoke_model`, awaiting the model call instead of blocking the thread.
+        """
+        # Prepare the payload using the ModelService
+        payload = self.model_service.prepare_payload(sys_prompt, user_prompt)
+
+        # Invoke the model and get the response
+        response_json = await self.model_service.ainvoke_model(payload, self.role)
+
+        response_human_message, response_content = (
+            await self.model_service.aprocess_model_response(response_json, self.role)
+        )
+
+        if update_state:
+            self.update_state(f"{self.role}_response", response_content)
+
+        # Process the response
+        return response_human_message, response_content
+
+    def generate_validated_output(
+        self,
+        sys_prompt: str,
+        user_prompt: str,
+        schema: dict,
+        build_retry_prompt: Callable[[str], str] = None,
+        max_attempts: int = None,
+        update_state: bool = True,
+    ) -> Tuple[bool, Any, str]:
+        """
+        Invoke the model until its output matches a schema, within a bounded number of attempts.
+
+        An invalid output is first repaired locally (code fences, truncated brackets,
+        enum casing, schema defaults). Only if that fails is the model called again,
+        with the validation error as feedback.
+
+        Parameters:
+        - sys_prompt (str): The system prompt of the first attempt.
+        - user_prompt (str): The user prompt.
+        - schema (dict): The schema the output must match.
+        - build_retry_prompt (callable, optional): Builds the system prompt of the next
+          attempt from the feedback. Defaults to the unchanged system prompt.
+        - max_attempts (int, optional): Model calls allowed. Defaults to the config.
+        - update_state (bool): Append the valid output to `{role}_response`.
+
+        Returns:
+        - tuple: (bool, dict, str) whether a valid output was produced, the output and
+          the last validation message.
+        """
+        attempts = self._validated_output_attempts(
+            sys_prompt, user_prompt, schema, build_retry_prompt, max_attempts, update_state
+        )
+        try:
+            payload = next(attempts)
+            while True:
+                response_json = self.model_service.invoke_model(payload, self.role)
+                _, response_content = self.model_service.process_model_response(
+                    response_json, self.role
+                )
+                payload = attempts.send((response_json, response_content))
+        except StopIteration as done:
+            return done.value
+
+    async def agenerate_validated_output(
+        self,
+        sys_prompt: str,
+        user_prompt: str,
+        schema: dict,
+        build_retry_prompt: Callable[[str], str] = None,
+        max_attempts: int = None,
+        update_state: bool = True,
+    ) -> Tuple[bool, Any, str]:
+        """
+        Async counterpart of `generate_validated_output`, awaiting the model calls.
+        """
+        attempts = self._validated_output_attempts(
+            sys_prompt, user_prompt, schema, build_retry_prompt, max_attempts, update_state
+        )
+        try:
+            payload = next(attempts)
+            while True:
+                response_json = await self.model_service.ainvoke_model(payload, self.role)
+                _, response_content = await self.model_service.aprocess_model_response(
+                    response_json, self.role
+                )
+                payload = attempts.send((response_json, response_content))
+        except StopIteration as done:
+            return done.value
+
+    def _validated_output_attempts(
+        self,
+        sys_prompt: str,
+        user_prompt: str,
+        schema: dict,
+        build_retry_prompt: Callable[[str], str],
+        max_attempts: int,
+        update_state: bool,
+    ) -> Generator[Dict[str, Any], Tuple[Dict[str, Any], str], Tuple[bool, Any, str]]:
+        """
+        The attempts of `generate_validated_output`, without the model calls.
+
+        Yields the payload of every attempt and receives the model response and its
+        processed content in return, so the sync and async variants only differ by
+        how they call the model. Returns the result of `generate_validated_output`.
+        """
+        max_attempts = max_attempts or app_config.agents_config.max_output_attempts
+        validation_message = ""
+
+        for attempt in range(1, max_attempts + 1):
+            self.log_event("info", "⏳ Processing the request...")
+            payload = self.model_service.prepare_payload(sys_prompt, user_prompt)
+            response_json, response_content = yield payload
+
+            is_valid, json_response, validation_message = self._check_model_output(
+                response_content or response_json.get("response", ""), schema
+            )
+            if is_valid:
+                return self._accept_model_output(json_response, validation_message, update_state)
+
+            sys_prompt = self._prepare_retry(
+                attempt, max_attempts, validation_message, sys_prompt, build_retry_prompt
+            )
+
+        return False, None, validation_message
+
+    def _check_model_output(self, response: str, schema: dict) -> Tuple[bool, Any, str]:
+        """
+        Validate a raw model output, falling back to a local repair if it is invalid.
+        """
+        is_valid, json_response, validation_message = self.validate_model_output(response, schema)
+        if is_valid:
+            return is_valid, json_response, validation_message
+
+        repaired, fixes = repair_json(response, schema)
+        if repaired is None or not fixes:
+            return is_valid, json_response, validation_message
+
+        repaired_valid, repaired_response, repaired_message = self.validate_model_output(
+            json.dumps(repaired), schema
+        )
+        if not repaired_valid:
+            # Report the error left after the repair, it is the one the model must fix
+            return False, None, repaired_message
+
+        increment_counter("schema_repair.local")
+        increment_counter(f"schema_repair.local.{self.role}")
+        self.log_event(
+            "info", f"🩹 Repaired the {self.role} output locally ({', '.join(fixes)}), no model call needed."
+        )
+        return repaired_valid, repaired_response, repaired_message
+
+    def _accept_model_output(
+        self, json_response: Dict[str, Any], validation_message: str, update_state: bool
+    ) -> Tuple[bool, Any, str]:
+        if update_state:
+            self.update_state(f"{self.role}_response", json.dumps(json_response, indent=4))
+        return True, json_response, validation_message
+
+    def _prepare_retry(
+        self,
+        attempt: int,
+        max_attempts: int,
+        validation_message: str,
+        sys_prompt: str,
+        build_retry_prompt: Callable[[str], str],
+    ) -> str:
+        """
+        Log a failed attempt and return the system prompt of the next one.
+        """
+        self.log_event("error", f"❌ Invalid output received: {validation_message}")
+        if attempt >= max_attempts:
+            increment_counter("schema_repair.exhausted")
+            self.log_event(
+                "error", f"❌ No valid output from the model after {max_attempts} attempts."
+            )
+            return sys_prompt
+
+        increment_counter("schema_repair.reprompts")
+        feedback_value = f"Invalid response: {validation_message}. Please correct and try again."
+        self.log_event("info", f"Retrying the request with feedback: {feedback_value}")
+        return build_retry_prompt(feedback_value) if build_retry_prompt else sys_prompt
+
     def validate_model_output(self, response: dict, schema: dict):
         """
         Validate the planner's output against the predefined schema.
@@ -123,8 +294,8 @@ class Agent:
             # Parse the JSON response object
             json_response_object = json.loads(response)
 
-            # Perform schema validation
-            validate(instance=json_response_object, schema=schema)
+            # Perform schema validation with the schema's compiled validator
+            get_validator(schema).validate(json_response_object)
             self.log_event(
                 "info", f"📑 🟢 Model response for {self.role} validation passed."
             )
@@ -148,3 +319,9 @@ class Agent:
 
             # Return failure with detailed error information
             return False, None, f"{self.role} output validation failed. Field: {'.'.join(map(str, error_field)) if error_field else 'N/A'}, Error: {error_message}"
+
+        except json.JSONDecodeError as e:
+            self.log_event(
+                "error", f"🚨 Model response for {self.role} is not valid JSON: {str(e)}"
+            )
+            return False, None, f"{self.role} output is not valid JSON. Error: {str(e)}"
@@ -1,4 +1,5 @@
 from agents.react_agent import ReactAgent
+from controllers.task_scheduler import TaskScheduler
 from utils import task_utils
 from typing import Any, Dict
 
@@ -15,35 +16,40 @@ class EngineerAgent(ReactAgent):
             self.log_event("info", "✅ All tasks are completed.")
             return self.state
 
-        while self.task_manager.has_pending_tasks():
-            # Log and display the task checklist
-            task_checklist = self.task_manager.log_task_checklist()
-
-            # Process each pending task one by one
-            for task in self.task_manager.tasks:
-                task_id = task.get("task_id", "N/A")
-                task_name = task.get("task_name", "Unnamed Task")
-
+        # Log and display the task checklist
+        task_checklist = self.task_manager.log_task_checklist()
+
+        def reason_and_act(task: Dict[str, Any]) -> Dict[str, Any]:
+            task_id = task.get("task_id", "N/A")
+            task_name = task.get("task_name", "Unnamed Task")
+
+            self.log_event(
+                "info",
+                f"\n\n### 📝 Working on Task ID: {task_id} - {task_name}\n\n",
+            )
+            # Reason and act on the pending task
+            return self._reason_and_act(task_checklist, task)
+
+        # Process every ready task concurrently, then merge the results in task order
+        results = TaskScheduler(self.role).run(
+            self.task_manager.tasks,
+            task_utils.get_open_task_ids(self.state),
+            reason_and_act,
+        )
+
+        for task, result in results:
+            # Check if the task was completed successfully
+            if result:
+                # Update the task status to 'completed' via TaskManager
+                self.task_manager.update_task_status(task["task_id"], "completed")
+                self.update_state(f"{self.role}_response", result)
+            else:
+                # Handle task failure, the manager decides whether to reassign it
+                self.task_manager.update_task_status(task["task_id"], "failed")
                 self.log_event(
-                    "info",
-                    f"\n\n### 📝 Working on Task ID: {task_id} - {task_name}\n\n",
+                    "error",
+                    f"❌ Task {task.get('task_name', 'Unnamed Task')} failed.",
                 )
-                # Reason and act on the pending task
-                result = self._reason_and_act(task_checklist, task)
-
-                # Check if the task was completed successfully
-                if result:
-                    # Update the task status to 'completed' via TaskManager
-                    self.task_manager.update_task_status(task["task_id"], "completed")
-                    self.update_state(f"{self.role}_response", result)
-                else:
-                    # Handle task failure, potentially reattempt or mark as failed
-                    self.task_manager.update_task_status(task["task_id"], "failed")
-                    self.log_event(
-                        "error",
-                        f"❌ Task {task_name} failed. Reason: {result.get('reason', 'Unknown error')}",
-                    )
-                    break  # Optional: break if a task fails, or continue to the next task
 
         # Return the final state after all tasks are completed or failed
         return self.state
@@ -1,10 +1,16 @@
 from agents.base_agent import Agent
 from builders.prompt_builder import PromptBuilder
+from controllers.task_scheduler import TaskScheduler
+from config.app_config import app_config
 from utils import task_utils
-from typing import Any, Dict, List
+from utils.metrics_utils import increment_counter, observe_value
+from state.scratchpad import Scratchpad
+from tools.tool_registry import check_tool_success
+from typing import Any, Dict
 from schemas.engineer_schema import (
     engineer_output_schema,
     engineer_reflection_output_schema,
+    engineer_merged_output_schema,
 )
 import json
 
@@ -22,28 +28,37 @@ class JrEngineerAgent(Agent):
             self.log_event("info", "✅ All tasks are completed.")
             return self.state
 
-        # Process each pending task one by one
-        while self.task_manager.has_pending_tasks():
-            for task in self.task_manager.tasks:
-                task_id = task.get("task_id", "N/A")
-                task_name = task.get("task_name", "Unnamed Task")
+        if app_config.agents_config.get_engineer_mode(self.role) == "merged":
+            process_task = self.process_task_merged
+        else:
+            process_task = self.process_task
 
-                self.log_event(
-                    "info",
-                    f"\n\n### 📝 Working on Task ID: {task_id} - {task_name}\n\n",
-                )
-                self.process_task(task)
+        # Process every ready task concurrently, then merge the outputs in task order
+        results = TaskScheduler(self.role).run(
+            self.task_manager.tasks,
+            task_utils.get_open_task_ids(self.state),
+            process_task,
+        )
+        for task, reflect_output in results:
+            if reflect_output:
+                self.update_state(f"{self.role}_response", reflect_output)
 
         return self.state
 
-    def process_task(self, task: Dict[str, Any]):
-        """Process a single task by going through the think, act, and reflect phases."""
+    def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a single task by going through the think, act, and reflect phases.
+
+        Returns the task output once reflection succeeds, or None. The output is
+        not written to the state here since tasks run concurrently.
+        """
         task_id = task.get("task_id", "N/A")
         task_name = task.get("task_name", "Unnamed Task")
 
         # Log the start of task processing
         self.log_event("info", f"### 📝 Starting Task ID: {task_id} - {task_name}")
-        scratchpad = []
+        scratchpad = Scratchpad()
+        reflect_output = None
 
         # Keep track of whether reflection succeeds
         iteration_count = 0
@@ -52,6 +67,7 @@ class JrEngineerAgent(Agent):
         while iteration_count < max_iterations:
             iteration_count += 1
             self.log_event("info", f"🔄 Iteration {iteration_count} for Task ID: {task_id}")
+            scratchpad.new_step()
 
             # Step 1: Think phase
             self.log_event("info", f"🔍 [THINK] Initiating the Think phase for Task ID: {task_id}")
@@ -61,10 +77,15 @@ class JrEngineerAgent(Agent):
 
             # Step 2: Act phase
             self.log_event("info", f"🛠️ [ACT] Initiating the Act phase for Task ID: {task_id}")
-            success, act_usr_prompt = self.act_phase(think_response)
+            success, act_usr_prompt, tool_result = self.act_phase(think_response)
 
             if not success:
                 scratchpad.append(f"[ACT] Action failed in Act phase. Please reflect on next stes for task {task_name}.")
+            elif self._is_verified_success(task, think_response, tool_result):
+                reflect_output = self._complete_without_reflection(
+                    task, think_response, act_usr_prompt, "reflect_calls_avoided"
+                )
+                break
 
             # Step 3: Reflect phase
             self.log_event("info", f"💭 [REFLECT] Initiating the Reflect phase for Task ID: {task_id}")
@@ -87,7 +108,6 @@ class JrEngineerAgent(Agent):
                     "action_result": act_dict.get("action_result"),
                     "action_final_status": act_dict.get("tool_result_success"),
                 }
-                self.update_state(f"{self.role}_response", reflect_output)
                 self.log_event("info", f"✅ Task ID: {task_id} - {task_name} completed successfully after {iteration_count} iterations.")
                 break  # Break the loop when reflection succeeds
             else:
@@ -95,32 +115,204 @@ class JrEngineerAgent(Agent):
 
         # Log the completion of the task process
         self.log_event("info", f"✅ Task ID: {task_id} - {task_name} processed successfully.")
+        return reflect_output
+
+    def process_task_merged(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Process a single task with one model call per iteration.
+
+        The model chooses an action, the tool runs, and the next call both reflects
+        on the tool result and returns the next action or the final answer. A final
+        answer following a failed tool call is only accepted after a separate reflect
+        call confirms it.
+
+        Returns the task output once a final answer is accepted, or None.
+        """
+        task_id = task.get("task_id", "N/A")
+        task_name = task.get("task_name", "Unnamed Task")
+
+        self.log_event("info", f"### 📝 Starting Task ID: {task_id} - {task_name} (merged mode)")
+        scratchpad = Scratchpad()
+        usr_prompt = f"Solve this task: {task_name}"
+        last_action = None
+        last_act_result = None
+
+        iteration_count = 0
+        max_iterations = 5  # Ensure we don't loop indefinitely
+
+        while iteration_count < max_iterations:
+            iteration_count += 1
+            self.log_event("info", f"🔄 Iteration {iteration_count} for Task ID: {task_id}")
+            scratchpad.new_step()
+
+            # Step 1: Reflect on the last tool result, if any, and choose the next step
+            self.log_event("info", f"🔍 [STEP] Reflecting and choosing the next step for Task ID: {task_id}")
+            step_response, step_human_message = self.merged_phase(task, scratchpad, usr_prompt)
+
+            if step_human_message is None:
+                scratchpad.append(f"{step_response} Please correct and try again.")
+                continue
+
+            scratchpad.append(step_human_message)
+
+            if "final_answer" in step_response:
+                if last_act_result is None:
+                    self.log_event("warning", "❌ Final answer attempted before executing a tool. Rejecting final answer.")
+                    usr_prompt = "Final answer attempted but no tool was executed yet. Use a tool to complete the task."
+                    continue
+
+                final_thought = step_response.get("thought")
+                if not last_act_result.get("tool_result_success"):
+                    # The same call judged the failed tool result and chose to stop,
+                    # ask for a separate reflection before completing the task
+                    self.log_event("warning", "⚠️ Final answer given after a failed tool call. Reflecting on the tool result separately.")
+                    reflect_response, reflect_human_message = self.reflect_phase(
+                        task, scratchpad, json.dumps(last_act_result, indent=4)
+                    )
+                    if reflect_human_message is not None:
+                        scratchpad.append(reflect_human_message)
+                    if reflect_human_message is None or not self._process_reflection_result(task, reflect_response):
+                        usr_prompt = "The last tool call failed, so the task is not completed yet. Use a tool to complete the task."
+                        continue
+                    final_thought = reflect_response.get("thought")
+
+                self.task_manager.update_task_status(task_id, "completed")
+                self.log_event("info", f"✅ Task ID: {task_id} - {task_name} completed successfully after {iteration_count} iterations.")
+                return {
+                    "task_id": task_id,
+                    "final_thought": final_thought,
+                    "action": last_action,
+                    "action_result": last_act_result.get("action_result"),
+                    "action_final_status": last_act_result.get("tool_result_success"),
+                }
+
+            # Step 2: Act, the tool result is sent back with the next call
+            self.log_event("info", f"🛠️ [ACT] Initiating the Act phase for Task ID: {task_id}")
+            success, usr_prompt, tool_result = self.act_phase(step_response)
+            if success and self._is_verified_success(task, step_response, tool_result):
+                return self._complete_without_reflection(
+                    task, step_response, usr_prompt, "merged_calls_avoided"
+                )
+
+            last_action = step_response.get("action")
+            last_act_result = json.loads(usr_prompt)
+            scratchpad.append(usr_prompt)
+
+        self.task_manager.update_task_status(task_id, "failed")
+        self.log_event("warning", f"Task ID: {task_id} - {task_name} not completed after {max_iterations} iterations.")
+        return None
+
+    def _is_verified_success(
+        self, task: Dict[str, Any], action_response: Dict[str, Any], tool_result: Any
+    ) -> bool:
+        """
+        Check whether a successful tool result proves the task is complete, see `check_tool_success`.
+        """
+        if not app_config.agents_config.fast_path_completion:
+            return False
+        return check_tool_success(
+            task, action_response.get("action"), action_response.get("action_input"), tool_result
+        )
+
+    def _complete_without_reflection(
+        self,
+        task: Dict[str, Any],
+        action_response: Dict[str, Any],
+        act_usr_prompt: str,
+        counter: str,
+    ) -> Dict[str, Any]:
+        """
+        Mark a task completed from a verified tool result, skipping the model call
+        that would otherwise judge the result, and return the task output.
+        """
+        task_id = task.get("task_id")
+        tool = action_response.get("action")
+        self.task_manager.update_task_status(task_id, "completed")
+        increment_counter(counter)
+        increment_counter(f"{counter}.{tool}")
+        self.log_event(
+            "info",
+            f"⚡ Tool '{tool}' result satisfies its success check. Task ID: {task_id} completed without a reflect call.",
+        )
+
+        act_dict = json.loads(act_usr_prompt)
+        return {
+            "task_id": task_id,
+            "final_thought": f"The result of '{tool}' passed its success check, so the task is complete.",
+            "action": tool,
+            "action_result": act_dict.get("action_result"),
+            "action_final_status": act_dict.get("tool_result_success"),
+        }
+
+    def merged_phase(self, task: Dict[str, Any], scratchpad: Scratchpad, usr_prompt: str):
+        """
+        Execute a merged reflect-and-act step, returning the next action or the final answer.
+        """
+        sys_prompt = PromptBuilder.build_engineer_merged_prompt(
+            task=task.get("task_name"),
+            task_description=task.get("task_description"),
+            acceptance_criteria=task.get("acceptance_criteria"),
+            provided_inputs=task.get("provided_inputs"),
+            tool_names=self.tool_names,
+            tool_descriptions=self.tool_descriptions,
+            scratchpad=scratchpad.render(),
+        )
+        self._report_prompt_size("merged", scratchpad, sys_prompt)
+
+        response_human_message, response_content = self.invoke_model(sys_prompt, usr_prompt, False)
+        is_valid, step_response, validation_message = self.validate_model_output(
+            response_content, engineer_merged_output_schema
+        )
+
+        if is_valid:
+            return step_response, response_human_message
+        else:
+            self.log_event(
+                "error",
+                f"❌ Invalid output received during the merged step: {validation_message}",
+            )
+            return f"❌ Invalid output received during the merged step: {validation_message}", None
 
     def _build_system_prompt(
-        self, pending_task: dict, scratchpad: list, is_reflecting: bool = False
+        self, pending_task: dict, scratchpad: Scratchpad, is_reflecting: bool = False
     ) -> str:
         """
         Build the system prompt for thinking or reflecting, based on task details and scratchpad history.
         """
         if is_reflecting:
-            return PromptBuilder.build_engineer_reflect_prompt(
+            sys_prompt = PromptBuilder.build_engineer_reflect_prompt(
                 task=pending_task.get("task_name"),
                 task_description=pending_task.get("task_description"),
                 acceptance_criteria=pending_task.get("acceptance_criteria"),
-                scratchpad=scratchpad,
+                scratchpad=scratchpad.render(),
             )
         else:
-            return PromptBuilder.build_engineer_prompt(
+            sys_prompt = PromptBuilder.build_engineer_prompt(
                 task=pending_task.get("task_name"),
                 task_description=pending_task.get("task_description"),
                 acceptance_criteria=pending_task.get("acceptance_criteria"),
                 provided_inputs=pending_task.get("provided_inputs"),
                 tool_names=self.tool_names,
                 tool_descriptions=self.tool_descriptions,
-                scratchpad=scratchpad,
+                scratchpad=scratchpad.render(),
             )
 
-    def think_phase(self, task: dict, scratchpad: list) -> Dict[str, Any]:
+        self._report_prompt_size("reflect" if is_reflecting else "think", scratchpad, sys_prompt)
+        return sys_prompt
+
+    def _report_prompt_size(self, phase: str, scratchpad: Scratchpad, sys_prompt: str):
+        """
+        Log and record the system prompt size of an iteration, to check it stays flat.
+        """
+        prompt_bytes = len(sys_prompt.encode("utf-8"))
+        scratchpad_bytes = len(scratchpad.render().encode("utf-8"))
+        self.log_event(
+            "info",
+            f"📏 [{phase.upper()}] Iteration {scratchpad.step}: system prompt {prompt_bytes} bytes, scratchpad {scratchpad_bytes} bytes.",
+        )
+        observe_value(f"engineer_prompt_bytes.{phase}.iteration_{scratchpad.step:02d}", prompt_bytes)
+
+    def think_phase(self, task: dict, scratchpad: Scratchpad) -> Dict[str, Any]:
         """
         Execute the thinking phase by invoking the model to generate the plan.
         """
@@ -141,8 +333,13 @@ class JrEngineerAgent(Agent):
             )
             return f"❌ Invalid output received during thinking: {validation_message}", None
 
-    def act_phase(self, think_response: Dict[str, Any]) -> (bool, str):
-        """Execute the action phase using the specified tool and return the usr_prompt for reflection."""
+    def act_phase(self, think_response: Dict[str, Any]) -> (bool, str, Any):
+        """
+        Execute the action phase using the specified tool.
+
+        Returns whether the tool succeeded, the usr_prompt for reflection and the raw
+        tool result (None on failure).
+        """
         tool = think_response.get("action")
         tool_input = think_response.get("action_input")
 
@@ -163,7 +360,7 @@ class JrEngineerAgent(Agent):
                 },
                 indent=4,
             )
-            return True, usr_prompt
+            return True, usr_prompt, tool_result
         else:
             tool_result = f"{result['error']}: {result['details']}"
             self.log_event("error", json.dumps(result, indent=4))
@@ -177,9 +374,9 @@ class JrEngineerAgent(Agent):
                 },
                 indent=4,
             )
-            return False, usr_prompt
+            return False, usr_prompt, None
 
-    def reflect_phase(self, task: Dict[str, Any], scratchpad: List[str], usr_prompt: str):
+    def reflect_phase(self, task: Dict[str, Any], scratchpad: Scratchpad, usr_prompt: str):
         """Execute the reflection phase based on the tool's result."""
         sys_prompt = self._build_system_prompt(task, scratchpad, is_reflecting=True)
 
@@ -2,11 +2,41 @@ from agents.base_agent import Agent
 from state.agent_state import get_agent_graph_state
 from builders.prompt_builder import PromptBuilder
 from schemas.planner_schema import planner_output_schema
-from typing import Dict
+from services.plan_cache import get_plan_cache
+from config.app_config import app_config
+from utils.metrics_utils import increment_counter
+from typing import Any, Dict, Optional
+import json
 
 
 class PlannerAgent(Agent):
 
+    def use_plan_cache(self, feedback_value: Any) -> bool:
+        # Plans revised after reviewer feedback are specific to that run
+        return app_config.agents_config.plan_cache_enabled and not feedback_value
+
+    def get_cached_plan(self, user_request: str, feedback_value: Any) -> Optional[Dict]:
+        """
+        Return the cached plan for the request's template and store it as the
+        planner response, or None if a plan has to be generated.
+        """
+        if not self.use_plan_cache(feedback_value):
+            return None
+
+        plan = get_plan_cache().get(user_request)
+        if plan is None:
+            increment_counter("plan_cache.misses")
+            return None
+
+        increment_counter("plan_cache.hits")
+        self.log_event("info", "♻️ Reusing the cached plan of a matching request.")
+        self.update_state(f"{self.role}_response", json.dumps(plan, indent=4))
+        return plan
+
+    def cache_plan(self, user_request: str, feedback_value: Any, plan: Dict):
+        if self.use_plan_cache(feedback_value):
+            get_plan_cache().set(user_request, plan)
+
     def invoke(self, user_request: str) -> Dict:
         """
         Invoke the planner agent by processing the user request and generating a response.
@@ -23,38 +53,68 @@ class PlannerAgent(Agent):
         if get_agent_graph_state(self.state, "reviewer_response"):
             feedback_value = get_agent_graph_state(self.state, "reviewer_response")
 
+        if self.get_cached_plan(user_request, feedback_value) is not None:
+            self.log_event("finished", "")
+            return self.state
+
         sys_prompt = PromptBuilder.build_planner_prompt(user_request, feedback_value)
         usr_prompt = f"User Request: {user_request}"
 
-        while True:
-            self.log_event("info", "⏳ Processing the request...")
-
-            # Invoke the model and process the response
-            response_human_message, response_content = self.invoke_model(
-                sys_prompt, usr_prompt
-            )
-
-            # Validate the model output
-            is_valid, json_response, validation_message = self.validate_model_output(
-                response_content, planner_output_schema
-            )
-
-            if is_valid:
-                self.log_event("finished", "")
-                return self.state
-            else:
-                # Log the invalid output and provide feedback
-                self.log_event(
-                    "error", f"❌ Invalid output received: {validation_message}"
-                )
-                feedback_value = f"Invalid response: {validation_message}. Please correct and try again."
-
-                # Update the prompt with feedback
-                sys_prompt = PromptBuilder.build_planner_prompt(
-                    user_request, feedback_value
-                )
-
-                # Retry the request with feedback
-                self.log_event(
-                    "info", f"Retrying the request with feedback: {feedback_value}"
-                )
+        is_valid, json_response, validation_message = self.generate_validated_output(
+            sys_prompt,
+            usr_prompt,
+            planner_output_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_planner_prompt(
+                user_request, feedback
+            ),
+        )
+
+        if not is_valid:
+            error_message = f"No valid plan generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self.cache_plan(user_request, feedback_value, json_response)
+        self.log_event("finished", "")
+        return self.state
+
+    async def ainvoke(self, user_request: str) -> Dict:
+        """
+        Async counterpart of `invoke`, awaiting the model calls.
+
+        Parameters:
+        - user_request (str): The user request that the agent should process.
+
+        Returns:
+        - dict: The updated state after the planner agent's invocation.
+        """
+        self.log_event("start", f" the user_request: {user_request}")
+
+        feedback_value = ""
+        if get_agent_graph_state(self.state, "reviewer_response"):
+            feedback_value = get_agent_graph_state(self.state, "reviewer_response")
+
+        if self.get_cached_plan(user_request, feedback_value) is not None:
+            self.log_event("finished", "")
+            return self.state
+
+        sys_prompt = PromptBuilder.build_planner_prompt(user_request, feedback_value)
+        usr_prompt = f"User Request: {user_request}"
+
+        is_valid, json_response, validation_message = await self.agenerate_validated_output(
+            sys_prompt,
+            usr_prompt,
+            planner_output_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_planner_prompt(
+                user_request, feedback
+            ),
+        )
+
+        if not is_valid:
+            error_message = f"No valid plan generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self.cache_plan(user_request, feedback_value, json_response)
+        self.log_event("finished", "")
+        return self.state
@@ -1,12 +1,17 @@
 from agents.base_agent import Agent
 from state.agent_state import (
     get_first_entry_from_state,
+    get_last_entry_from_state,
     get_all_entries_from_state,
 )
-from schemas.pm_schema import pm_output_schema
+from state.task_store import get_task_store
+from schemas.pm_schema import pm_output_schema, pm_patch_schema
+from config.app_config import app_config
 from utils import task_utils
-from typing import Any, Dict
+from utils.metrics_utils import increment_counter
+from typing import Any, Dict, List, Tuple
 from builders.prompt_builder import PromptBuilder
+import json
 
 class PMAgent(Agent):
 
@@ -32,6 +37,103 @@ class PMAgent(Agent):
         )
         return f"The reviewer has provided feedback on the tasks. Please update the task list accordingly with the following details: {all_reviewer_responses}"
 
+    def get_new_verdicts(self) -> Tuple[List[Any], int]:
+        """
+        Return the reviewer verdicts received since the manager's last update and
+        the cursor to store once they are applied.
+        """
+        verdicts = get_all_entries_from_state(self.state, "reviewer_response")
+        cursor = get_last_entry_from_state(self.state, "manager_cursor") or 0
+        return verdicts[cursor:], len(verdicts)
+
+    def construct_delta_prompt(self, new_verdicts: List[Any]) -> str:
+        verdicts = "\n".join(str(verdict) for verdict in new_verdicts)
+        return f"The reviewer has provided new verdicts since your last update. Return the task list changes they require:\n{verdicts}"
+
+    def _apply_patch(self, json_response: Dict[str, Any], cursor: int):
+        """
+        Apply a validated patch to the stored task list and store the result.
+        """
+        tasks, skipped = get_task_store(self.state).apply_patch(
+            json_response.get("operations", [])
+        )
+        for message in skipped:
+            self.log_event("warning", f"Skipping a task list operation. {message}")
+
+        self.update_state("manager_response", json.dumps({"tasks": tasks}, indent=4))
+        self.update_state("manager_cursor", cursor)
+        self.log_event(
+            "finished",
+            f"Applied {len(json_response.get('operations', [])) - len(skipped)} task list operations.",
+        )
+
+    def _skip_without_verdicts(self) -> Dict:
+        increment_counter("pm_calls_skipped")
+        self.log_event(
+            "info", "🟡 No new reviewer verdicts since the last update. Keeping the task list."
+        )
+        return self.state
+
+    def invoke_delta(self, tasks_list: List[Dict[str, Any]]) -> Dict:
+        """
+        Update the task list with a patch covering only the new reviewer verdicts.
+
+        Parameters:
+        - tasks_list (list): The current task list.
+
+        Returns:
+        - dict: The updated state after the PM agent's invocation.
+        """
+        new_verdicts, cursor = self.get_new_verdicts()
+        if not new_verdicts:
+            return self._skip_without_verdicts()
+
+        is_valid, json_response, validation_message = self.generate_validated_output(
+            PromptBuilder.build_pm_delta_prompt(tasks_list),
+            self.construct_delta_prompt(new_verdicts),
+            pm_patch_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_pm_delta_prompt(
+                tasks_list, feedback
+            ),
+            update_state=False,
+        )
+
+        if not is_valid:
+            # The cursor is not moved, so the verdicts are applied next time
+            error_message = f"No valid task list patch generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self._apply_patch(json_response, cursor)
+        return self.state
+
+    async def ainvoke_delta(self, tasks_list: List[Dict[str, Any]]) -> Dict:
+        """
+        Async counterpart of `invoke_delta`, awaiting the model call.
+        """
+        new_verdicts, cursor = self.get_new_verdicts()
+        if not new_verdicts:
+            return self._skip_without_verdicts()
+
+        is_valid, json_response, validation_message = await self.agenerate_validated_output(
+            PromptBuilder.build_pm_delta_prompt(tasks_list),
+            self.construct_delta_prompt(new_verdicts),
+            pm_patch_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_pm_delta_prompt(
+                tasks_list, feedback
+            ),
+            update_state=False,
+        )
+
+        if not is_valid:
+            # The cursor is not moved, so the verdicts are applied next time
+            error_message = f"No valid task list patch generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self._apply_patch(json_response, cursor)
+        return self.state
+
     def invoke(self, user_request: str,) -> Dict:
         """
         Invoke the PM agent by processing the agent request and generating a response.
@@ -59,37 +161,72 @@ class PMAgent(Agent):
 
         tasks_list = task_utils.get_tasks_list(self.state)
 
+        if app_config.agents_config.pm_delta_mode and tasks_list:
+            return self.invoke_delta(tasks_list)
+
         usr_prompt = self.construct_user_prompt(user_request, tasks_list)
         self.log_event("info", usr_prompt)
         sys_prompt = PromptBuilder.build_pm_prompt(tasks_list)
 
-        while True:
-            self.log_event("info", "⏳ Processing the request...")
+        is_valid, json_response, validation_message = self.generate_validated_output(
+            sys_prompt,
+            usr_prompt,
+            pm_output_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_pm_prompt(
+                tasks_list, feedback
+            ),
+        )
 
-            # Invoke the model and process the response
-            response_human_message, response_content = self.invoke_model(
-                sys_prompt, usr_prompt
-            )
+        if not is_valid:
+            error_message = f"No valid task list generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
 
-            # Validate the model output
-            is_valid, json_response, validation_message = self.validate_model_output(
-                response_content, pm_output_schema
+        self.log_event("finished", "")
+        return self.state
+
+    async def ainvoke(self, user_request: str,) -> Dict:
+        """
+        Async counterpart of `invoke`, awaiting the model calls.
+
+        Parameters:
+        - user_request (str): The user request that the agent should process.
+
+        Returns:
+        - dict: The updated state after the PM agent's invocation.
+        """
+        self.log_event("start")
+
+        original_plan = get_first_entry_from_state(self.state, "planner_response")
+        if not original_plan:
+            error_message = (
+                "Original plan not found. Cannot proceed without the initial plan."
             )
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        tasks_list = task_utils.get_tasks_list(self.state)
+
+        if app_config.agents_config.pm_delta_mode and tasks_list:
+            return await self.ainvoke_delta(tasks_list)
+
+        usr_prompt = self.construct_user_prompt(user_request, tasks_list)
+        self.log_event("info", usr_prompt)
+        sys_prompt = PromptBuilder.build_pm_prompt(tasks_list)
+
+        is_valid, json_response, validation_message = await self.agenerate_validated_output(
+            sys_prompt,
+            usr_prompt,
+            pm_output_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_pm_prompt(
+                tasks_list, feedback
+            ),
+        )
+
+        if not is_valid:
+            error_message = f"No valid task list generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
 
-            if is_valid:
-                self.log_event("finished", "")
-                return self.state
-            else:
-                # Log the invalid output and provide feedback
-                self.log_event(
-                    "error", f"❌ Invalid output received: {validation_message}"
-                )
-                feedback_value = f"Invalid response: {validation_message}. Please correct and try again."
-
-                # Update the prompt with feedback
-                sys_prompt = PromptBuilder.build_pm_prompt(tasks_list, feedback_value)
-
-                # Retry the request with feedback
-                self.log_event(
-                    "info", f"Retrying the request with feedback: {feedback_value}"
-                )
+        self.log_event("finished", "")
+        return self.state
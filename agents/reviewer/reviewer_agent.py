@@ -1,9 +1,11 @@
 from agents.base_agent import Agent
 from utils import task_utils
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from builders.prompt_builder import PromptBuilder
-from state.agent_state import get_last_entry_from_state
-from schemas.reviewer_schema import task_completion_schema
+from config.app_config import app_config
+from state.agent_state import get_last_entry_from_state, get_all_entries_from_state
+from state.task_store import get_task_store
+from schemas.reviewer_schema import task_completion_schema, task_completion_batch_schema
 import json
 
 class ReviewerAgent(Agent):
@@ -53,6 +55,141 @@ class ReviewerAgent(Agent):
         )
         return agent_last_update, original_task
 
+    def get_fresh_updates(self) -> Tuple[List[Tuple[Dict[str, Any], Any]], Dict[str, int]]:
+        """
+        Collect the agent updates appended since the reviewer's last batch review.
+
+        Returns:
+        - tuple: The (original task, latest update) pairs to review, in task list
+          order, and the reviewer cursor to store once they are reviewed.
+        """
+        store = get_task_store(self.state)
+        cursor = get_last_entry_from_state(self.state, "reviewer_cursor") or {}
+        agents = {task.get("agent") for task in store.tasks}
+
+        new_cursor = {}
+        latest_updates = {}
+        for agent_name in sorted(agent for agent in agents if agent):
+            state_key = f"{agent_name}_response"
+            entries = get_all_entries_from_state(self.state, state_key)
+            for update in entries[cursor.get(state_key, 0):]:
+                if isinstance(update, str):
+                    try:
+                        update = json.loads(update)
+                    except json.JSONDecodeError:
+                        update = None
+                task_id = update.get("task_id") if isinstance(update, dict) else None
+                if not task_id or store.get_task(task_id) is None:
+                    self.log_event(
+                        "warning",
+                        f"Skipping an update from agent {agent_name} without a known task ID.",
+                    )
+                    continue
+                # The latest update of a task supersedes the earlier ones
+                latest_updates[task_id] = update
+            new_cursor[state_key] = len(entries)
+
+        reviews = [
+            (store.get_task(task["task_id"]), latest_updates[task["task_id"]])
+            for task in store.tasks
+            if task.get("task_id") in latest_updates
+        ]
+        return reviews, new_cursor
+
+    def _store_verdicts(
+        self,
+        reviews: List[Tuple[Dict[str, Any], Any]],
+        json_response: Dict[str, Any],
+        cursor: Dict[str, int],
+    ):
+        """
+        Store each verdict of a batch review as its own reviewer response, then the cursor.
+        """
+        expected_task_ids = {original_task["task_id"] for original_task, _ in reviews}
+        reviewed_task_ids = set()
+
+        for verdict in json_response.get("reviews", []):
+            task_id = verdict.get("task_id")
+            if task_id not in expected_task_ids or task_id in reviewed_task_ids:
+                self.log_event(
+                    "warning", f"Ignoring a verdict for task {task_id}, it was not up for review."
+                )
+                continue
+            reviewed_task_ids.add(task_id)
+            self.update_state("reviewer_response", json.dumps(verdict, indent=4))
+
+        missing_task_ids = expected_task_ids - reviewed_task_ids
+        if missing_task_ids:
+            self.log_event(
+                "warning", f"No verdict returned for tasks {sorted(missing_task_ids)}."
+            )
+
+        self.update_state("reviewer_cursor", cursor)
+        self.log_event("finished", f"Reviewed {len(reviewed_task_ids)} tasks in one call.")
+
+    def invoke_batch(self) -> Dict[str, Any]:
+        """
+        Review every task with a fresh agent update in a single model call.
+
+        Returns:
+        - dict: The updated state after the Reviewer Agent's invocation.
+        """
+        reviews, cursor = self.get_fresh_updates()
+        if not reviews:
+            self.log_event("info", "🟡 No fresh agent updates to review.")
+            self.update_state("reviewer_cursor", cursor)
+            return self.state
+
+        self.log_event("info", f"Reviewing {len(reviews)} tasks in one call.")
+        is_valid, json_response, validation_message = self.generate_validated_output(
+            PromptBuilder.build_reviewer_batch_prompt(reviews),
+            f"Agent Updates: {len(reviews)} tasks to review.",
+            task_completion_batch_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_reviewer_batch_prompt(
+                reviews, feedback
+            ),
+            update_state=False,
+        )
+
+        if not is_valid:
+            # The cursor is not moved, so the updates are reviewed again next time
+            error_message = f"No valid review generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self._store_verdicts(reviews, json_response, cursor)
+        return self.state
+
+    async def ainvoke_batch(self) -> Dict[str, Any]:
+        """
+        Async counterpart of `invoke_batch`, awaiting the model call.
+        """
+        reviews, cursor = self.get_fresh_updates()
+        if not reviews:
+            self.log_event("info", "🟡 No fresh agent updates to review.")
+            self.update_state("reviewer_cursor", cursor)
+            return self.state
+
+        self.log_event("info", f"Reviewing {len(reviews)} tasks in one call.")
+        is_valid, json_response, validation_message = await self.agenerate_validated_output(
+            PromptBuilder.build_reviewer_batch_prompt(reviews),
+            f"Agent Updates: {len(reviews)} tasks to review.",
+            task_completion_batch_schema,
+            build_retry_prompt=lambda feedback: PromptBuilder.build_reviewer_batch_prompt(
+                reviews, feedback
+            ),
+            update_state=False,
+        )
+
+        if not is_valid:
+            # The cursor is not moved, so the updates are reviewed again next time
+            error_message = f"No valid review generated: {validation_message}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+        self._store_verdicts(reviews, json_response, cursor)
+        return self.state
+
     def invoke(self, user_request: str, agent_update: str) -> Dict[str, Any]:
         """
         Invoke the Reviewer Agent to review pending tasks and process agent updates.
@@ -67,6 +204,9 @@ class ReviewerAgent(Agent):
 
         self.log_event("start", f" the user_request: {user_request}")
 
+        if app_config.agents_config.reviewer_batch_mode:
+            return self.invoke_batch()
+
         try:
             # Get the list of tasks
             tasks_list = task_utils.get_tasks_list(self.state)
@@ -85,40 +225,83 @@ class ReviewerAgent(Agent):
                     # Prepare the agent's prompt
                     usr_prompt = f"Agent Update: {agent_last_update}"
 
-                    while True:
-                        self.log_event("info", "⏳ Processing the request...")
-                        # Invoke the model and process the response
-
-                        response_human_message, response_content = self.invoke_model(
-                            sys_prompt, usr_prompt
+                    is_valid, json_response, validation_message = (
+                        self.generate_validated_output(
+                            sys_prompt,
+                            usr_prompt,
+                            task_completion_schema,
+                            build_retry_prompt=lambda feedback: PromptBuilder.build_reviewer_prompt(
+                                original_task, feedback
+                            ),
                         )
+                    )
 
-                        # Validate the model output
-                        is_valid, json_response, validation_message = (
-                            self.validate_model_output(
-                                response_content, task_completion_schema
-                            )
+                    if not is_valid:
+                        error_message = f"No valid review generated: {validation_message}"
+                        self.log_event("error", error_message)
+                        return {"error": error_message}
+
+                    self.log_event("finished", "")
+                    return self.state
+
+        except Exception as e:
+            error_message = f"❌ Error occurred: {str(e)}"
+            self.log_event("error", error_message)
+            return {"error": error_message}
+
+    async def ainvoke(self, user_request: str, agent_update: str) -> Dict[str, Any]:
+        """
+        Async counterpart of `invoke`, awaiting the model calls.
+
+        Parameters:
+        - user_request (str): The user request that the agent should process.
+        - agent_update (str): The update provided by another agent that the Reviewer should evaluate.
+
+        Returns:
+        - dict: The updated state after the Reviewer Agent's invocation.
+        """
+
+        self.log_event("start", f" the user_request: {user_request}")
+
+        if app_config.agents_config.reviewer_batch_mode:
+            return await self.ainvoke_batch()
+
+        try:
+            # Get the list of tasks
+            tasks_list = task_utils.get_tasks_list(self.state)
+
+            # Iterate over each pending task
+            for task in tasks_list:
+                if task["status"] == "pending":
+
+                    agent_last_update, original_task = (
+                        self.get_agent_last_update_and_original_task(task)
+                    )
+
+                    # Build the system prompt using the PromptBuilder
+                    sys_prompt = PromptBuilder.build_reviewer_prompt(original_task)
+
+                    # Prepare the agent's prompt
+                    usr_prompt = f"Agent Update: {agent_last_update}"
+
+                    is_valid, json_response, validation_message = (
+                        await self.agenerate_validated_output(
+                            sys_prompt,
+                            usr_prompt,
+                            task_completion_schema,
+                            build_retry_prompt=lambda feedback: PromptBuilder.build_reviewer_prompt(
+                                original_task, feedback
+                            ),
                         )
+                    )
+
+                    if not is_valid:
+                        error_message = f"No valid review generated: {validation_message}"
+                        self.log_event("error", error_message)
+                        return {"error": error_message}
 
-                        if is_valid:
-                            self.log_event("finished", "")
-                            return self.state
-                        else:
-                            # Log the invalid output and provide feedback
-                            self.log_event(
-                                "error", f"❌ Invalid output received: {validation_message}"
-                            )
-                            feedback_value = f"Invalid response: {validation_message}. Please correct and try again."
-
-                            # Update the prompt with feedback
-                            sys_prompt = PromptBuilder.build_reviewer_prompt(
-                                original_task, feedback_value
-                            )
-
-                            # Retry the request with feedback
-                            self.log_event(
-                                "info", f"Retrying the request with feedback: {feedback_value}"
-                            )
+                    self.log_event("finished", "")
+                    return self.state
 
         except Exception as e:
             error_message = f"❌ Error occurred: {str(e)}"
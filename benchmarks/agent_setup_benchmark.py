@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.app_config import app_config
+from controllers.agent_registry import AgentRegistry
+from tools.tool_registry import load_tools
+from agents.planner.planner_agent import PlannerAgent
+from agents.pm.pm_agent import PMAgent
+from agents.engineer.engineer_agent import EngineerAgent
+from agents.engineer.jr_engineer_agent import JrEngineerAgent
+from agents.reviewer.reviewer_agent import ReviewerAgent
+
+# Agents built by the node functions of `create_graph`
+NODE_AGENTS = {
+    "planner": PlannerAgent,
+    "manager": PMAgent,
+    "ocp_engineer": JrEngineerAgent,
+    "vsphere_engineer": EngineerAgent,
+    "reviewer": ReviewerAgent,
+}
+
+
+def time_agent_setup(role: str, iterations: int, reuse: bool) -> float:
+    """
+    Return the mean time, in milliseconds, to build the agent of a node.
+
+    Parameters:
+    - role (str): The node's agent role.
+    - iterations (int): Number of agents to build.
+    - reuse (bool): Keep the registry warm, otherwise clear it before every build
+      to measure the cost of building every component from scratch.
+    """
+    agent_class = NODE_AGENTS[role]
+    state = {"user_request": "benchmark"}
+    AgentRegistry.clear()
+
+    elapsed = 0.0
+    for _ in range(iterations):
+        if not reuse:
+            AgentRegistry.clear()
+        started_at = time.perf_counter()
+        agent_class(state=state, role=role, model_config=app_config.model_config)
+        elapsed += time.perf_counter() - started_at
+    return elapsed / iterations * 1000
+
+
+def run_benchmark(iterations: int = 200) -> Dict[str, Any]:
+    load_tools(verbose=False)
+    results = {}
+    for role in NODE_AGENTS:
+        cold = time_agent_setup(role, iterations, reuse=False)
+        warm = time_agent_setup(role, iterations, reuse=True)
+        results[role] = {
+            "fresh_components_ms": cold,
+            "registry_ms": warm,
+            "speedup": cold / warm if warm else None,
+        }
+    return {"iterations": iterations, "agents": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the per-invocation cost of building the workflow agents."
+    )
+    parser.add_argument("--iterations", type=int, default=200, help="Agents built per role.")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.iterations), indent=2))
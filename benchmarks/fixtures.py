@@ -0,0 +1,652 @@
+import re
+import ast
+import json
+import threading
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from unittest import mock
+from pyVmomi import vim, vmodl
+from services.vsphere_service import reset_vsphere_pool
+from utils.vsphere_utils import reset_vm_index
+
+# Markers identifying which prompt (and therefore which agent phase) a request comes from
+PLANNER_MARKER = "You are a Planner Agent"
+PM_MARKER = "You are the **Project Manager (PM) Agent**"
+PM_DELTA_MARKER = "You are the **Project Manager (PM) Agent** keeping an existing task list up to date"
+ENGINEER_MARKER = "You are a Software Engineer Agent"
+MERGED_MARKER = "You are a Software Engineer Agent completing a task in a single loop"
+REFLECT_MARKER = "You are responsible for analyzing the output of the tool"
+REACT_MARKER = "You are tasked with answering questions based on your knowledge"
+REVIEWER_MARKER = "You are a Reviewer Agent"
+REVIEWER_BATCH_MARKER = "You are a Reviewer Agent evaluating several task outputs at once"
+
+# Both prompt layouts, the value inline or in the trailing context section
+TASK_NAME_PATTERN = re.compile(r"- \*\*Task\*\*: (?!<task>)(.+)|^<task>\n(.+)", re.MULTILINE)
+TASK_ID_PATTERN = re.compile(r"task_\d{3}")
+REVIEW_TASK_PATTERN = re.compile(r"^### Task (\S+)$", re.MULTILINE)
+# Failed tool calls recorded in an engineer scratchpad, by the three-phase and merged loops
+FAILED_ATTEMPT_MARKERS = ("[ACT] Action failed", '"tool_result_success": false')
+ORIGINAL_TASKS_PATTERNS = (
+    re.compile(r"^<original_tasks_list>\n(.*?)\n</original_tasks_list>", re.DOTALL | re.MULTILINE),
+    re.compile(r"### Original Tasks List:\n.*?\n\n(.*?)\n\n---", re.DOTALL),
+)
+
+
+class ScriptedModel:
+    """
+    A deterministic stand-in for the LLM that answers every agent prompt.
+
+    It is served through `ReplayServer` like a cassette, so a full planner ->
+    manager -> engineer -> reviewer run needs neither a live model nor a
+    recording.
+
+    The plan has `num_tasks` tasks: the first half are independent vSphere
+    inventory tasks, the rest are OpenShift migration-plan tasks that depend on
+    the first vSphere task. Every review passes, so runs always converge.
+
+    With `tool_failures`, the OpenShift engineer's first attempts at each task
+    call the tool with invalid inputs, so the task takes several iterations.
+
+    With `malformed_outputs`, planner, manager and reviewer answers come back the
+    way small models often emit them: in a code fence, cut off before the last
+    bracket and with capitalized enum values.
+    """
+
+    def __init__(
+        self,
+        num_tasks: int = 4,
+        num_vms: int = 10,
+        model: str = "scripted",
+        tool_failures: int = 0,
+        malformed_outputs: bool = False,
+    ):
+        self.num_tasks = num_tasks
+        self.num_vms = num_vms
+        self.model = model
+        self.tool_failures = tool_failures
+        self.malformed_outputs = malformed_outputs
+        self.tasks = self._build_tasks()
+        self.tasks_by_name = {task["task_name"]: task for task in self.tasks}
+
+    def find(self, payload: Dict[str, Any], strict: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Answer a request in the shape of a non-streamed `/api/generate` reply.
+        """
+        system = payload.get("system", "")
+        prompt = payload.get("prompt", "")
+
+        malformed = False
+        if PLANNER_MARKER in system:
+            content = self._plan()
+            malformed = self.malformed_outputs
+        elif PM_DELTA_MARKER in system:
+            content = self._task_patch(prompt)
+            malformed = self.malformed_outputs
+        elif PM_MARKER in system:
+            content = self._task_list(system, prompt)
+            malformed = self.malformed_outputs
+        elif REFLECT_MARKER in system:
+            content = self._reflection(prompt)
+        elif MERGED_MARKER in system:
+            content = self._merged_step(system, prompt)
+        elif ENGINEER_MARKER in system:
+            content = self._action(system)
+        elif REACT_MARKER in system:
+            content = self._react_step(system, prompt)
+        elif REVIEWER_BATCH_MARKER in system:
+            content = self._verdicts(system)
+            malformed = self.malformed_outputs
+        elif REVIEWER_MARKER in system:
+            content = self._verdict(system)
+            malformed = self.malformed_outputs
+        else:
+            return None
+
+        response = self._malform(content) if malformed else json.dumps(content)
+        return {
+            "model": self.model,
+            "response": response,
+            "done": True,
+            "prompt_eval_count": len(system) // 4,
+            "eval_count": len(response) // 4,
+        }
+
+    def _malform(self, content: Dict[str, Any]) -> str:
+        response = json.dumps(content)
+        for value in ("VMware", "OpenShift", "pending", "completed"):
+            response = response.replace(f'"{value}"', f'"{value.upper()}"')
+        return f"```json\n{response[:-1]}"
+
+    def vm_names(self) -> List[str]:
+        return [f"vm-{index:03d}" for index in range(1, self.num_vms + 1)]
+
+    def _build_tasks(self) -> List[Dict[str, Any]]:
+        vm_names = self.vm_names()
+        num_vsphere = max(1, (self.num_tasks + 1) // 2)
+        tasks = []
+        for index in range(1, self.num_tasks + 1):
+            task_id = f"task_{index:03d}"
+            vm_name = vm_names[(index - 1) % len(vm_names)]
+            if index <= num_vsphere:
+                task = {
+                    "task_id": task_id,
+                    "task_name": f"Retrieve details for VM {vm_name}",
+                    "task_description": f"Retrieve the configuration of VM {vm_name}.",
+                    "agent": "vsphere_engineer",
+                    "status": "pending",
+                    "dependencies": [],
+                    "acceptance_criteria": f"Details of VM {vm_name} retrieved.",
+                    "tool_to_use": "retrieve_vm_details",
+                    "provided_inputs": {"vm_name": vm_name},
+                }
+                task["action_input"] = {"vm_name": vm_name}
+            else:
+                plan_name = f"{vm_name}-plan"
+                task = {
+                    "task_id": task_id,
+                    "task_name": f"Create migration plan {plan_name}",
+                    "task_description": f"Create a migration plan for VM {vm_name}.",
+                    "agent": "ocp_engineer",
+                    "status": "pending",
+                    "dependencies": ["task_001"],
+                    "acceptance_criteria": f"Migration plan {plan_name} created.",
+                    "tool_to_use": "create_migration_plan_tool",
+                    "provided_inputs": {"vm_names": [vm_name], "plan_name": plan_name},
+                }
+                task["action_input"] = {"vm_names": [vm_name], "name": plan_name}
+            tasks.append(task)
+        return tasks
+
+    def _public_task(self, task: Dict[str, Any], status: str) -> Dict[str, Any]:
+        public = {key: value for key, value in task.items() if key != "action_input"}
+        public["status"] = status
+        return public
+
+    def _plan(self) -> Dict[str, Any]:
+        return {
+            "source_provider": "VMware",
+            "target_provider": "OpenShift",
+            "stages": [
+                {
+                    "stage_name": "Inventory",
+                    "goal": "Retrieve the details of the VMs to migrate.",
+                    "completion_criteria": ["All VM details retrieved."],
+                    "provided_inputs": {"vm_names": self.vm_names()},
+                    "execution_plan": ["Retrieve the details of each VM."],
+                },
+                {
+                    "stage_name": "Plan Creation",
+                    "goal": "Create the migration plans.",
+                    "completion_criteria": ["All migration plans created."],
+                    "provided_inputs": {"vm_names": self.vm_names()},
+                    "execution_plan": ["Create one migration plan per VM."],
+                },
+            ],
+        }
+
+    def _task_list(self, system: str, prompt: str) -> Dict[str, Any]:
+        completed = set(TASK_ID_PATTERN.findall(prompt))
+        current = self._current_statuses(system)
+        tasks = []
+        for task in self.tasks:
+            status = current.get(task["task_id"], "pending")
+            if task["task_id"] in completed:
+                status = "completed"
+            tasks.append(self._public_task(task, status))
+        return {"tasks": tasks}
+
+    def _task_patch(self, prompt: str) -> Dict[str, Any]:
+        completed = sorted(set(TASK_ID_PATTERN.findall(prompt)))
+        return {
+            "operations": [
+                {"op": "update_status", "task_id": task_id, "status": "completed"}
+                for task_id in completed
+            ]
+        }
+
+    def _current_statuses(self, system: str) -> Dict[str, str]:
+        # Look in the trailing context section of the static-prefix layout first
+        for pattern in ORIGINAL_TASKS_PATTERNS:
+            match = pattern.search(system)
+            if match:
+                break
+        else:
+            return {}
+        try:
+            current_tasks = ast.literal_eval(match.group(1).strip())
+        except (ValueError, SyntaxError):
+            return {}
+        if isinstance(current_tasks, dict):
+            current_tasks = current_tasks.get("tasks", [])
+        return {
+            task["task_id"]: task.get("status", "pending")
+            for task in current_tasks
+            if isinstance(task, dict) and "task_id" in task
+        }
+
+    def _task_for_prompt(self, system: str) -> Dict[str, Any]:
+        match = TASK_NAME_PATTERN.search(system)
+        task_name = (match.group(1) or match.group(2)).strip() if match else ""
+        return self.tasks_by_name.get(task_name, self.tasks[0])
+
+    def _action(self, system: str) -> Dict[str, Any]:
+        task = self._task_for_prompt(system)
+        failed_attempts = sum(system.count(marker) for marker in FAILED_ATTEMPT_MARKERS)
+        if task["agent"] == "ocp_engineer" and failed_attempts < self.tool_failures:
+            return {
+                "thought": f"I will use {task['tool_to_use']} to complete the task.",
+                "action": task["tool_to_use"],
+                "action_input": {},
+            }
+        return {
+            "thought": f"I will use {task['tool_to_use']} to complete the task.",
+            "action": task["tool_to_use"],
+            "action_input": task["action_input"],
+        }
+
+    def _reflection(self, prompt: str) -> Dict[str, Any]:
+        if '"tool_result_success": false' in prompt:
+            return {
+                "thought": "The tool failed because required inputs were missing.",
+                "action_correction": "Provide every required input from the task details.",
+            }
+        return {
+            "thought": "The tool executed successfully and the output meets the acceptance criteria.",
+            "final_answer": "The task has been completed successfully.",
+        }
+
+    def _merged_step(self, system: str, prompt: str) -> Dict[str, Any]:
+        if '"tool_result_success": true' in prompt:
+            return self._reflection(prompt)
+        return self._action(system)
+
+    def _react_step(self, system: str, prompt: str) -> Dict[str, Any]:
+        if '"action_result"' in prompt:
+            return {
+                "thought": "The tool returned the expected result.",
+                "final_answer": "The task has been completed successfully.",
+            }
+        return self._action(system)
+
+    def _verdict(self, system: str) -> Dict[str, Any]:
+        match = TASK_ID_PATTERN.search(system)
+        return {
+            "task_id": match.group(0) if match else "task_001",
+            "status": "completed",
+            "notification": "The task has been completed and meets the acceptance criteria.",
+        }
+
+    def _verdicts(self, system: str) -> Dict[str, Any]:
+        return {
+            "reviews": [
+                {
+                    "task_id": task_id,
+                    "status": "completed",
+                    "notification": "The task has been completed and meets the acceptance criteria.",
+                }
+                for task_id in REVIEW_TASK_PATTERN.findall(system)
+            ]
+        }
+
+
+class FakeTask(vim.Task):
+    """
+    A vSphere task that completes after `duration` seconds, immediately when 0.
+    """
+
+    info = None
+    _count = 0
+    _count_lock = threading.Lock()
+
+    def __init__(self, duration: float = 0.0, on_complete=None, on_change=None):
+        with FakeTask._count_lock:
+            FakeTask._count += 1
+            super().__init__(f"task-{FakeTask._count}")
+        self.on_complete = on_complete
+        self.on_change = on_change
+        self.info = SimpleNamespace(state=vim.TaskInfo.State.running, error=None, result=None)
+        self._done = threading.Event()
+        if duration > 0:
+            timer = threading.Timer(duration, self._complete)
+            timer.daemon = True
+            timer.start()
+        else:
+            self._complete()
+
+    def _complete(self):
+        if self.on_complete:
+            self.on_complete()
+        self.info.state = vim.TaskInfo.State.success
+        self._done.set()
+        if self.on_change:
+            self.on_change(self, ["info.state", "info.error"])
+
+    def WaitForCompletion(self):
+        self._done.wait()
+        return self.info.state
+
+
+class FakeVirtualMachine(vim.VirtualMachine):
+    """
+    Just enough of `vim.VirtualMachine` for the vSphere utils used by the tools.
+    """
+
+    # Plain attributes instead of the properties fetched from vCenter
+    name = config = summary = guest = runtime = None
+    # Called with the VM, or one of its tasks, and the changed property paths
+    on_change = None
+    # Time a guest takes to shut down
+    shutdown_seconds = 0.0
+
+    def __init__(self, name: str, index: int):
+        super().__init__(f"vm-{index}")
+        self.name = name
+        disk = vim.vm.device.VirtualDisk(
+            key=2000,
+            capacityInKB=(20 + index) * 1024 * 1024,
+            deviceInfo=vim.Description(label="Hard disk 1", summary="Hard disk 1"),
+        )
+        self.config = SimpleNamespace(
+            guestFullName="Red Hat Enterprise Linux 9 (64-bit)",
+            hardware=SimpleNamespace(numCPU=2, memoryMB=4096, device=[disk]),
+        )
+        self.summary = SimpleNamespace(
+            config=SimpleNamespace(name=name, guestFullName=self.config.guestFullName),
+            overallStatus="green",
+        )
+        self.guest = SimpleNamespace(
+            net=[
+                SimpleNamespace(
+                    network="VM Network",
+                    ipAddress=[f"10.0.{index // 250}.{index % 250 + 1}"],
+                    macAddress=f"00:50:56:00:{index // 256:02x}:{index % 256:02x}",
+                )
+            ]
+        )
+        self.runtime = SimpleNamespace(powerState="poweredOn", connectionState="connected")
+
+    def PowerOff(self):
+        def power_off():
+            self.runtime.powerState = "poweredOff"
+            if self.on_change:
+                self.on_change(self, ["runtime.powerState"])
+
+        return FakeTask(self.shutdown_seconds, on_complete=power_off, on_change=self.on_change)
+
+
+class FakeContainerView(vim.view.ContainerView):
+    view = None
+
+    def __init__(self, view):
+        super().__init__("session[fake]view")
+        self.view = view
+
+    def Destroy(self):
+        pass
+
+
+class FakePropertyFilter:
+    def __init__(self, spec):
+        self.spec = spec
+        self.path_set = [path for prop_spec in spec.propSet for path in prop_spec.pathSet]
+        self.entered = False
+        self.destroyed = False
+
+    def objects(self) -> List[Any]:
+        return [
+            obj
+            for object_spec in self.spec.objectSet
+            for obj in (object_spec.obj.view if object_spec.selectSet else [object_spec.obj])
+        ]
+
+    def covers(self, obj) -> bool:
+        return not self.destroyed and obj in self.objects()
+
+    def Destroy(self):
+        self.destroyed = True
+
+
+class FakePropertyCollector:
+    """
+    Answers `RetrievePropertiesEx` for the object specs built by `retrieve_properties`,
+    by reading the property paths off the fake objects.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self._pages: Dict[str, Any] = {}
+        # Collectors created with CreatePropertyCollector, and their filters and updates
+        self.collectors: List["FakePropertyCollector"] = []
+        self._filters: List["FakePropertyFilter"] = []
+        self._version = 0
+        self._initial: List[Any] = []
+        self._pending: List[Any] = []
+        self._changed = threading.Condition()
+
+    def RetrievePropertiesEx(self, specSet, options):
+        self.calls += 1
+        objects = []
+        for filter_spec in specSet:
+            path_set = [path for prop_spec in filter_spec.propSet for path in prop_spec.pathSet]
+            for object_spec in filter_spec.objectSet:
+                targets = object_spec.obj.view if object_spec.selectSet else [object_spec.obj]
+                objects.extend(
+                    SimpleNamespace(obj=obj, propSet=self._properties(obj, path_set)) for obj in targets
+                )
+        return self._page(objects, options.maxObjects)
+
+    def ContinueRetrievePropertiesEx(self, token):
+        self.calls += 1
+        objects, size = self._pages.pop(token)
+        return self._page(objects, size)
+
+    def CreatePropertyCollector(self):
+        collector = FakePropertyCollector()
+        self.collectors.append(collector)
+        return collector
+
+    def DestroyPropertyCollector(self):
+        pass
+
+    def CreateFilter(self, spec, partialUpdates):
+        with self._changed:
+            task_filter = FakePropertyFilter(spec)
+            self._filters.append(task_filter)
+            return task_filter
+
+    def notify_change(self, obj, paths: List[str]):
+        with self._changed:
+            if not any(task_filter.covers(obj) for task_filter in self._filters):
+                return
+            self._pending.append((obj, paths))
+            self._changed.notify_all()
+
+    def CancelWaitForUpdates(self):
+        with self._changed:
+            self._pending.append(None)
+            self._changed.notify_all()
+
+    def WaitForUpdatesEx(self, version, options):
+        """
+        Answer the filters created with `CreateFilter`: the objects of a new filter
+        enter on the next call, over truncated sets of `maxObjectUpdates`, then the
+        property changes notified since are returned as modifications.
+        """
+        self.calls += 1
+        with self._changed:
+            for task_filter in self._filters:
+                if not task_filter.entered and not task_filter.destroyed:
+                    task_filter.entered = True
+                    self._initial.extend(
+                        self._object_update("enter", obj, task_filter.path_set)
+                        for obj in task_filter.objects()
+                    )
+            if self._initial:
+                size = options.maxObjectUpdates or len(self._initial)
+                updates, self._initial = self._initial[:size], self._initial[size:]
+                return self._update_set(updates, truncated=bool(self._initial))
+
+            if not self._changed.wait_for(lambda: self._pending, timeout=options.maxWaitSeconds):
+                return None
+            pending, self._pending = self._pending, []
+        if None in pending:
+            raise vmodl.fault.RequestCanceled()
+        return self._update_set([self._object_update("modify", obj, paths) for obj, paths in pending])
+
+    def _object_update(self, kind: str, obj, paths: List[str]):
+        return SimpleNamespace(
+            kind=kind,
+            obj=obj,
+            changeSet=[
+                SimpleNamespace(name=prop.name, op="assign", val=prop.val)
+                for prop in self._properties(obj, paths)
+            ],
+        )
+
+    def _update_set(self, object_updates: List[Any], truncated: bool = False):
+        self._version += 1
+        return SimpleNamespace(
+            version=str(self._version),
+            truncated=truncated,
+            filterSet=[SimpleNamespace(objectSet=object_updates)],
+        )
+
+    def _page(self, objects: List[Any], size: Optional[int]):
+        token = None
+        if size and len(objects) > size:
+            token = f"page-{self.calls}"
+            self._pages[token] = (objects[size:], size)
+            objects = objects[:size]
+        return SimpleNamespace(objects=objects, token=token)
+
+    @staticmethod
+    def _properties(obj, path_set: List[str]) -> List[Any]:
+        properties = []
+        for path in path_set:
+            value = obj
+            for attribute in path.split("."):
+                value = getattr(value, attribute, None)
+            # Unset properties are left out, like vCenter does
+            if value is not None:
+                properties.append(SimpleNamespace(name=path, val=value))
+        return properties
+
+
+class FakeVsphere:
+    """
+    An in-memory vCenter inventory of `num_vms` virtual machines.
+    """
+
+    def __init__(self, num_vms: int, shutdown_seconds: float = 0.0):
+        self.vms = [
+            FakeVirtualMachine(f"vm-{index:03d}", index) for index in range(1, num_vms + 1)
+        ]
+        self.logins = 0
+        self.logouts = 0
+        self.sessions = []
+        self.property_collector = FakePropertyCollector()
+        for vm in self.vms:
+            vm.on_change = self.notify_change
+            vm.shutdown_seconds = shutdown_seconds
+        self.content = SimpleNamespace(
+            rootFolder=SimpleNamespace(childEntity=[]),
+            propertyCollector=self.property_collector,
+            viewManager=SimpleNamespace(
+                CreateContainerView=lambda container, types, recursive: FakeContainerView(
+                    list(self.vms)
+                )
+            ),
+        )
+
+    def smart_connect(self, host: str = None, user: str = None, pwd: str = None, **kwargs):
+        """
+        Stand-in for `SmartConnect`, returning a new authenticated ServiceInstance.
+        """
+        self.logins += 1
+        session_manager = SimpleNamespace(currentSession=SimpleNamespace(key=f"session-{self.logins}"))
+        service_instance = SimpleNamespace(
+            RetrieveContent=lambda: self.content,
+            content=SimpleNamespace(sessionManager=session_manager),
+        )
+        self.sessions.append(session_manager)
+        return service_instance
+
+    def disconnect(self, service_instance):
+        self.logouts += 1
+        service_instance.content.sessionManager.currentSession = None
+
+    def notify_change(self, vm, paths: List[str]):
+        """
+        Report property changes to the collectors waiting for updates.
+        """
+        for collector in self.property_collector.collectors:
+            collector.notify_change(vm, paths)
+
+    def expire_sessions(self):
+        """
+        Expire every session, as vCenter does after its idle timeout.
+        """
+        for session_manager in self.sessions:
+            session_manager.currentSession = None
+
+
+class FakeOpenShiftService:
+    """
+    Stand-in for `OpenShiftService` answering the calls made by the OpenShift tools.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def lookup_provider_uuid_by_name(self, provider_name: str, provider_type: str):
+        return f"{provider_name}-uuid"
+
+    def lookup_vm_id_by_name(self, provider_uuid: str, vm_name: str):
+        return f"id-{vm_name}"
+
+    def create_network_map(self):
+        return {"metadata": {"name": "network-map"}}, "network-map-uid", "network-map"
+
+    def create_storage_map(self):
+        return {"metadata": {"name": "storage-map"}}, "storage-map-uid", "storage-map"
+
+    def create_migration_plan(self, name: str, vms: List[Dict[str, str]] = None, **kwargs):
+        return {
+            "metadata": {"name": name, "uid": f"{name}-uid"},
+            "spec": {"vms": vms or []},
+            "status": {"conditions": [{"type": "Ready", "status": "True"}]},
+        }
+
+    def get_migration_plan_by_name(self, plan_name: str, namespace: str = "openshift-mtv"):
+        return self.create_migration_plan(name=plan_name)
+
+    def start_migration(self, plan_name: str, plan_uid: str, namespace: str = "openshift-mtv"):
+        return {"metadata": {"name": f"{plan_name}-migration"}, "spec": {"plan": plan_uid}}
+
+
+@contextmanager
+def mocked_backends(num_vms: int, shutdown_seconds: float = 0.0):
+    """
+    Patch the vSphere and OpenShift entry points used by the tools with in-memory fakes.
+
+    Parameters:
+    - num_vms (int): Number of VMs in the fake inventory, all powered on.
+    - shutdown_seconds (float): Time each fake VM takes to power off.
+
+    Yields:
+    - FakeVsphere: The fake inventory, e.g. to inspect power states or login counts.
+    """
+    vsphere = FakeVsphere(num_vms, shutdown_seconds)
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("services.vsphere_service.SmartConnect", vsphere.smart_connect))
+        stack.enter_context(mock.patch("services.vsphere_service.Disconnect", vsphere.disconnect))
+        # Start from an empty session pool and VM index, log the sessions out on exit
+        reset_vsphere_pool()
+        reset_vm_index()
+        stack.callback(reset_vsphere_pool)
+        stack.callback(reset_vm_index)
+        stack.enter_context(
+            mock.patch("tools.openshift.openshift_tools.OpenShiftService", FakeOpenShiftService)
+        )
+        yield vsphere
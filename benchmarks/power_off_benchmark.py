@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import mocked_backends
+from pyVmomi import vim
+from utils.vsphere_utils import verify_vms_not_running
+
+
+def sequential_power_off(vms: List[Any]):
+    """
+    Power off VMs one at a time, waiting for each task, as before the concurrent path.
+    """
+    for vm in vms:
+        if vm.runtime.powerState == vim.VirtualMachinePowerState.poweredOn:
+            vm.PowerOff().WaitForCompletion()
+
+
+def run_benchmark(num_vms: int = 50, shutdown_seconds: float = 0.1, max_concurrent: int = 16) -> Dict[str, Any]:
+    with mocked_backends(num_vms, shutdown_seconds) as vsphere:
+        started_at = time.perf_counter()
+        sequential_power_off(vsphere.vms)
+        sequential_seconds = time.perf_counter() - started_at
+
+    with mocked_backends(num_vms, shutdown_seconds) as vsphere:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            started_at = time.perf_counter()
+            report = verify_vms_not_running(
+                [vm.name for vm in vsphere.vms], None, vsphere.content, max_concurrent=max_concurrent
+            )
+            concurrent_seconds = time.perf_counter() - started_at
+
+    statuses: Dict[str, int] = {}
+    for result in report.values():
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    return {
+        "num_vms": num_vms,
+        "shutdown_seconds": shutdown_seconds,
+        "max_concurrent": max_concurrent,
+        "sequential_seconds": sequential_seconds,
+        "concurrent_seconds": concurrent_seconds,
+        "speedup": sequential_seconds / concurrent_seconds,
+        "statuses": statuses,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the time to power off a wave of VMs, one at a time and concurrently."
+    )
+    parser.add_argument("--vms", type=int, default=50, help="VMs to power off.")
+    parser.add_argument("--shutdown", type=float, default=0.1, help="Shutdown time of each VM, in seconds.")
+    parser.add_argument("--max_concurrent", type=int, default=16, help="VMs powering off at the same time.")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.vms, args.shutdown, args.max_concurrent), indent=2))
@@ -0,0 +1,136 @@
+import os
+import sys
+import json
+import time
+import argparse
+from string import Formatter
+from typing import Any, Callable, Dict
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import ScriptedModel
+from builders import prompt_builder
+from builders.prompt_builder import (
+    CURRENT_CONTEXT_HEADER,
+    VOLATILE_PROMPT_FIELDS,
+    PromptBuilder,
+)
+from config.app_config import app_config
+from config.agents_config import PROMPT_LAYOUTS
+
+
+def reference_render(template: str, **values) -> str:
+    """
+    Render a prompt with `str.format` on every call, as before templates were compiled.
+    """
+    volatile = []
+    for _, field, _, _ in Formatter().parse(template):
+        if field in VOLATILE_PROMPT_FIELDS and field not in volatile:
+            volatile.append(field)
+    if app_config.agents_config.prompt_layout == "inline" or not volatile:
+        return template.format(**values)
+
+    references = {field: f"<{field}>" for field in volatile}
+    prefix = template.format(**{**values, **references})
+    context = "\n\n".join(f"<{field}>\n{values[field]}\n</{field}>" for field in volatile)
+    return f"{prefix.rstrip()}\n\n---\n\n{CURRENT_CONTEXT_HEADER}\n{context}\n"
+
+
+def agent_turns(num_tasks: int) -> Dict[str, Callable[[], str]]:
+    """
+    Return the system prompt built by every agent turn, for a task list of `num_tasks`.
+    """
+    model = ScriptedModel(num_tasks=num_tasks)
+    tasks = [model._public_task(task, "pending") for task in model.tasks]
+    task = tasks[-1]
+    scratchpad = "\n".join(
+        json.dumps({"thought": "I will create the plan.", "action": task["tool_to_use"], "action_input": {}})
+        for _ in range(2)
+    )
+    engineer_fields = {
+        "task": task["task_name"],
+        "task_description": task["task_description"],
+        "acceptance_criteria": task["acceptance_criteria"],
+        "tool_names": PromptBuilder.openshift_tool_names,
+        "tool_descriptions": PromptBuilder.openshift_tool_descriptions,
+        "scratchpad": scratchpad,
+    }
+    reflect_fields = {
+        key: value for key, value in engineer_fields.items() if not key.startswith("tool_")
+    }
+    return {
+        "planner": lambda: PromptBuilder.build_planner_prompt("Migrate VM 'database'"),
+        "manager": lambda: PromptBuilder.build_pm_prompt(json.dumps({"tasks": tasks}, indent=4)),
+        "manager_delta": lambda: PromptBuilder.build_pm_delta_prompt(tasks),
+        "think": lambda: PromptBuilder.build_engineer_prompt(
+            provided_inputs=task["provided_inputs"], **engineer_fields
+        ),
+        "reflect": lambda: PromptBuilder.build_engineer_reflect_prompt(**reflect_fields),
+        "merged": lambda: PromptBuilder.build_engineer_merged_prompt(
+            provided_inputs=task["provided_inputs"], **engineer_fields
+        ),
+        "reviewer": lambda: PromptBuilder.build_reviewer_prompt(task),
+        "reviewer_batch": lambda: PromptBuilder.build_reviewer_batch_prompt(
+            [(task, "The task has been completed.") for task in tasks]
+        ),
+    }
+
+
+def time_build(build: Callable[[], str], iterations: int) -> float:
+    """
+    Return the mean time, in microseconds, of one prompt build.
+    """
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    return (time.perf_counter() - started_at) / iterations * 1_000_000
+
+
+def run_benchmark(iterations: int = 2000, num_tasks: int = 8) -> Dict[str, Any]:
+    original_layout = app_config.agents_config.prompt_layout
+    results = {}
+    mismatches = []
+    try:
+        for layout in PROMPT_LAYOUTS:
+            app_config.agents_config.prompt_layout = layout
+            for name, build in agent_turns(num_tasks).items():
+                # Freeze the date so both renderings can be compared
+                with mock.patch.object(prompt_builder, "get_current_utc_datetime", lambda: "2024-01-01 00:00:00"):
+                    with mock.patch.object(PromptBuilder, "render", staticmethod(reference_render)):
+                        expected = build()
+                    if build() != expected:
+                        mismatches.append(f"{layout}.{name}")
+
+                with mock.patch.object(PromptBuilder, "render", staticmethod(reference_render)):
+                    format_us = time_build(build, iterations)
+                compiled_us = time_build(build, iterations)
+                results[f"{layout}.{name}"] = {
+                    "prompt_bytes": len(expected.encode("utf-8")),
+                    "str_format_us": format_us,
+                    "compiled_us": compiled_us,
+                    "speedup": format_us / compiled_us,
+                }
+    finally:
+        app_config.agents_config.prompt_layout = original_layout
+
+    return {
+        "iterations": iterations,
+        "num_tasks": num_tasks,
+        "byte_identical": not mismatches,
+        "mismatches": mismatches,
+        "prompts": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the system prompt build time of every agent turn, per prompt layout."
+    )
+    parser.add_argument("--iterations", type=int, default=2000, help="Builds per prompt.")
+    parser.add_argument("--tasks", type=int, default=8, help="Tasks in the representative task list.")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.iterations, args.tasks)
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["byte_identical"] else 1)
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jsonschema
+from benchmarks.fixtures import ScriptedModel
+from schemas.planner_schema import planner_output_schema
+from schemas.pm_schema import pm_output_schema
+from schemas.reviewer_schema import task_completion_schema
+from schemas.engineer_schema import (
+    engineer_output_schema,
+    engineer_reflection_output_schema,
+    engineer_merged_output_schema,
+)
+from schemas.validators import clear_validators, get_validator
+
+
+def representative_outputs(num_tasks: int) -> Dict[str, Any]:
+    """
+    Return a valid output of every validated agent phase, as the scripted model answers them.
+    """
+    model = ScriptedModel(num_tasks=num_tasks)
+    action = model._action("")
+    return {
+        "planner": (planner_output_schema, model._plan()),
+        "manager": (pm_output_schema, model._task_list("", "")),
+        "think": (engineer_output_schema, action),
+        "reflect": (engineer_reflection_output_schema, model._reflection("")),
+        "merged": (engineer_merged_output_schema, action),
+        "reviewer": (task_completion_schema, model._verdict("")),
+        "reviewer_invalid": (
+            task_completion_schema,
+            {"task_id": "task_001", "status": "done", "notification": "Done."},
+        ),
+    }
+
+
+def time_validation(validate: Callable[[], Any], iterations: int) -> float:
+    """
+    Return the mean time, in microseconds, of one validation.
+    """
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        try:
+            validate()
+        except jsonschema.exceptions.ValidationError:
+            pass
+    return (time.perf_counter() - started_at) / iterations * 1_000_000
+
+
+def run_benchmark(iterations: int = 2000, num_tasks: int = 8) -> Dict[str, Any]:
+    backends = ["jsonschema"]
+    try:
+        import fastjsonschema  # noqa: F401
+
+        backends.append("fastjsonschema")
+    except ImportError:
+        pass
+
+    results = {}
+    for name, (schema, instance) in representative_outputs(num_tasks).items():
+        timings = {
+            "jsonschema.validate_us": time_validation(
+                lambda: jsonschema.validate(instance=instance, schema=schema), iterations
+            )
+        }
+        for backend in backends:
+            clear_validators()
+            validator = get_validator(schema, backend)
+            timings[f"cached_{backend}_us"] = time_validation(
+                lambda: validator.validate(instance), iterations
+            )
+        timings["speedup"] = {
+            backend: timings["jsonschema.validate_us"] / timings[f"cached_{backend}_us"]
+            for backend in backends
+        }
+        results[name] = timings
+
+    return {"iterations": iterations, "num_tasks": num_tasks, "outputs": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the per-validation cost of the agent output schemas."
+    )
+    parser.add_argument("--iterations", type=int, default=2000, help="Validations per output.")
+    parser.add_argument("--tasks", type=int, default=8, help="Tasks in the representative task list.")
+    args = parser.parse_args()
+
+    print(json.dumps(run_benchmark(args.iterations, args.tasks), indent=2))
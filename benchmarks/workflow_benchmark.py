@@ -0,0 +1,458 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import threading
+import functools
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import ScriptedModel, mocked_backends
+from config.app_config import app_config
+from services.cassette import Cassette
+from services.model_service import ModelService
+from services.inventory_mirror import start_inventory_mirror, stop_inventory_mirror
+from services.plan_cache import reset_plan_cache
+from services.replay_server import ReplayServer
+from tools.tool_registry import load_tools
+from utils.metrics_utils import get_counters, get_observations, reset_counters
+from workflows import workflow_graph
+
+# Node name -> node function registered by `create_graph`, for both execution modes
+SYNC_NODE_FUNCTIONS = {
+    "planner": "planner_node_function",
+    "manager": "pm_node_function",
+    "ocp_engineer": "jr_engineer_node_function",
+    "vsphere_engineer": "vsphere_engineer_node_function",
+    "reviewer": "reviewer_node_function",
+}
+ASYNC_NODE_FUNCTIONS = {
+    "planner": "aplanner_node_function",
+    "manager": "apm_node_function",
+    "ocp_engineer": "ajr_engineer_node_function",
+    "vsphere_engineer": "avsphere_engineer_node_function",
+    "reviewer": "areviewer_node_function",
+}
+
+
+class NodeTimings:
+    """
+    Collect per-node wall time for every run, keyed by the run's user request.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, run_key: str, node: str, seconds: float):
+        with self._lock:
+            self.timings.setdefault(run_key, []).append({"node": node, "seconds": seconds})
+
+    def for_run(self, run_key: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.timings.get(run_key, []))
+
+
+@contextmanager
+def instrumented_nodes(timings: NodeTimings, use_async: bool):
+    """
+    Wrap the node functions used by `create_graph` so each execution is timed.
+    """
+    node_functions = ASYNC_NODE_FUNCTIONS if use_async else SYNC_NODE_FUNCTIONS
+    originals = {}
+
+    for node, function_name in node_functions.items():
+        original = getattr(workflow_graph, function_name)
+        originals[function_name] = original
+
+        if use_async:
+            async def timed(state, _original=original, _node=node):
+                started_at = time.perf_counter()
+                try:
+                    return await _original(state)
+                finally:
+                    timings.add(state["user_request"], _node, time.perf_counter() - started_at)
+        else:
+            def timed(state, _original=original, _node=node):
+                started_at = time.perf_counter()
+                try:
+                    return _original(state)
+                finally:
+                    timings.add(state["user_request"], _node, time.perf_counter() - started_at)
+
+        setattr(workflow_graph, function_name, functools.wraps(original)(timed))
+
+    try:
+        yield
+    finally:
+        for function_name, original in originals.items():
+            setattr(workflow_graph, function_name, original)
+
+
+def peak_rss_mb() -> float:
+    """
+    Return the peak resident set size of the process in MiB.
+    """
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def summarize_nodes(node_timings: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    summary = {}
+    for timing in node_timings:
+        node_summary = summary.setdefault(
+            timing["node"], {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        node_summary["count"] += 1
+        node_summary["total_seconds"] += timing["seconds"]
+        node_summary["max_seconds"] = max(node_summary["max_seconds"], timing["seconds"])
+    for node_summary in summary.values():
+        node_summary["mean_seconds"] = node_summary["total_seconds"] / node_summary["count"]
+    return summary
+
+
+def run_workflow(workflow, user_request: str, run_index: int, recursion_limit: int) -> Dict[str, Any]:
+    config = {
+        "configurable": {"thread_id": f"benchmark-{run_index}"},
+        "recursion_limit": recursion_limit,
+    }
+    started_at = time.perf_counter()
+    error = None
+    try:
+        for _ in workflow.stream({"user_request": user_request}, config=config):
+            pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)}"
+    return {"wall_seconds": time.perf_counter() - started_at, "error": error}
+
+
+async def arun_workflow(workflow, user_request: str, run_index: int, recursion_limit: int) -> Dict[str, Any]:
+    config = {
+        "configurable": {"thread_id": f"benchmark-{run_index}"},
+        "recursion_limit": recursion_limit,
+    }
+    started_at = time.perf_counter()
+    error = None
+    try:
+        async for _ in workflow.astream({"user_request": user_request}, config=config):
+            pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)}"
+    return {"wall_seconds": time.perf_counter() - started_at, "error": error}
+
+
+def run_benchmark(
+    num_tasks: int = 4,
+    num_vms: int = 10,
+    runs: int = 1,
+    concurrency: int = 1,
+    latency: float = 0.0,
+    cassette: str = None,
+    use_async: bool = False,
+    recursion_limit: int = 200,
+    quiet: bool = True,
+    engineer_mode: str = None,
+    tool_failures: int = 0,
+    fast_path: bool = None,
+    malformed_outputs: bool = False,
+    plan_cache: bool = None,
+    prompt_layout: str = None,
+    prompt_cache_slots: int = 1,
+    inventory_mirror: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run the compiled workflow against a replayed model and mocked backends.
+
+    Parameters:
+    - num_tasks (int): Number of tasks in the scripted plan.
+    - num_vms (int): Number of VMs in the mocked vSphere inventory.
+    - runs (int): Total number of workflow runs.
+    - concurrency (int): Number of runs executing at the same time.
+    - latency (float): Artificial model latency per call, in seconds.
+    - cassette (str, optional): Replay this cassette instead of the scripted model.
+    - use_async (bool): Drive the async graph with `astream`.
+    - recursion_limit (int): LangGraph recursion limit for each run.
+    - quiet (bool): Silence agent output while the workflow runs.
+    - engineer_mode (str, optional): Execution mode of the OpenShift engineer,
+      'three_phase' or 'merged'. Defaults to the configured mode.
+    - tool_failures (int): Failed tool calls the scripted model makes on each
+      OpenShift task before using valid inputs.
+    - fast_path (bool, optional): Complete engineer tasks without a reflect call
+      when the tool result passes its success check. Defaults to the config.
+    - malformed_outputs (bool): Have the scripted model return planner, manager and
+      reviewer answers that need a local repair.
+    - plan_cache (bool, optional): Reuse the plan of the first run for the others,
+      which only differ by their VM group. The cache is kept in memory. Defaults
+      to the config.
+    - prompt_layout (str, optional): System prompt layout, 'inline' or
+      'static_prefix'. Defaults to the config.
+    - prompt_cache_slots (int): Slots of the simulated server prompt cache the
+      reported prompt eval statistics come from, 0 to report the responder's own.
+    - inventory_mirror (bool): Keep the VM index current with the inventory mirror
+      instead of rebuilding it when it expires.
+
+    Returns:
+    - dict: Machine-readable results, see `--output`.
+    """
+    responder = (
+        Cassette.load(cassette)
+        if cassette
+        else ScriptedModel(
+            num_tasks, num_vms, tool_failures=tool_failures, malformed_outputs=malformed_outputs
+        )
+    )
+    timings = NodeTimings()
+    original_endpoint = app_config.model_config.model_endpoint
+    original_stream = app_config.model_config.stream
+    original_engineer_modes = dict(app_config.agents_config.engineer_modes)
+    original_fast_path = app_config.agents_config.fast_path_completion
+    original_plan_cache = app_config.agents_config.plan_cache_enabled
+    original_plan_cache_dir = app_config.agents_config.plan_cache_dir
+    original_prompt_layout = app_config.agents_config.prompt_layout
+    if engineer_mode:
+        app_config.agents_config.engineer_modes["ocp_engineer"] = engineer_mode
+    if fast_path is not None:
+        app_config.agents_config.fast_path_completion = fast_path
+    if plan_cache is not None:
+        app_config.agents_config.plan_cache_enabled = plan_cache
+    app_config.agents_config.plan_cache_dir = ""
+    if prompt_layout:
+        app_config.agents_config.prompt_layout = prompt_layout
+    reset_plan_cache()
+    reset_counters()
+
+    load_tools(verbose=False)
+
+    with ReplayServer(
+        responder, latency=latency, prompt_cache_slots=prompt_cache_slots
+    ) as server, mocked_backends(num_vms):
+        app_config.model_config.model_endpoint = server.url
+        app_config.model_config.stream = False
+        try:
+            if inventory_mirror:
+                start_inventory_mirror().wait_until_synced(timeout=10)
+            with instrumented_nodes(timings, use_async), open(os.devnull, "w") as devnull:
+                graph = workflow_graph.create_graph(use_async=use_async)
+                workflow = workflow_graph.compile_workflow(graph)
+                requests = [
+                    f"Migrate {num_vms} VMs of group 'group-{index:03d}' from VMware to OpenShift"
+                    for index in range(runs)
+                ]
+
+                started_at = time.perf_counter()
+                with redirect_stdout(devnull if quiet else sys.stdout):
+                    if use_async:
+                        results = asyncio.run(
+                            _arun_all(workflow, requests, concurrency, recursion_limit)
+                        )
+                    else:
+                        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                            results = list(
+                                executor.map(
+                                    lambda item: run_workflow(workflow, item[1], item[0], recursion_limit),
+                                    enumerate(requests),
+                                )
+                            )
+                total_seconds = time.perf_counter() - started_at
+        finally:
+            app_config.model_config.model_endpoint = original_endpoint
+            app_config.model_config.stream = original_stream
+            app_config.agents_config.engineer_modes = original_engineer_modes
+            app_config.agents_config.fast_path_completion = original_fast_path
+            app_config.agents_config.plan_cache_enabled = original_plan_cache
+            app_config.agents_config.plan_cache_dir = original_plan_cache_dir
+            app_config.agents_config.prompt_layout = original_prompt_layout
+            reset_plan_cache()
+            stop_inventory_mirror(timeout=10)
+
+        server_stats = server.stats()
+
+    run_reports = []
+    all_timings = []
+    for index, (user_request, result) in enumerate(zip(requests, results)):
+        node_timings = timings.for_run(user_request)
+        all_timings.extend(node_timings)
+        run_reports.append(
+            {
+                "run": index,
+                "wall_seconds": result["wall_seconds"],
+                "error": result["error"],
+                "node_executions": len(node_timings),
+                "nodes": summarize_nodes(node_timings),
+            }
+        )
+
+    wall_times = sorted(report["wall_seconds"] for report in run_reports)
+    observations = get_observations()
+    return {
+        "config": {
+            "num_tasks": num_tasks,
+            "num_vms": num_vms,
+            "runs": runs,
+            "concurrency": concurrency,
+            "latency": latency,
+            "cassette": cassette,
+            "use_async": use_async,
+            "engineer_mode": app_config.agents_config.get_engineer_mode("ocp_engineer")
+            if not engineer_mode
+            else engineer_mode,
+            "tool_failures": tool_failures,
+            "malformed_outputs": malformed_outputs,
+            "fast_path": app_config.agents_config.fast_path_completion
+            if fast_path is None
+            else fast_path,
+            "plan_cache": original_plan_cache if plan_cache is None else plan_cache,
+            "prompt_layout": prompt_layout or original_prompt_layout,
+            "prompt_cache_slots": prompt_cache_slots,
+            "inventory_mirror": inventory_mirror,
+        },
+        "summary": {
+            "total_seconds": total_seconds,
+            "runs_per_second": runs / total_seconds if total_seconds else 0.0,
+            "wall_seconds_mean": sum(wall_times) / len(wall_times),
+            "wall_seconds_p50": wall_times[len(wall_times) // 2],
+            "wall_seconds_max": wall_times[-1],
+            "failed_runs": sum(1 for report in run_reports if report["error"]),
+            "model_calls": server_stats["requests"],
+            "model_calls_per_run": server_stats["requests"] / runs,
+            "unmatched_model_calls": server_stats["unmatched"],
+            "counters": get_counters(),
+            "engineer_prompt_bytes": observations_by_prefix(observations, "engineer_prompt_bytes."),
+            "prompt_eval_tokens": observations_by_prefix(observations, "prompt_eval_tokens."),
+            "prompt_eval_ms": observations_by_prefix(observations, "prompt_eval_ms."),
+            "prompt_bytes": server_stats["prompt_bytes"],
+            "prompt_bytes_per_run": server_stats["prompt_bytes"] / runs,
+            "peak_rss_mb": peak_rss_mb(),
+            "nodes": summarize_nodes(all_timings),
+        },
+        "runs": run_reports,
+    }
+
+
+def observations_by_prefix(observations: Dict[str, Dict[str, float]], prefix: str) -> Dict[str, Any]:
+    """
+    Return the observations under a name prefix, keyed by the rest of the name,
+    with the total over all of them.
+    """
+    selected = {
+        name[len(prefix):]: values for name, values in observations.items() if name.startswith(prefix)
+    }
+    if selected:
+        selected["total"] = sum(values["total"] for values in selected.values())
+    return selected
+
+
+async def _arun_all(workflow, requests: List[str], concurrency: int, recursion_limit: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index: int, user_request: str):
+        async with semaphore:
+            return await arun_workflow(workflow, user_request, index, recursion_limit)
+
+    try:
+        return await asyncio.gather(
+            *(bounded(index, user_request) for index, user_request in enumerate(requests))
+        )
+    finally:
+        await ModelService.aclose_http_session()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the migration workflow against a replayed model and mocked backends."
+    )
+    parser.add_argument("--tasks", type=int, default=4, help="Number of tasks in the plan.")
+    parser.add_argument("--vms", type=int, default=10, help="Number of VMs in the inventory.")
+    parser.add_argument("--runs", type=int, default=1, help="Number of workflow runs.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent workflow runs.")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Artificial model latency per call, in seconds."
+    )
+    parser.add_argument(
+        "--cassette", type=str, default=None, help="Replay a recorded cassette instead of the scripted model."
+    )
+    parser.add_argument("--use_async", action="store_true", help="Drive the async graph with astream.")
+    parser.add_argument("--recursion_limit", type=int, default=200, help="LangGraph recursion limit.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report to this file.")
+    parser.add_argument("--verbose", action="store_true", help="Show agent output while running.")
+    parser.add_argument(
+        "--engineer_mode",
+        type=str,
+        choices=["three_phase", "merged"],
+        default=None,
+        help="Execution mode of the OpenShift engineer.",
+    )
+    parser.add_argument(
+        "--tool_failures",
+        type=int,
+        default=0,
+        help="Failed tool calls per OpenShift task before the scripted model gets it right.",
+    )
+    parser.add_argument(
+        "--fast_path",
+        action="store_true",
+        help="Skip the reflect call when a tool result proves the task is done.",
+    )
+    parser.add_argument(
+        "--malformed_outputs",
+        action="store_true",
+        help="Return fenced, truncated planner/manager/reviewer answers that need a local repair.",
+    )
+    parser.add_argument(
+        "--plan_cache",
+        action="store_true",
+        help="Reuse the first run's plan for the later runs, which only differ by VM group.",
+    )
+    parser.add_argument(
+        "--prompt_layout",
+        type=str,
+        choices=["inline", "static_prefix"],
+        default=None,
+        help="System prompt layout.",
+    )
+    parser.add_argument(
+        "--prompt_cache_slots",
+        type=int,
+        default=1,
+        help="Slots of the simulated server prompt cache, 0 to disable the simulation.",
+    )
+    parser.add_argument(
+        "--inventory_mirror",
+        action="store_true",
+        help="Keep the VM index current from vCenter updates instead of rebuilding it.",
+    )
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        num_tasks=args.tasks,
+        num_vms=args.vms,
+        runs=args.runs,
+        concurrency=args.concurrency,
+        latency=args.latency,
+        cassette=args.cassette,
+        use_async=args.use_async,
+        recursion_limit=args.recursion_limit,
+        quiet=not args.verbose,
+        engineer_mode=args.engineer_mode,
+        tool_failures=args.tool_failures,
+        fast_path=True if args.fast_path else None,
+        malformed_outputs=args.malformed_outputs,
+        plan_cache=True if args.plan_cache else None,
+        prompt_layout=args.prompt_layout,
+        prompt_cache_slots=args.prompt_cache_slots,
+        inventory_mirror=args.inventory_mirror,
+    )
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report_json)
+    print(report_json)
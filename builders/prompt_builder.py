@@ -1,6 +1,8 @@
 # prompts/prompt_builder.py
 from utils.helpers import get_current_utc_datetime
 from config.app_config import app_config
+from config.agents_config import PROMPT_LAYOUTS
+from builders.prompt_template import PromptTemplate, PromptTemplateCache, TemplateField
 from tools import (
     vsphere_tool_names,
     openshift_tool_names,
@@ -10,11 +12,68 @@ from tools.tool_registry import (
     get_tool_names_by_category,
 )
 from prompts.planner_prompt import DEFAULT_SYS_PLANNER_PROMPT
-from prompts.pm_prompt import DEFAULT_SYS_PM_PROMPT
+from prompts.pm_prompt import DEFAULT_SYS_PM_PROMPT, DEFAULT_SYS_PM_DELTA_PROMPT
 from prompts.architect_prompt import DEFAULT_SYS_ARCHITECT_REACT_PROMPT
-from prompts.reviewer_prompt import DEFAULT_SYS_REVIEWER_PROMPT
+from prompts.reviewer_prompt import (
+    DEFAULT_SYS_REVIEWER_PROMPT,
+    DEFAULT_SYS_REVIEWER_BATCH_PROMPT,
+)
 from prompts.react_agent_prompt import DEFAULT_SYS_REACT_AGENT_PROMPT
-from prompts.engineer_prompt import DEFAULT_SYS_ENGINEER_PROMPT, DEFAULT_SYS_ENGINEER_REFLECT_PROMPT
+from prompts.engineer_prompt import (
+    DEFAULT_SYS_ENGINEER_PROMPT,
+    DEFAULT_SYS_ENGINEER_REFLECT_PROMPT,
+    DEFAULT_SYS_ENGINEER_MERGED_PROMPT,
+)
+
+# Template fields whose values change from one call of a role to the next. With the
+# "static_prefix" layout they are rendered after the stable instructions.
+VOLATILE_PROMPT_FIELDS = (
+    "datetime",
+    "feedback",
+    "task",
+    "task_description",
+    "acceptance_criteria",
+    "provided_inputs",
+    "agent_scratchpad",
+    "original_tasks_list",
+    "task_summary",
+    "original_task",
+    "reviews",
+)
+CURRENT_CONTEXT_HEADER = "### Current Context:\nThe values referenced as <name> above.\n"
+
+
+# Templates compiled per layout and per set of static values (agents and tool descriptions)
+_compiled_templates = PromptTemplateCache()
+
+
+def compile_prompt_template(template: str, layout: str, static_values: dict) -> PromptTemplate:
+    """
+    Parse a prompt template, lay it out and render its static fields once.
+
+    Parameters:
+    - template (str): The prompt template.
+    - layout (str): One of PROMPT_LAYOUTS.
+    - static_values (dict): Values of the fields outside VOLATILE_PROMPT_FIELDS.
+
+    Returns:
+    - PromptTemplate: The template, with only volatile fields left to fill.
+    """
+    parsed = PromptTemplate(template)
+    volatile = [field for field in parsed.fields if field in VOLATILE_PROMPT_FIELDS]
+    if layout == "inline" or not volatile:
+        return parsed.bind(**static_values)
+
+    references = {field: f"<{field}>" for field in volatile}
+    prefix = parsed.bind(**static_values, **references).render()
+    parts = [f"{prefix.rstrip()}\n\n---\n\n{CURRENT_CONTEXT_HEADER}\n"]
+    for index, field in enumerate(volatile):
+        parts.extend(
+            ["\n\n" if index else "", f"<{field}>\n", TemplateField(field, None, ""), f"\n</{field}>"]
+        )
+    parts.append("\n")
+    return PromptTemplate.from_parts(parts)
+
 
 class PromptBuilder:
     openshift_tool_names = get_tool_names_by_category("openshift")
@@ -23,13 +82,53 @@ class PromptBuilder:
     vsphere_tool_names = get_tool_names_by_category("vsphere_lifecycle")
     vsphere_tool_descriptions = get_tool_descriptions_by_category("vsphere_lifecycle")
 
+    @staticmethod
+    def render(template: str, **values) -> str:
+        """
+        Fill a prompt template according to the configured prompt layout.
+
+        With the "static_prefix" layout, volatile fields are replaced by a
+        `<field>` reference and their values are appended in a trailing section,
+        so every call of a role starts with the same text and the model server
+        only evaluates the part after it.
+
+        The template is compiled once per layout and set of static values (see
+        `compile_prompt_template`), later calls only format the volatile fields.
+        The output is the same as with `str.format`.
+
+        Parameters:
+        - template (str): The prompt template.
+        - values: The template fields.
+
+        Returns:
+        - str: The prompt.
+        """
+        layout = app_config.agents_config.prompt_layout
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout '{layout}'.")
+
+        static_values = {}
+        volatile_values = {}
+        for name, value in values.items():
+            if name in VOLATILE_PROMPT_FIELDS:
+                volatile_values[name] = value
+            else:
+                static_values[name] = value
+
+        compiled = _compiled_templates.get(
+            (template, layout, *static_values.keys(), *static_values.values()),
+            lambda: compile_prompt_template(template, layout, static_values),
+        )
+        return compiled.render(**volatile_values)
+
     @staticmethod
     def build_planner_prompt(
         user_request: str, 
         feedback_value: str = "",
         agents_description: str = app_config.agents_config.agents_description,
     ) -> str:
-        return DEFAULT_SYS_PLANNER_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_PLANNER_PROMPT,
             agents_description=agents_description,
             feedback=feedback_value,
             datetime=get_current_utc_datetime(),
@@ -41,7 +140,8 @@ class PromptBuilder:
         feedback_value: str = "",
         agents_description: str = app_config.agents_config.agents_description,
     ) -> str:
-        return DEFAULT_SYS_PM_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_PM_PROMPT,
             original_tasks_list=original_tasks_list,
             agents_description=agents_description,
             vsphere_tool_names=vsphere_tool_names,
@@ -50,6 +150,31 @@ class PromptBuilder:
             datetime=get_current_utc_datetime(),
         )
 
+    @staticmethod
+    def build_pm_delta_prompt(
+        tasks: list,
+        feedback_value: str = "",
+        agents_description: str = app_config.agents_config.agents_description,
+    ) -> str:
+        """
+        Build the prompt asking the PM for a patch of the task list.
+
+        Parameters:
+        - tasks (list): The current tasks, rendered one line each.
+        """
+        task_summary = "\n".join(
+            f"- {task.get('task_id')} | {task.get('task_name')} | {task.get('agent')} | "
+            f"{task.get('status')} | {', '.join(task.get('dependencies') or []) or '-'}"
+            for task in tasks
+        )
+        return PromptBuilder.render(
+            DEFAULT_SYS_PM_DELTA_PROMPT,
+            task_summary=task_summary,
+            agents_description=agents_description,
+            feedback=feedback_value,
+            datetime=get_current_utc_datetime(),
+        )
+
     @staticmethod
     def build_architect_prompt(
         task: str,
@@ -60,7 +185,8 @@ class PromptBuilder:
         scratchpad: str = "",
         feedback_value: str = "",
     ) -> str:
-        return DEFAULT_SYS_ARCHITECT_REACT_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_ARCHITECT_REACT_PROMPT,
             task=task,
             task_description=task_description,
             acceptance_criteria=acceptance_criteria,
@@ -81,7 +207,8 @@ class PromptBuilder:
         scratchpad: str = "",
         feedback_value: str = "",
     ) -> str:
-        return DEFAULT_SYS_REACT_AGENT_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_REACT_AGENT_PROMPT,
             task=task,
             task_description=task_description,
             acceptance_criteria=acceptance_criteria,
@@ -102,7 +229,8 @@ class PromptBuilder:
         tool_descriptions: str = vsphere_tool_descriptions,
         scratchpad: str = "",
     ) -> str:
-        return DEFAULT_SYS_ENGINEER_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_ENGINEER_PROMPT,
             task=task,
             task_description=task_description,
             acceptance_criteria=acceptance_criteria,
@@ -120,10 +248,33 @@ class PromptBuilder:
         acceptance_criteria: str,
         scratchpad: str = "",
     ) -> str:
-        return DEFAULT_SYS_ENGINEER_REFLECT_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_ENGINEER_REFLECT_PROMPT,
+            task=task,
+            task_description=task_description,
+            acceptance_criteria=acceptance_criteria,
+            agent_scratchpad=scratchpad,
+            datetime=get_current_utc_datetime(),
+        )
+
+    @staticmethod
+    def build_engineer_merged_prompt(
+        task: str,
+        task_description: str,
+        acceptance_criteria: str,
+        provided_inputs: str,
+        tool_names: str = vsphere_tool_names,
+        tool_descriptions: str = vsphere_tool_descriptions,
+        scratchpad: str = "",
+    ) -> str:
+        return PromptBuilder.render(
+            DEFAULT_SYS_ENGINEER_MERGED_PROMPT,
             task=task,
             task_description=task_description,
             acceptance_criteria=acceptance_criteria,
+            provided_inputs=provided_inputs,
+            tool_names=tool_names,
+            tool_descriptions=tool_descriptions,
             agent_scratchpad=scratchpad,
             datetime=get_current_utc_datetime(),
         )
@@ -133,8 +284,33 @@ class PromptBuilder:
         original_task: dict,
         feedback_value: str = "",
     ) -> str:
-        return DEFAULT_SYS_REVIEWER_PROMPT.format(
+        return PromptBuilder.render(
+            DEFAULT_SYS_REVIEWER_PROMPT,
             original_task=original_task,
             feedback=feedback_value,
             datetime=get_current_utc_datetime(),
         )
+
+    @staticmethod
+    def build_reviewer_batch_prompt(
+        reviews: list,
+        feedback_value: str = "",
+    ) -> str:
+        """
+        Build the prompt reviewing several tasks at once.
+
+        Parameters:
+        - reviews (list): (original task, agent update) pairs, one per task to review.
+        """
+        formatted_reviews = "\n\n".join(
+            f"### Task {original_task.get('task_id')}\n"
+            f"- **Original Task**: {original_task}\n"
+            f"- **Agent Update**: {agent_update}"
+            for original_task, agent_update in reviews
+        )
+        return PromptBuilder.render(
+            DEFAULT_SYS_REVIEWER_BATCH_PROMPT,
+            reviews=formatted_reviews,
+            feedback=feedback_value,
+            datetime=get_current_utc_datetime(),
+        )
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+_formatter = Formatter()
+
+
+class TemplateField(NamedTuple):
+    name: str
+    conversion: Optional[str]
+    format_spec: str
+
+
+class PromptTemplate:
+    """
+    A `str.format` template parsed once.
+
+    Rendering joins the literal text with the formatted fields instead of parsing
+    the template again, and `bind` fills fields ahead of time, e.g. the agents and
+    tool descriptions that are the same on every call of a role. The output is the
+    same, byte for byte, as `str.format` with the same values.
+    """
+
+    def __init__(self, template: str):
+        """
+        Parameters:
+        - template (str): The template, in `str.format` syntax with named fields.
+
+        Raises:
+        - ValueError: If the template has positional or nested fields.
+        """
+        self.parts: Tuple[Union[str, TemplateField], ...] = tuple(self._parse(template))
+
+    @classmethod
+    def from_parts(cls, parts: Iterable[Union[str, TemplateField]]) -> "PromptTemplate":
+        """
+        Build a template from literal text and fields, merging adjacent literals.
+        """
+        template = cls.__new__(cls)
+        template.parts = tuple(_merge_literals(parts))
+        return template
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        """
+        The field names left to fill, in order of first appearance.
+        """
+        names = []
+        for part in self.parts:
+            if isinstance(part, TemplateField) and part.name not in names:
+                names.append(part.name)
+        return tuple(names)
+
+    def bind(self, **values) -> "PromptTemplate":
+        """
+        Return a template with the given fields rendered into its literal text.
+        Values for fields the template does not have are ignored.
+        """
+        return self.from_parts(
+            _format_field(part, values)
+            if isinstance(part, TemplateField) and _root_name(part.name) in values
+            else part
+            for part in self.parts
+        )
+
+    def render(self, **values) -> str:
+        """
+        Fill the remaining fields.
+
+        Raises:
+        - KeyError: If a field has no value, like `str.format`.
+        """
+        return "".join(
+            _format_field(part, values) if isinstance(part, TemplateField) else part
+            for part in self.parts
+        )
+
+    @staticmethod
+    def _parse(template: str) -> List[Union[str, TemplateField]]:
+        parts = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(template):
+            if literal:
+                parts.append(literal)
+            if field_name is None:
+                continue
+            if not field_name or field_name.isdigit():
+                raise ValueError("Prompt templates only support named fields.")
+            if "{" in format_spec:
+                raise ValueError(f"Nested format specs are not supported in field '{field_name}'.")
+            parts.append(TemplateField(field_name, conversion, format_spec))
+        return parts
+
+
+def _root_name(field_name: str) -> str:
+    # "task.name" and "task[0]" are looked up on "task"
+    return field_name.split(".", 1)[0].split("[", 1)[0]
+
+
+def _format_field(field: TemplateField, values: Dict[str, Any]) -> str:
+    value, _ = _formatter.get_field(field.name, (), values)
+    value = _formatter.convert_field(value, field.conversion)
+    return format(value, field.format_spec)
+
+
+def _merge_literals(parts: Iterable[Union[str, TemplateField]]) -> List[Union[str, TemplateField]]:
+    merged = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        elif part != "":
+            merged.append(part)
+    return merged
+
+
+class PromptTemplateCache:
+    """
+    A bounded LRU of compiled templates keyed by object identity.
+
+    Keys are built from the identity of the template text and of the values bound
+    into it, which are the module-level prompts and the per-role descriptions
+    shared by every call, so no value is hashed or stringified on a hit. The keyed
+    objects are kept alive with their entry so their ids cannot be reused; do not
+    mutate a value after binding it.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, PromptTemplate]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, objects: Tuple[Any, ...], build: Callable[[], PromptTemplate]
+    ) -> PromptTemplate:
+        """
+        Return the template compiled for a tuple of objects, building it on a miss.
+
+        Parameters:
+        - objects (tuple): The template text and every value bound into it.
+        - build (callable): Compiles the template, called on a miss only.
+
+        Returns:
+        - PromptTemplate: The compiled template.
+        """
+        key = tuple(id(item) for item in objects)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        template = build()
+        with self._lock:
+            self._entries[key] = (objects, template)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,6 +3,29 @@ from typing import List, Dict, Any
 import os
 import yaml
 
+# Engineer execution modes: think, act and reflect as separate model calls, or a
+# single call reflecting on the last tool result and choosing the next step
+ENGINEER_MODES = ("three_phase", "merged")
+# System prompt layouts: values interpolated where the template places them, or
+# stable instructions first and the per-call values (date, task, feedback,
+# scratchpad) in a trailing section so the model server can reuse its prompt cache
+PROMPT_LAYOUTS = ("inline", "static_prefix")
+
+
+def parse_engineer_modes(value: str) -> Dict[str, str]:
+    """
+    Parse per-role engineer modes, e.g. "ocp_engineer=merged,vsphere_engineer=three_phase".
+    """
+    modes = {}
+    for pair in value.split(","):
+        if "=" not in pair:
+            continue
+        role, mode = (part.strip() for part in pair.split("=", 1))
+        if mode not in ENGINEER_MODES:
+            raise ValueError(f"Unknown engineer mode '{mode}' for role '{role}'.")
+        modes[role] = mode
+    return modes
+
 
 @dataclass
 class AgentsConfig:
@@ -17,6 +40,37 @@ class AgentsConfig:
     )
     max_iterations: int = int(os.getenv("AGENT_MAX_ITERATIONS", 10))
     recursion_limit: int = int(os.getenv("AGENT_RECURSION_LIMIT", 10))
+    # Model calls allowed per planner/PM/reviewer output before giving up on a
+    # schema-valid answer, local repairs do not count
+    max_output_attempts: int = int(os.getenv("AGENT_MAX_OUTPUT_ATTEMPTS", 3))
+    # Schema validator backend, "jsonschema" or "fastjsonschema" (optional dependency)
+    schema_validator_backend: str = os.getenv("AGENT_SCHEMA_VALIDATOR", "jsonschema")
+    # Ready engineer tasks executed at the same time, shared by every engineer node
+    max_parallel_tasks: int = int(os.getenv("AGENT_MAX_PARALLEL_TASKS", 4))
+    # Review every fresh engineer update in a single reviewer call instead of one task per call
+    reviewer_batch_mode: bool = bool(int(os.getenv("AGENT_REVIEWER_BATCH", "0")))
+    # Have the PM patch the task list with the new reviewer verdicts instead of regenerating it
+    pm_delta_mode: bool = bool(int(os.getenv("AGENT_PM_DELTA", "0")))
+    # System prompt layout, see PROMPT_LAYOUTS
+    prompt_layout: str = os.getenv("AGENT_PROMPT_LAYOUT", "inline")
+    # Reuse validated plans for requests that only differ by VM, namespace or plan
+    # names, see services/plan_cache.py
+    plan_cache_enabled: bool = bool(int(os.getenv("AGENT_PLAN_CACHE", "0")))
+    plan_cache_dir: str = os.getenv("AGENT_PLAN_CACHE_DIR", ".cache/plans")
+    plan_cache_ttl: float = float(os.getenv("AGENT_PLAN_CACHE_TTL", 86400))
+    plan_cache_max_entries: int = int(os.getenv("AGENT_PLAN_CACHE_MAX_ENTRIES", 128))
+    # Engineer mode per role (AGENT_ENGINEER_MODES="ocp_engineer=merged"), see ENGINEER_MODES
+    engineer_modes: Dict[str, str] = field(
+        default_factory=lambda: parse_engineer_modes(os.getenv("AGENT_ENGINEER_MODES", ""))
+    )
+    # Complete engineer tasks without a reflect call when the tool result satisfies
+    # the tool's success predicate, see tools/tool_registry.py
+    fast_path_completion: bool = bool(int(os.getenv("AGENT_FAST_PATH_COMPLETION", "0")))
+    # Engineer scratchpad: recent steps kept verbatim, estimated token budget and
+    # length tool results are truncated to, see state/scratchpad.py
+    scratchpad_max_steps: int = int(os.getenv("AGENT_SCRATCHPAD_MAX_STEPS", 2))
+    scratchpad_max_tokens: int = int(os.getenv("AGENT_SCRATCHPAD_MAX_TOKENS", 2000))
+    scratchpad_max_result_chars: int = int(os.getenv("AGENT_SCRATCHPAD_MAX_RESULT_CHARS", 2000))
     agent_display_config: Dict[str, Dict[str, str]] = field(
         default_factory=lambda: {
             "planner": {"name": "Planner Agent 👩🏿‍💻", "color": "cyan"},
@@ -39,6 +93,12 @@ class AgentsConfig:
         """
         self.agents_description = self.load_and_replace_placeholders()
 
+    def get_engineer_mode(self, role: str) -> str:
+        """
+        Return the execution mode of an engineer role, 'three_phase' unless configured.
+        """
+        return self.engineer_modes.get(role, "three_phase")
+
     def load_agent_descriptions(self) -> Dict[str, Any]:
         """
         Load the agent descriptions from the YAML file.
@@ -5,6 +5,7 @@ from .agents_config import AgentsConfig
 from .logging_config import LoggingConfig
 from .vsphere_config import VsphereConfig
 from .openshift_config import OpenshiftConfig
+from .checkpoint_config import CheckpointConfig
 import json
 
 
@@ -15,6 +16,7 @@ class AppConfig:
     logging_config: LoggingConfig = field(default_factory=LoggingConfig)
     vsphere_config: VsphereConfig = field(default_factory=VsphereConfig)
     openshift_config: OpenshiftConfig = field(default_factory=OpenshiftConfig)
+    checkpoint_config: CheckpointConfig = field(default_factory=CheckpointConfig)
 
     def update_from_dict(self, config_dict: Dict[str, Any]):
         """
@@ -33,6 +35,8 @@ class AppConfig:
                 self.vsphere_config = VsphereConfig(**value)
             elif key == "openshift_config":
                 self.openshift_config = OpenshiftConfig(**value)
+            elif key == "checkpoint_config":
+                self.checkpoint_config = CheckpointConfig(**value)
 
 
 def load_config_from_file(file_path: str) -> AppConfig:
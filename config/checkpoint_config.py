@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+import os
+
+
+@dataclass
+class CheckpointConfig:
+    """
+    Configuration for persisting workflow state between node executions.
+    """
+
+    backend: str = os.getenv("CHECKPOINT_BACKEND", "sqlite")  # sqlite, memory or none
+    sqlite_path: str = os.getenv("CHECKPOINT_SQLITE_PATH", ".cache/checkpoints.sqlite")
@@ -17,3 +17,20 @@ class ModelConfig:
         default_factory=lambda: {"Content-Type": "application/json"}
     )
     stop: Optional[str] = os.getenv("MODEL_STOP", None)
+    stream: bool = bool(int(os.getenv("MODEL_STREAM", "0")))  # Consume the NDJSON token stream
+    request_timeout: int = int(os.getenv("MODEL_REQUEST_TIMEOUT", 30))
+    # Connection pooling for the shared HTTP session used by every agent
+    pool_connections: int = int(os.getenv("MODEL_POOL_CONNECTIONS", 4))  # Number of hosts to keep pools for
+    pool_maxsize: int = int(os.getenv("MODEL_POOL_MAXSIZE", 10))  # Max keep-alive connections per host
+    pool_block: bool = bool(int(os.getenv("MODEL_POOL_BLOCK", "0")))  # Block instead of opening extra connections
+    # Content-addressed response cache, only used for deterministic (temperature 0) calls
+    cache_enabled: bool = bool(int(os.getenv("MODEL_CACHE_ENABLED", "0")))
+    cache_bypass: bool = bool(int(os.getenv("MODEL_CACHE_BYPASS", "0")))  # Skip lookups but keep storing
+    cache_dir: Optional[str] = os.getenv("MODEL_CACHE_DIR", ".cache/model_responses")
+    cache_ttl: float = float(os.getenv("MODEL_CACHE_TTL", 86400))
+    cache_max_entries: int = int(os.getenv("MODEL_CACHE_MAX_ENTRIES", 512))
+    # Record every model request/response pair of a run into this cassette file
+    record_cassette: Optional[str] = os.getenv("MODEL_RECORD_CASSETTE", None)
+    # How long the server keeps the model (and its prompt cache) loaded after a call,
+    # e.g. "30m" or "-1" for ever. The server default applies when unset.
+    keep_alive: Optional[str] = os.getenv("MODEL_KEEP_ALIVE", None)
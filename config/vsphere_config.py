@@ -11,3 +11,18 @@ class VsphereConfig:
     host: str = os.getenv("VSPHERE_HOST", "host")
     user: str = os.getenv("VSPHERE_USER", "user")
     pwd: str = os.getenv("VSPHERE_PWD", "pwd")
+    # Authenticated sessions kept open and shared by the vSphere tools
+    pool_max_sessions: int = int(os.getenv("VSPHERE_POOL_MAX_SESSIONS", 4))
+    # Idle seconds after which a pooled session is checked before being reused
+    session_check_interval: float = float(os.getenv("VSPHERE_SESSION_CHECK_INTERVAL", 300))
+    # Seconds before the name to VM index of the inventory is rebuilt
+    vm_index_ttl: float = float(os.getenv("VSPHERE_VM_INDEX_TTL", 60))
+    # Seconds after a rebuild before a lookup of an unknown VM name rebuilds the index again
+    vm_index_miss_refresh: float = float(os.getenv("VSPHERE_VM_INDEX_MISS_REFRESH", 5))
+    # Keep the VM index current from vCenter property updates on a background thread
+    inventory_mirror: bool = bool(int(os.getenv("VSPHERE_INVENTORY_MIRROR", "0")))
+    inventory_mirror_wait: int = int(os.getenv("VSPHERE_INVENTORY_MIRROR_WAIT", 10))  # Seconds per WaitForUpdatesEx call
+    # VMs powered off at the same time when preparing a cold migration
+    max_concurrent_power_offs: int = int(os.getenv("VSPHERE_MAX_CONCURRENT_POWER_OFFS", 16))
+    # Seconds to wait for every VM to power off before reporting the rest as timed out
+    power_off_timeout: float = float(os.getenv("VSPHERE_POWER_OFF_TIMEOUT", 600))
@@ -0,0 +1,85 @@
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, List, Tuple
+from services.model_service import ModelService
+from controllers.tool_manager import ToolManager
+from tools.tool_registry import (
+    get_tool_descriptions_by_category,
+    get_tool_names_by_category,
+)
+
+# Tool categories available to each agent role
+ROLE_TOOL_CATEGORIES = {
+    "ocp_engineer": "openshift",
+    "vsphere_engineer": "vsphere_lifecycle",
+}
+
+
+class AgentRegistry:
+    """
+    Per-process registry of the state-independent components agents are built from.
+
+    Node functions create a new agent for every invocation so that it only binds
+    that invocation's state. The model service, tool manager and rendered tool
+    descriptions do not depend on the state, so they are built once and shared.
+    """
+
+    _model_services: Dict[str, ModelService] = {}
+    _tool_manager: ToolManager = None
+    _agent_tools: Dict[str, Tuple[List[str], Any]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_model_service(cls, model_config) -> ModelService:
+        """
+        Return the shared ModelService for a model configuration.
+
+        Services are keyed by the configuration values, so changing the config at
+        runtime (e.g. pointing the endpoint at a replay server) builds a new one.
+        """
+        key = repr(asdict(model_config))
+        with cls._lock:
+            model_service = cls._model_services.get(key)
+            if model_service is None:
+                model_service = ModelService(model_config)
+                cls._model_services[key] = model_service
+            return model_service
+
+    @classmethod
+    def get_tool_manager(cls) -> ToolManager:
+        """
+        Return the shared ToolManager.
+        """
+        with cls._lock:
+            if cls._tool_manager is None:
+                cls._tool_manager = ToolManager()
+            return cls._tool_manager
+
+    @classmethod
+    def get_agent_tools(cls, role: str) -> Tuple[List[str], Any]:
+        """
+        Return the tool names and rendered tool descriptions available to a role.
+        """
+        with cls._lock:
+            agent_tools = cls._agent_tools.get(role)
+            if agent_tools is None:
+                category = ROLE_TOOL_CATEGORIES.get(role)
+                if category:
+                    agent_tools = (
+                        get_tool_names_by_category(category),
+                        get_tool_descriptions_by_category(category),
+                    )
+                else:
+                    agent_tools = ([], [])
+                cls._agent_tools[role] = agent_tools
+            return agent_tools
+
+    @classmethod
+    def clear(cls):
+        """
+        Drop every cached component, e.g. after registering new tools.
+        """
+        with cls._lock:
+            cls._model_services = {}
+            cls._tool_manager = None
+            cls._agent_tools = {}
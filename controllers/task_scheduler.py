@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+from config.app_config import app_config
+from utils.log_utils import log_message
+
+
+class TaskScheduler:
+    """
+    Runs the ready tasks of an agent concurrently and merges their results in task order.
+
+    A task is ready once none of its dependencies is still open. Tasks unlocked
+    by a task completed in this run are picked up in a following wave. The cap
+    on concurrent tasks is shared by every scheduler in the process, since the
+    graph already runs the engineer nodes of a step in parallel.
+    """
+
+    _slots = None
+    _slots_limit = None
+    _slots_lock = threading.Lock()
+
+    def __init__(self, agent_role: str, max_parallel_tasks: int = None):
+        """
+        Initialize the scheduler.
+
+        Parameters:
+        - agent_role (str): The role of the agent whose tasks are scheduled, used for logging.
+        - max_parallel_tasks (int, optional): The concurrency cap, defaults to
+          `AgentsConfig.max_parallel_tasks`.
+        """
+        self.agent_role = agent_role
+        self.max_parallel_tasks = max(
+            1, max_parallel_tasks or app_config.agents_config.max_parallel_tasks
+        )
+        self.slots = self.get_slots(self.max_parallel_tasks)
+
+    @classmethod
+    def get_slots(cls, max_parallel_tasks: int) -> threading.BoundedSemaphore:
+        """
+        Return the process-wide semaphore limiting the number of tasks running at once.
+        """
+        with cls._slots_lock:
+            if cls._slots is None or cls._slots_limit != max_parallel_tasks:
+                cls._slots = threading.BoundedSemaphore(max_parallel_tasks)
+                cls._slots_limit = max_parallel_tasks
+            return cls._slots
+
+    def log_event(self, event_type: str, message: str = None):
+        """
+        Logs an event based on the event type.
+        """
+        log_message(self.agent_role, message_type=event_type, custom_message=message)
+
+    def run(
+        self,
+        tasks: List[Dict[str, Any]],
+        open_task_ids: Iterable[str],
+        worker: Callable[[Dict[str, Any]], Any],
+    ) -> List[Tuple[Dict[str, Any], Any]]:
+        """
+        Execute every task that does not depend on an open task, wave after wave.
+
+        Parameters:
+        - tasks (List[Dict[str, Any]]): The agent's pending tasks, in task list order.
+        - open_task_ids (Iterable[str]): IDs of every task not completed yet, across all agents.
+        - worker (Callable): Processes one task and returns its result, falsy on failure.
+
+        Returns:
+        - List[Tuple[Dict[str, Any], Any]]: (task, result) pairs in task list order,
+          for every task that was executed.
+        """
+        open_ids: Set[str] = set(open_task_ids)
+        positions = {task.get("task_id"): index for index, task in enumerate(tasks)}
+        remaining = list(tasks)
+        results = []
+
+        while True:
+            ready = [
+                task
+                for task in remaining
+                if not open_ids.intersection(task.get("dependencies", []))
+            ]
+            if not ready:
+                break
+
+            self.log_event(
+                "info",
+                f"🚦 Running {len(ready)} ready task(s) with up to {self.max_parallel_tasks} in parallel: "
+                f"{[task.get('task_id') for task in ready]}",
+            )
+            wave_results = self._run_wave(ready, worker)
+
+            for task, result in zip(ready, wave_results):
+                remaining.remove(task)
+                results.append((task, result))
+                if result:
+                    open_ids.discard(task.get("task_id"))
+
+        if remaining:
+            self.log_event(
+                "info",
+                f"⏸️ Waiting on dependencies for: {[task.get('task_id') for task in remaining]}",
+            )
+
+        # Merge in task list order so the state never depends on which task finished first
+        results.sort(key=lambda pair: positions[pair[0].get("task_id")])
+        return results
+
+    def _run_wave(
+        self, tasks: List[Dict[str, Any]], worker: Callable[[Dict[str, Any]], Any]
+    ) -> List[Any]:
+        if len(tasks) == 1:
+            return [self._run_with_slot(worker, tasks[0])]
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(tasks), self.max_parallel_tasks),
+            thread_name_prefix=f"{self.agent_role}-task",
+        ) as executor:
+            futures = [executor.submit(self._run_with_slot, worker, task) for task in tasks]
+            return [future.result() for future in futures]
+
+    def _run_with_slot(self, worker: Callable[[Dict[str, Any]], Any], task: Dict[str, Any]) -> Any:
+        with self.slots:
+            return worker(task)
@@ -1,39 +1,130 @@
+import uuid
 import argparse
+import asyncio
+from termcolor import colored
+from config.app_config import app_config
 from workflows.workflow_graph import create_graph, compile_workflow
+from workflows.checkpointer import (
+    create_checkpointer,
+    acreate_checkpointer,
+    close_checkpointer,
+    aclose_checkpointer,
+)
+from services.model_service import ModelService
 from utils.setup_utils import startup
 from utils.helpers import get_file_content
 from IPython.display import Image, display
 
 
+def get_default_user_request():
+    tutorial_file = "data/1_PREPARATION.md"
+    tutorial = get_file_content(tutorial_file)
+    return f"Using the following tutorial, create a comprehensive migration plan for migrating virtual machines from VMware to OpenShift using the Migration Toolkit for Virtualization: \n\n {tutorial}"
+
+
+def get_run_inputs(user_request=None, resume=None, config=None):
+    """
+    Build the workflow inputs and config for a new run or a resumed one.
+
+    Parameters:
+    - user_request (str, optional): The request for a new run.
+    - resume (str, optional): Thread ID of an interrupted run to resume.
+    - config (dict, optional): Workflow config, a new thread is used when omitted.
+
+    Returns:
+    - tuple: The inputs to stream (None when resuming) and the workflow config.
+    """
+    if resume:
+        # Streaming no input continues the thread from its last checkpoint
+        return None, {"configurable": {"thread_id": resume}}
+
+    # Default behavior if no user_request is provided
+    if not user_request:
+        user_request = get_default_user_request()
+
+    config = config or {"configurable": {"thread_id": str(uuid.uuid4())}}
+    thread_id = config["configurable"]["thread_id"]
+    print(colored(f"🧵 Thread ID: {thread_id} (resume with --resume {thread_id})", "cyan"))
+    return {"user_request": user_request}, config
+
+
+def has_pending_nodes(snapshot, config) -> bool:
+    """
+    Check whether a thread's latest state snapshot has node executions left to run.
+    """
+    if not snapshot.next:
+        thread_id = config["configurable"]["thread_id"]
+        print(colored(f"Nothing to resume for thread {thread_id}.", "yellow"))
+        return False
+    return True
+
+
 def main(
     user_request=None,
     iterations=10,
     verbose=True,
-    config={"configurable": {"thread_id": "5"}},
+    config=None,
+    resume=None,
 ):
-    # Default behavior if no user_request is provided
-    if not user_request:
-        tutorial_file = "data/1_PREPARATION.md"
-        tutorial = get_file_content(tutorial_file)
-        user_request = f"Using the following tutorial, create a comprehensive migration plan for migrating virtual machines from VMware to OpenShift using the Migration Toolkit for Virtualization: \n\n {tutorial}"
-
     # Setup and initialization
     startup()
 
-    # Create and compile the workflow
+    # Create and compile the workflow, persisting its state after every node
+    checkpointer = create_checkpointer(app_config.checkpoint_config)
+    if resume and checkpointer is None:
+        raise ValueError("Resuming a run requires checkpointing, set CHECKPOINT_BACKEND.")
     graph = create_graph()
-    workflow = compile_workflow(graph)
+    workflow = compile_workflow(graph, checkpointer)
 
-    # Load tutorial content if specified in user request
-    dict_inputs = {"user_request": user_request}
+    dict_inputs, config = get_run_inputs(user_request, resume, config)
     limit = {"recursion_limit": iterations}
 
-    # Stream the workflow and process the output
-    for event in workflow.stream(dict_inputs, config=config):
-        if verbose:
-            print(event)
-        else:
-            print("\n")
+    try:
+        if resume and not has_pending_nodes(workflow.get_state(config), config):
+            return
+
+        # Stream the workflow and process the output
+        for event in workflow.stream(dict_inputs, config=config):
+            if verbose:
+                print(event)
+            else:
+                print("\n")
+    finally:
+        close_checkpointer(checkpointer)
+
+
+async def amain(
+    user_request=None,
+    iterations=10,
+    verbose=True,
+    config=None,
+    resume=None,
+):
+    # Setup and initialization
+    startup()
+
+    # Create and compile the async workflow, persisting its state after every node
+    checkpointer = acreate_checkpointer(app_config.checkpoint_config)
+    if resume and checkpointer is None:
+        raise ValueError("Resuming a run requires checkpointing, set CHECKPOINT_BACKEND.")
+    graph = create_graph(use_async=True)
+    workflow = compile_workflow(graph, checkpointer)
+
+    dict_inputs, config = get_run_inputs(user_request, resume, config)
+
+    try:
+        if resume and not has_pending_nodes(await workflow.aget_state(config), config):
+            return
+
+        # Stream the workflow and process the output
+        async for event in workflow.astream(dict_inputs, config=config):
+            if verbose:
+                print(event)
+            else:
+                print("\n")
+    finally:
+        await ModelService.aclose_http_session()
+        await aclose_checkpointer(checkpointer)
 
 
 if __name__ == "__main__":
@@ -59,11 +150,36 @@ if __name__ == "__main__":
         help="Number of iterations for the workflow.",
     )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output.")
+    parser.add_argument(
+        "--use_async",
+        action="store_true",
+        help="Drive the workflow with the asyncio-native model client.",
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="THREAD_ID",
+        default=None,
+        help="Resume an interrupted run from its last checkpoint.",
+    )
 
     # Parse the arguments
     args = parser.parse_args()
 
     # Call main with parsed arguments, using defaults if arguments are not provided
-    main(
-        user_request=args.user_request, iterations=args.iterations, verbose=args.verbose
-    )
+    if args.use_async:
+        asyncio.run(
+            amain(
+                user_request=args.user_request,
+                iterations=args.iterations,
+                verbose=args.verbose,
+                resume=args.resume,
+            )
+        )
+    else:
+        main(
+            user_request=args.user_request,
+            iterations=args.iterations,
+            verbose=args.verbose,
+            resume=args.resume,
+        )
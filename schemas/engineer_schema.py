@@ -70,3 +70,44 @@ engineer_reflection_output_schema = {
         },
     ],
 }
+
+engineer_merged_output_schema = {
+    "type": "object",
+    "oneOf": [
+        {
+            "title": "Next Action",
+            "type": "object",
+            "properties": {
+                "thought": {
+                    "type": "string",
+                    "description": "The reflection on the previous tool result, if any, and why the tool is necessary.",
+                },
+                "action": {
+                    "type": "string",
+                    "description": "The name of the tool the engineer intends to use.",
+                },
+                "action_input": {
+                    "type": "object",
+                    "description": "A valid JSON object containing the input parameters for the tool.",
+                    "additionalProperties": True,
+                },
+            },
+            "required": ["thought", "action", "action_input"],
+        },
+        {
+            "title": "Successful Task Completion",
+            "type": "object",
+            "properties": {
+                "thought": {
+                    "type": "string",
+                    "description": "The reflection confirming that the tool result meets the acceptance criteria.",
+                },
+                "final_answer": {
+                    "type": "string",
+                    "description": "The confirmation that the task has been completed successfully.",
+                },
+            },
+            "required": ["thought", "final_answer"],
+        },
+    ],
+}
@@ -18,3 +18,17 @@ task_completion_schema = {
     "required": ["task_id", "status", "notification"],
     "additionalProperties": False,
 }
+
+task_completion_batch_schema = {
+    "type": "object",
+    "properties": {
+        "reviews": {
+            "type": "array",
+            "items": task_completion_schema,
+            "minItems": 1,
+            "description": "One verdict per reviewed task.",
+        },
+    },
+    "required": ["reviews"],
+    "additionalProperties": False,
+}
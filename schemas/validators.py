@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Callable, Dict, Tuple
+from jsonschema import validators as jsonschema_validators
+from jsonschema.exceptions import best_match
+from config.app_config import app_config
+from utils.log_utils import log_message
+
+# Validator backends: jsonschema only, or a fastjsonschema fast path checking valid
+# outputs (the common case) with jsonschema reporting the errors of invalid ones
+VALIDATOR_BACKENDS = ("jsonschema", "fastjsonschema")
+
+
+class SchemaValidator:
+    """
+    A validator compiled once for a schema.
+
+    `jsonschema.validate` checks the schema itself and builds a new validator on
+    every call. This class does both once, see `get_validator`.
+    """
+
+    def __init__(self, schema: Dict[str, Any], backend: str = "jsonschema"):
+        """
+        Parameters:
+        - schema (dict): The JSON schema.
+        - backend (str): One of VALIDATOR_BACKENDS. Falls back to jsonschema if
+          fastjsonschema is not installed.
+        """
+        validator_class = jsonschema_validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        self.schema = schema
+        self.validator = validator_class(schema)
+        self.backend = "jsonschema"
+        self._fast_validate: Callable[[Any], Any] = None
+
+        if backend == "fastjsonschema":
+            self._fast_validate = _compile_fastjsonschema(schema)
+            if self._fast_validate is not None:
+                self.backend = "fastjsonschema"
+
+    def validate(self, instance: Any):
+        """
+        Validate an instance, raising the same error `jsonschema.validate` would.
+
+        Raises:
+        - jsonschema.exceptions.ValidationError: If the instance is invalid.
+        """
+        if self._fast_validate is not None:
+            try:
+                self._fast_validate(instance)
+                return
+            except Exception:
+                # Let jsonschema report the error, with its path and message
+                pass
+
+        error = best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+    def is_valid(self, instance: Any) -> bool:
+        try:
+            self.validate(instance)
+            return True
+        except Exception:
+            return False
+
+
+def _compile_fastjsonschema(schema: Dict[str, Any]):
+    try:
+        import fastjsonschema
+    except ImportError:
+        log_message(
+            "system",
+            message_type="warning",
+            custom_message="⚠️ fastjsonschema is not installed, using the jsonschema validator backend.",
+        )
+        return None
+    # Without use_default, a successful validation would write schema defaults into
+    # the validated output, which jsonschema does not do
+    return fastjsonschema.compile(schema, use_default=False)
+
+
+# Compiled validators keyed by schema identity and backend. The schema is kept in
+# the value so its id cannot be reused by another object.
+_validators: Dict[Tuple[int, str], Tuple[Dict[str, Any], SchemaValidator]] = {}
+_validators_lock = threading.Lock()
+
+
+def get_validator(schema: Dict[str, Any], backend: str = None) -> SchemaValidator:
+    """
+    Return the compiled validator of a schema, compiling it on first use.
+
+    Schemas are the module-level dicts of `schemas/`, so they are keyed by
+    identity; do not mutate a schema after validating against it.
+
+    Parameters:
+    - schema (dict): The JSON schema.
+    - backend (str, optional): One of VALIDATOR_BACKENDS. Defaults to the config.
+
+    Returns:
+    - SchemaValidator: The memoized validator.
+    """
+    if backend is None:
+        backend = app_config.agents_config.schema_validator_backend
+    if backend not in VALIDATOR_BACKENDS:
+        raise ValueError(f"Unknown schema validator backend '{backend}'.")
+
+    key = (id(schema), backend)
+    with _validators_lock:
+        entry = _validators.get(key)
+        if entry is not None:
+            return entry[1]
+
+    validator = SchemaValidator(schema, backend)
+    with _validators_lock:
+        _validators.setdefault(key, (schema, validator))
+        return _validators[key][1]
+
+
+def clear_validators():
+    with _validators_lock:
+        _validators.clear()
@@ -0,0 +1,164 @@
+import os
+import re
+import json
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional
+from services.response_cache import ResponseCache
+
+# Timestamps interpolated into the prompts by `get_current_utc_datetime`
+TIMESTAMP_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} UTC")
+
+
+class Cassette:
+    """
+    A recording of model request/response pairs for one workflow run.
+
+    Cassettes are JSON Lines files, one interaction per line, so they can be
+    inspected, edited and checked into a benchmark fixture directory. Recording
+    appends a line per interaction instead of rewriting the file. Cassettes saved
+    as a single JSON document with an "interactions" list still load.
+    """
+
+    def __init__(self, path: Optional[str] = None, interactions: List[Dict[str, Any]] = None):
+        """
+        Initialize the cassette.
+
+        Parameters:
+        - path (str, optional): File the cassette is saved to and loaded from.
+        - interactions (list, optional): Previously recorded interactions.
+        """
+        self.path = path
+        self.interactions = interactions or []
+        self._lock = threading.Lock()
+        self._index = {}
+        self._normalized_index = {}
+        self._used = set()
+        # Whether `path` holds every interaction, so recording can append to it
+        self._persisted = False
+        self._build_indexes()
+
+    @classmethod
+    def load(cls, path: str) -> "Cassette":
+        """
+        Load a cassette from a JSON Lines file, or a JSON file with an "interactions" list.
+        """
+        with open(path, "r") as file:
+            text = file.read()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and "interactions" in data:
+            interactions = data["interactions"]
+        else:
+            interactions = [json.loads(line) for line in text.splitlines() if line.strip()]
+        return cls(path=path, interactions=interactions)
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the cassette to disk.
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No path provided to save the cassette.")
+
+        with self._lock:
+            self._write(path)
+            if path == self.path:
+                self._persisted = True
+
+    def record(self, payload: Dict[str, Any], response: Dict[str, Any], agent_role: str = None):
+        """
+        Append a request/response pair and persist it when the cassette has a path.
+        """
+        interaction = {"agent_role": agent_role, "request": payload, "response": response}
+        with self._lock:
+            self._add_to_indexes(len(self.interactions), interaction)
+            self.interactions.append(interaction)
+            if not self.path:
+                return
+            if self._persisted:
+                with open(self.path, "a") as file:
+                    file.write(json.dumps(interaction) + "\n")
+            else:
+                # The first record replaces whatever the file held before
+                self._write(self.path)
+                self._persisted = True
+
+    def find(self, payload: Dict[str, Any], strict: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the recorded response for a request.
+
+        Requests are matched by exact payload first, then with prompt timestamps
+        ignored, and finally (unless `strict`) by replaying the next unused
+        interaction in recording order.
+
+        Parameters:
+        - payload (dict): The request payload.
+        - strict (bool): Disable the in-order fallback.
+
+        Returns:
+        - dict: The recorded response, or None if nothing matches.
+        """
+        with self._lock:
+            for index, key in (
+                (self._index, ResponseCache.make_key(payload)),
+                (self._normalized_index, self.normalized_key(payload)),
+            ):
+                for position in index.get(key, []):
+                    if position not in self._used:
+                        return self._use(position)
+                # Every matching interaction has been replayed, reuse the last one
+                if index.get(key):
+                    return self._use(index[key][-1])
+
+            if strict:
+                return None
+
+            for position in range(len(self.interactions)):
+                if position not in self._used:
+                    return self._use(position)
+            return None
+
+    def rewind(self):
+        """
+        Mark every interaction as unused so the cassette can be replayed again.
+        """
+        with self._lock:
+            self._used.clear()
+
+    @staticmethod
+    def normalized_key(payload: Dict[str, Any]) -> str:
+        """
+        Build a cache key for the payload with volatile prompt timestamps removed.
+        """
+        normalized = {
+            key: TIMESTAMP_PATTERN.sub("<datetime>", value) if isinstance(value, str) else value
+            for key, value in payload.items()
+        }
+        return ResponseCache.make_key(normalized)
+
+    def _write(self, path: str):
+        # Called with the lock held. The unique temporary file keeps a reader, or
+        # another cassette saving to the same path, from seeing a partial file.
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=directory or ".", suffix=".tmp", delete=False) as file:
+            for interaction in self.interactions:
+                file.write(json.dumps(interaction) + "\n")
+        os.replace(file.name, path)
+
+    def _use(self, position: int) -> Dict[str, Any]:
+        self._used.add(position)
+        return self.interactions[position]["response"]
+
+    def _build_indexes(self):
+        for position, interaction in enumerate(self.interactions):
+            self._add_to_indexes(position, interaction)
+
+    def _add_to_indexes(self, position: int, interaction: Dict[str, Any]):
+        payload = interaction["request"]
+        self._index.setdefault(ResponseCache.make_key(payload), []).append(position)
+        self._normalized_index.setdefault(self.normalized_key(payload), []).append(position)
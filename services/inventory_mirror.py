@@ -0,0 +1,202 @@
+import atexit
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pyVmomi import vim, vmodl
+from config.app_config import app_config
+from config.vsphere_config import VsphereConfig
+from services.vsphere_service import VsphereService
+from utils.log_utils import log_message
+from utils.metrics_utils import increment_counter
+from utils.vsphere_utils import VM_INDEX_PROPERTIES, VmIndex, build_filter_spec, get_vm_index
+
+
+class InventoryMirror:
+    """
+    Keeps the VM index current from vCenter property updates, on a background thread.
+
+    The mirror loads the inventory once, then waits on a PropertyCollector filter
+    with `WaitForUpdatesEx` and applies the changes it reports to the index. While
+    it runs, the vSphere tools read VMs and their properties from the index without
+    calling vCenter, instead of rebuilding the index every `VSPHERE_VM_INDEX_TTL`.
+    If the mirror loses its session, the index goes back to TTL rebuilds until the
+    mirror has logged in and loaded the inventory again.
+    """
+
+    def __init__(
+        self,
+        vsphere_config: VsphereConfig,
+        index: VmIndex,
+        wait_seconds: int = 10,
+        retry_seconds: float = 5.0,
+        page_size: int = 1000,
+    ):
+        """
+        Parameters:
+        - vsphere_config (VsphereConfig): The vCenter host and credentials.
+        - index (VmIndex): The index to keep current.
+        - wait_seconds (int): Longest wait for updates, and so for `stop` to return.
+        - retry_seconds (float): Delay before logging in again after an error.
+        - page_size (int): Maximum number of objects per update set.
+        """
+        self.vsphere_config = vsphere_config
+        self.index = index
+        self.wait_seconds = wait_seconds
+        self.retry_seconds = retry_seconds
+        self.page_size = page_size
+        self._collector = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._synced = threading.Event()
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="vsphere-inventory-mirror", daemon=True)
+        self._thread.start()
+
+    def wait_until_synced(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the initial inventory load.
+
+        Returns:
+        - bool: Whether the index is live.
+        """
+        return self._synced.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopping.set()
+        collector = self._collector
+        if collector is not None:
+            try:
+                # Return from the pending WaitForUpdatesEx now rather than at its timeout
+                collector.CancelWaitForUpdates()
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            service = VsphereService(self.vsphere_config)
+            service.connect_to_vsphere()
+            if service.service_instance is not None:
+                try:
+                    self._mirror(service.content)
+                except Exception as e:
+                    if not self._stopping.is_set():
+                        increment_counter("inventory_mirror.errors")
+                        log_message(
+                            "system",
+                            message_type="warning",
+                            custom_message=f"⚠️ vSphere inventory mirror stopped: {e}. Retrying in {self.retry_seconds}s.",
+                        )
+                finally:
+                    self._synced.clear()
+                    self.index.set_live(False)
+                    service.disconnect_to_vsphere()
+            self._stopping.wait(self.retry_seconds)
+
+    def _mirror(self, content):
+        filter_spec, container = build_filter_spec(content, vim.VirtualMachine, VM_INDEX_PROPERTIES)
+        self._collector = collector = content.propertyCollector.CreatePropertyCollector()
+        try:
+            # Whole property values, rather than changes inside device arrays
+            collector.CreateFilter(filter_spec, partialUpdates=False)
+            options = vmodl.query.PropertyCollector.WaitOptions(
+                maxWaitSeconds=self.wait_seconds, maxObjectUpdates=self.page_size
+            )
+            version = ""
+            # The first update sets enter every VM, possibly over several truncated sets
+            initial: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+            while not self._stopping.is_set():
+                update_set = collector.WaitForUpdatesEx(version=version, options=options)
+                if update_set is None:
+                    # Nothing changed within wait_seconds
+                    continue
+                version = update_set.version
+                updates = list(self._object_updates(update_set))
+
+                if not self._synced.is_set():
+                    for kind, vm, changes, removed in updates:
+                        if kind == "leave":
+                            initial.pop(vm._moId, None)
+                        else:
+                            _, properties = initial.get(vm._moId, (vm, {}))
+                            properties = {**properties, **changes}
+                            for path in removed:
+                                properties.pop(path, None)
+                            initial[vm._moId] = (vm, properties)
+                    if not update_set.truncated:
+                        self.index.load(initial.values(), live=True)
+                        self._synced.set()
+                        increment_counter("inventory_mirror.loads")
+                        log_message(
+                            "system",
+                            message_type="info",
+                            custom_message=f"🪞 vSphere inventory mirror loaded {len(initial)} VMs.",
+                        )
+                        initial = {}
+                    continue
+
+                self.index.apply_updates(updates)
+                increment_counter("inventory_mirror.updates", len(updates))
+        finally:
+            self._collector = None
+            for cleanup in (collector.DestroyPropertyCollector, container.Destroy):
+                try:
+                    cleanup()
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _object_updates(update_set) -> Iterator[Tuple[str, Any, Dict[str, Any], List[str]]]:
+        for filter_update in update_set.filterSet or []:
+            for object_update in filter_update.objectSet or []:
+                changes = {}
+                removed = []
+                for change in object_update.changeSet or []:
+                    if change.op in ("remove", "indirectRemove"):
+                        removed.append(change.name)
+                    else:
+                        changes[change.name] = change.val
+                yield object_update.kind, object_update.obj, changes, removed
+
+
+_inventory_mirror: Optional[InventoryMirror] = None
+_inventory_mirror_lock = threading.Lock()
+
+
+def start_inventory_mirror() -> InventoryMirror:
+    """
+    Start the inventory mirror of the shared VM index, created from the config on first use.
+    """
+    global _inventory_mirror
+    with _inventory_mirror_lock:
+        if _inventory_mirror is None:
+            vsphere_config = app_config.vsphere_config
+            _inventory_mirror = InventoryMirror(
+                vsphere_config,
+                get_vm_index(),
+                wait_seconds=vsphere_config.inventory_mirror_wait,
+            )
+        _inventory_mirror.start()
+        return _inventory_mirror
+
+
+def stop_inventory_mirror(timeout: Optional[float] = None):
+    """
+    Stop the inventory mirror, the VM index goes back to TTL rebuilds.
+    """
+    global _inventory_mirror
+    with _inventory_mirror_lock:
+        mirror, _inventory_mirror = _inventory_mirror, None
+    if mirror is not None:
+        mirror.stop(timeout)
+
+
+atexit.register(stop_inventory_mirror, 1.0)
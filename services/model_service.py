@@ -1,11 +1,111 @@
 import json
+import time
+import asyncio
+import threading
+import aiohttp
 import requests
-from typing import Dict, Any
-from utils.log_utils import log_message
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Callable, Optional
+from utils.log_utils import log_message, log_stream_token, log_stream_end
+from utils.metrics_utils import observe_value
+from services.response_cache import ResponseCache
+from services.cassette import Cassette
 from langchain_core.messages.human import HumanMessage
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+# Timings of the call that produced a response, meaningless once it is served from the cache
+RESPONSE_TIMING_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_duration",
+    "eval_duration",
+    "time_to_first_token",
+)
+
+class StreamAccumulator:
+    """
+    Assemble Ollama's NDJSON chunk stream into a single `/api/generate` response.
+
+    Each chunk carries a partial `response` string; the last one has `done: true`
+    along with the timing and token statistics of the whole generation.
+    """
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.tokens = []
+        self.final_chunk = {}
+        self.time_to_first_token = None
+        self.error = None
+
+    def add_line(self, line) -> str:
+        """
+        Consume one NDJSON line and return the token it carried (or an empty string).
+        """
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            return ""
+
+        chunk = json.loads(line)
+        if "error" in chunk:
+            self.error = chunk["error"]
+            return ""
+
+        token = chunk.get("response", "")
+        if token and self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self.started_at
+        self.tokens.append(token)
+
+        if chunk.get("done"):
+            self.final_chunk = chunk
+        return token
+
+    @property
+    def done(self) -> bool:
+        return bool(self.final_chunk) or self.error is not None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.tokens)
+
+    def is_malformed(self) -> bool:
+        """
+        Detect generations that can no longer become a JSON document.
+
+        Responses are requested with `format: json`, so anything other than an
+        object or array opening the stream means the generation is unusable.
+        """
+        stripped = self.text.lstrip()
+        return bool(stripped) and stripped[0] not in "{["
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Return the assembled response in the same shape as a non-streamed call.
+        """
+        if self.error is not None:
+            return {"error": self.error, "content": self.text}
+        if self.is_malformed():
+            return {"error": "Malformed streamed response", "content": self.text}
+
+        response = dict(self.final_chunk)
+        response["response"] = self.text
+        response["time_to_first_token"] = self.time_to_first_token
+        return response
+
+
 class ModelService:
+    # Process-wide HTTP session shared by every agent and graph node so that
+    # keep-alive connections to the model endpoint are reused between calls.
+    _http_session: requests.Session = None
+    _session_lock = threading.Lock()
+    # aiohttp sessions are bound to the event loop that created them, so the
+    # async path keeps one pooled session per running loop.
+    _async_http_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+    # Process-wide response cache, created on first use when caching is enabled
+    _response_cache: ResponseCache = None
+    # Cassettes being recorded, by file path
+    _cassettes: Dict[str, Cassette] = {}
+
     def __init__(self, model_config: dict):
         """
         Initialize the ModelService with the given configuration.
@@ -23,6 +123,135 @@ class ModelService:
         )  # Directly access attributes
         self.headers = model_config.headers  # Directly access attributes
         self.stop = model_config.stop  # Directly access attributes
+        self.stream = model_config.stream
+        self.keep_alive = model_config.keep_alive
+        # Called with (agent_role, token) for every streamed token
+        self.token_callback: Optional[Callable[[str, str], None]] = log_stream_token
+        self.request_timeout = model_config.request_timeout
+        self.session = self.get_http_session(model_config)
+        self.pool_connections = model_config.pool_connections
+        self.pool_maxsize = model_config.pool_maxsize
+        self.cache_bypass = model_config.cache_bypass
+        self.response_cache = (
+            self.get_response_cache(model_config) if model_config.cache_enabled else None
+        )
+        self.cassette = (
+            self.get_recording_cassette(model_config.record_cassette)
+            if model_config.record_cassette
+            else None
+        )
+
+    @classmethod
+    def get_http_session(cls, model_config) -> requests.Session:
+        """
+        Return the shared, pooled HTTP session, creating it on first use.
+
+        The pool sizes are taken from the first configuration that creates the
+        session; later ModelService instances reuse the same pool.
+
+        Parameters:
+        - model_config (ModelConfig): The configuration holding the pool settings.
+
+        Returns:
+        - requests.Session: The shared session.
+        """
+        with cls._session_lock:
+            if cls._http_session is None:
+                adapter = HTTPAdapter(
+                    pool_connections=model_config.pool_connections,
+                    pool_maxsize=model_config.pool_maxsize,
+                    pool_block=model_config.pool_block,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                cls._http_session = session
+            return cls._http_session
+
+    @classmethod
+    def close_http_session(cls):
+        """
+        Close the shared HTTP session and release its pooled connections.
+        """
+        with cls._session_lock:
+            if cls._http_session is not None:
+                cls._http_session.close()
+                cls._http_session = None
+
+    @classmethod
+    def get_response_cache(cls, model_config) -> ResponseCache:
+        """
+        Return the shared response cache, creating it on first use.
+
+        Parameters:
+        - model_config (ModelConfig): The configuration holding the cache settings.
+
+        Returns:
+        - ResponseCache: The shared cache.
+        """
+        with cls._session_lock:
+            if cls._response_cache is None:
+                cls._response_cache = ResponseCache(
+                    max_entries=model_config.cache_max_entries,
+                    ttl_seconds=model_config.cache_ttl,
+                    cache_dir=model_config.cache_dir,
+                )
+            return cls._response_cache
+
+    @classmethod
+    def get_recording_cassette(cls, path: str) -> Cassette:
+        """
+        Return the cassette recording into `path`, shared by every ModelService of the process.
+
+        Parameters:
+        - path (str): The cassette file to record into.
+
+        Returns:
+        - Cassette: The recording cassette.
+        """
+        with cls._session_lock:
+            if path not in cls._cassettes:
+                cls._cassettes[path] = Cassette(path=path)
+            return cls._cassettes[path]
+
+    def get_async_http_session(self) -> aiohttp.ClientSession:
+        """
+        Return the pooled aiohttp session for the running event loop, creating it on first use.
+
+        Returns:
+        - aiohttp.ClientSession: The session shared by all async calls on this loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._session_lock:
+            session = self._async_http_sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_connections * self.pool_maxsize,
+                    limit_per_host=self.pool_maxsize,
+                )
+                # Like the requests timeout of the sync path, bound the connection and
+                # each read but not the whole call, a streamed generation can take longer
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(
+                        total=None,
+                        sock_connect=self.request_timeout,
+                        sock_read=self.request_timeout,
+                    ),
+                )
+                self._async_http_sessions[loop] = session
+            return session
+
+    @classmethod
+    async def aclose_http_session(cls):
+        """
+        Close the aiohttp session bound to the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with cls._session_lock:
+            session = cls._async_http_sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
 
     def prepare_payload(self, sys_prompt: str, prompt: str) -> Dict[str, Any]:
         """
@@ -35,22 +264,127 @@ class ModelService:
         Returns:
         - dict: The payload for the API request.
         """
-        return {
+        payload = {
             "model": self.model_name,
             "format": "json",
             "prompt": prompt,
             "system": sys_prompt,
-            "stream": False,
+            "stream": self.stream,
             "temperature": self.temperature,
             "top_p": self.top_p,
             "top_k": self.top_k,
             "repetition_penalty": self.repetition_penalty,
         }
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def _cache_key_for(self, payload: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        """
+        Return the cache key for a payload, or None when the call must not be cached.
+
+        Only deterministic calls (temperature 0) are cached.
+        """
+        if not use_cache or self.response_cache is None:
+            return None
+        if payload.get("temperature", self.temperature) != 0:
+            return None
+        return ResponseCache.make_key(payload)
+
+    def _lookup_cached_response(
+        self, cache_key: Optional[str], agent_role: str
+    ) -> Optional[Dict[str, Any]]:
+        if cache_key is None or self.cache_bypass:
+            return None
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is None:
+            return None
+        log_message(
+            agent_role,
+            message_type="info",
+            custom_message=f"🦙 ♻️ Cached model response reused ({self.response_cache.stats()['hits']} hits).",
+        )
+        # Tag the hit and drop the original call's timings, so they are not counted again
+        response_json = {
+            key: value for key, value in cached_response.items() if key not in RESPONSE_TIMING_FIELDS
+        }
+        response_json["cached"] = True
+        return response_json
+
+    def _store_cached_response(
+        self, cache_key: Optional[str], response_json: Dict[str, Any]
+    ):
+        # Never cache failures, they should be retried on the next call
+        if cache_key is not None and "error" not in response_json:
+            self.response_cache.set(cache_key, response_json)
+
+    def _record_prompt_eval(self, response_json: Dict[str, Any], agent_role: str):
+        """
+        Record the prompt tokens the server evaluated for a call and how long it took.
+
+        Tokens served from the server's prompt cache are not evaluated again, so
+        these drop when consecutive prompts share a long prefix.
+        """
+        if "prompt_eval_count" in response_json:
+            observe_value(f"prompt_eval_tokens.{agent_role}", response_json["prompt_eval_count"])
+        if "prompt_eval_duration" in response_json:
+            # Ollama reports durations in nanoseconds
+            observe_value(f"prompt_eval_ms.{agent_role}", response_json["prompt_eval_duration"] / 1e6)
+
+    def invoke_model(
+        self, payload: Dict[str, Any], agent_role: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Return the model response for a payload, served from the response cache when possible.
+
+        Parameters:
+        - payload (dict): The payload to send to the model API.
+        - agent_role (str): The role of the agent for logging purposes.
+        - use_cache (bool): Set to False to bypass the response cache for this call.
+
+        Returns:
+        - dict: The JSON response from the model.
+        """
+        cache_key = self._cache_key_for(payload, use_cache)
+        response_json = self._lookup_cached_response(cache_key, agent_role)
+        if response_json is None:
+            response_json = self._post_payload(payload, agent_role)
+            self._record_prompt_eval(response_json, agent_role)
+            self._store_cached_response(cache_key, response_json)
+
+        if self.cassette is not None:
+            self.cassette.record(payload, response_json, agent_role)
+        return response_json
+
+    async def ainvoke_model(
+        self, payload: Dict[str, Any], agent_role: str, use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Async counterpart of `invoke_model`.
+
+        Parameters:
+        - payload (dict): The payload to send to the model API.
+        - agent_role (str): The role of the agent for logging purposes.
+        - use_cache (bool): Set to False to bypass the response cache for this call.
+
+        Returns:
+        - dict: The JSON response from the model.
+        """
+        cache_key = self._cache_key_for(payload, use_cache)
+        response_json = self._lookup_cached_response(cache_key, agent_role)
+        if response_json is None:
+            response_json = await self._apost_payload(payload, agent_role)
+            self._record_prompt_eval(response_json, agent_role)
+            self._store_cached_response(cache_key, response_json)
+
+        if self.cassette is not None:
+            self.cassette.record(payload, response_json, agent_role)
+        return response_json
 
     @retry(
         stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
     )
-    def invoke_model(self, payload: Dict[str, Any], agent_role: str) -> Dict[str, Any]:
+    def _post_payload(self, payload: Dict[str, Any], agent_role: str) -> Dict[str, Any]:
         """
         Invoke the model API with retries and return the response.
 
@@ -65,45 +399,158 @@ class ModelService:
             agent_role, message_type="info", custom_message="🦙 Invoking model..."
         )
         try:
-            response = requests.post(
+            started_at = time.perf_counter()
+            response = self.session.post(
                 self.model_endpoint,
                 headers=self.headers,
                 data=json.dumps(payload),
-                timeout=30,
+                timeout=self.request_timeout,
+                stream=payload.get("stream", False),
             )
             response.raise_for_status()
+            self._log_response_received(response.status_code, agent_role)
+
+            if payload.get("stream"):
+                accumulator = StreamAccumulator(started_at)
+                with response:
+                    for line in response.iter_lines():
+                        if self._consume_stream_line(accumulator, line, agent_role):
+                            break
+                return self._finish_stream(accumulator, agent_role)
+
+            return self._parse_response_body(response.text, agent_role)
+
+        except requests.RequestException as e:
+            self._log_request_error(e, agent_role)
+            raise  # Retry will kick in here
+
+    @retry(
+        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
+    async def _apost_payload(
+        self, payload: Dict[str, Any], agent_role: str
+    ) -> Dict[str, Any]:
+        """
+        Asynchronously invoke the model API with retries and return the response.
+
+        Mirrors `_post_payload`, but awaits the network I/O and the retry backoff
+        so the event loop can serve other workflow runs in the meantime.
+
+        Parameters:
+        - payload (dict): The payload to send to the model API.
+        - agent_role (str): The role of the agent for logging purposes.
+
+        Returns:
+        - dict: The JSON response from the model.
+        """
+        log_message(
+            agent_role, message_type="info", custom_message="🦙 Invoking model..."
+        )
+        try:
+            started_at = time.perf_counter()
+            session = self.get_async_http_session()
+            async with session.post(
+                self.model_endpoint,
+                headers=self.headers,
+                data=json.dumps(payload),
+            ) as response:
+                response.raise_for_status()
+                self._log_response_received(response.status, agent_role)
+
+                if payload.get("stream"):
+                    accumulator = StreamAccumulator(started_at)
+                    async for line in response.content:
+                        if self._consume_stream_line(accumulator, line, agent_role):
+                            break
+                    return self._finish_stream(accumulator, agent_role)
+
+                return self._parse_response_body(await response.text(), agent_role)
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._log_request_error(e, agent_role)
+            raise  # Retry will kick in here
+
+    def _log_response_received(self, status: int, agent_role: str):
+        log_message(
+            agent_role,
+            message_type="info",
+            custom_message=f"🦙 🤝 Model response received - RESPONSE_CODE {status}.",
+        )
+
+    def _log_request_error(self, error: Exception, agent_role: str):
+        log_message(
+            agent_role,
+            message_type="error",
+            custom_message=f"Request Error: {str(error)}",
+        )
+
+    def _parse_response_body(self, response_text: str, agent_role: str) -> Dict[str, Any]:
+        """
+        Parse the body of a non-streamed response, or describe why it is unusable.
+        """
+        if not response_text.strip():
+            log_message(
+                agent_role,
+                message_type="error",
+                custom_message=f"🦙 Empty response from mode",
+            )
+            return {"error": "Empty response from model"}
+
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError as e:
+            log_message(
+                agent_role,
+                message_type="error",
+                custom_message=f"🦙 JSON Decode Error: {str(e)}"
+            )
+            return {"error": "Invalid JSON response", "content": response_text}
+
+    def _consume_stream_line(
+        self, accumulator: StreamAccumulator, line, agent_role: str
+    ) -> bool:
+        """
+        Feed one streamed line to the accumulator and surface its token.
+
+        Returns:
+        - bool: True when reading should stop (generation finished, errored or malformed).
+        """
+        try:
+            token = accumulator.add_line(line)
+        except json.JSONDecodeError as e:
+            accumulator.error = f"Invalid stream chunk: {str(e)}"
+            return True
+
+        if token and self.token_callback:
+            self.token_callback(agent_role, token)
+
+        # Stop reading (and drop the connection) as soon as the output cannot be valid JSON
+        return accumulator.done or accumulator.is_malformed()
+
+    def _finish_stream(
+        self, accumulator: StreamAccumulator, agent_role: str
+    ) -> Dict[str, Any]:
+        """
+        Close the streamed output line, log time-to-first-token and return the assembled response.
+        """
+        if self.token_callback:
+            log_stream_end(agent_role)
+
+        if accumulator.time_to_first_token is not None:
             log_message(
                 agent_role,
                 message_type="info",
-                custom_message=f"🦙 🤝 Model response received - RESPONSE_CODE {response}.",
+                custom_message=f"🦙 ⏱️ Time to first token: {accumulator.time_to_first_token:.3f}s",
             )
-            # print(response.content.strip())
-
-            if response.content.strip():
-                try:
-                    return response.json()
-                except json.JSONDecodeError as e:
-                    log_message(
-                        self.role,
-                        message_type="error",
-                        custom_message=f"🦙 JSON Decode Error: {str(e)}"
-                    )
-                    return {"error": "Invalid JSON response", "content": response.text}
-            else:
-                log_message(
-                    agent_role,
-                    message_type="error",
-                    custom_message=f"🦙 Empty response from mode",
-                )
-                return {"error": "Empty response from model"}
 
-        except requests.RequestException as e:
+        result = accumulator.result()
+        if "error" in result:
             log_message(
                 agent_role,
                 message_type="error",
-                custom_message=f"Request Error: {str(e)}",
+                custom_message=f"🦙 Stream Error: {result['error']}",
             )
-            raise  # Retry will kick in here
+        return result
 
     def process_model_response(
         self, response_json: Dict[str, Any], agent_role: str
@@ -138,3 +585,19 @@ class ModelService:
                 custom_message=f"Error processing model response: {str(e)}",
             )
             return HumanMessage(content="Error processing response"), ""
+
+    async def aprocess_model_response(
+        self, response_json: Dict[str, Any], agent_role: str
+    ) -> (HumanMessage, str):
+        """
+        Async counterpart of `process_model_response`.
+
+        Parameters:
+        - response_json (dict): The JSON response from the model.
+        - agent_role (str): The role of the agent for logging purposes.
+
+        Returns:
+        - HumanMessage: The formatted response as a HumanMessage.
+        - str: The pretty-printed response content.
+        """
+        return self.process_model_response(response_json, agent_role)
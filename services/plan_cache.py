@@ -0,0 +1,201 @@
+import re
+import json
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from config.app_config import app_config
+from prompts.planner_prompt import DEFAULT_SYS_PLANNER_PROMPT
+from schemas.planner_schema import planner_output_schema
+from schemas.validators import get_validator
+from services.response_cache import ResponseCache
+
+# Values of a request that change from one migration to the next: quoted values,
+# identifiers with a digit (vm-001, web01) and the names following an entity word
+# (namespace prod-apps, VMs web-frontend and api-gateway). Other hyphenated words,
+# e.g. cold-migration or read-only, describe the operation and stay in the template.
+ENTITY_KEYWORDS = r"(?i:vms?|virtual\s+machines?|namespaces?|named|called)"
+IDENTIFIER = r"(?=[\w.-]*[A-Za-z])[A-Za-z0-9][\w.-]*[A-Za-z0-9]"
+NAME = rf"(?=[\w.-]*[\d_-]){IDENTIFIER}"
+PARAMETER_PATTERN = re.compile(
+    r"""(?P<quote>['"`])(?P<quoted>[^'"`\n]{1,128})(?P=quote)"""
+    rf"|(?<![\w.-])(?P<keyword>{ENTITY_KEYWORDS})(?P<names>\s+{NAME}(?:\s*(?:,|\band\b)\s*{NAME})*)(?![\w-])"
+    rf"|(?<![\w.-])(?P<identifier>(?=[\w.-]*\d){IDENTIFIER})(?![\w-])"
+)
+NAME_PATTERN = re.compile(rf"(?<![\w.-]){NAME}(?![\w-])")
+
+
+def normalize_request(user_request: str) -> Tuple[str, List[str]]:
+    """
+    Replace the parameters of a request (VM, namespace and plan names) by placeholders.
+
+    Requests that only differ by their parameters share the same template. A value
+    repeated in the request maps to the same placeholder. Requests for different
+    operations keep different templates:
+
+    >>> normalize_request("Cold-migrate VMs web-01 and db-01 to namespace prod-apps")
+    ('Cold-migrate VMs {param_0} and {param_1} to namespace {param_2}', ['web-01', 'db-01', 'prod-apps'])
+    >>> normalize_request("Warm-migrate VMs web-01 and db-01 to namespace prod-apps")[0]
+    'Warm-migrate VMs {param_0} and {param_1} to namespace {param_2}'
+
+    Parameters:
+    - user_request (str): The user request.
+
+    Returns:
+    - tuple: The request template and its parameter values, by placeholder index.
+    """
+    params: List[str] = []
+
+    def placeholder(value: str) -> str:
+        if value not in params:
+            params.append(value)
+        return f"{{param_{params.index(value)}}}"
+
+    def replace(match: "re.Match") -> str:
+        if match.group("identifier"):
+            return placeholder(match.group("identifier"))
+        if match.group("keyword"):
+            names = NAME_PATTERN.sub(lambda name: placeholder(name.group(0)), match.group("names"))
+            return match.group("keyword") + names
+        quote = match.group("quote")
+        return f"{quote}{placeholder(match.group('quoted'))}{quote}"
+
+    template = PARAMETER_PATTERN.sub(replace, " ".join(user_request.split()))
+    return template, params
+
+
+def substitute_parameters(value: Any, replacements: Dict[str, str]) -> Any:
+    """
+    Replace parameter values in every string of a document, as whole tokens only.
+
+    Parameters:
+    - value: The document, e.g. a plan.
+    - replacements (dict): Parameter values of the cached request to the new ones.
+
+    Returns:
+    - The document with the parameters substituted, the input is not modified.
+    """
+    replacements = {old: new for old, new in replacements.items() if old != new}
+    if not replacements:
+        return value
+
+    # Longest values first, so "vm-1" does not replace the start of "vm-10"
+    alternatives = "|".join(re.escape(old) for old in sorted(replacements, key=len, reverse=True))
+    pattern = re.compile(rf"(?<![\w-])(?:{alternatives})(?![\w-])")
+
+    def substitute(item: Any) -> Any:
+        if isinstance(item, str):
+            return pattern.sub(lambda match: replacements[match.group(0)], item)
+        if isinstance(item, list):
+            return [substitute(element) for element in item]
+        if isinstance(item, dict):
+            return {key: substitute(element) for key, element in item.items()}
+        return item
+
+    return substitute(value)
+
+
+def planner_fingerprint() -> str:
+    """
+    Hash what a cached plan depends on besides the request: the agents description
+    file, the planner prompt and the plan schema.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(app_config.agents_config.description_file, "rb") as file:
+            digest.update(file.read())
+    except FileNotFoundError:
+        pass
+    digest.update(DEFAULT_SYS_PLANNER_PROMPT.encode("utf-8"))
+    digest.update(json.dumps(planner_output_schema, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PlanCache:
+    """
+    Cache of validated plans keyed by normalized user requests.
+
+    A plan generated for a request is reused for any later request with the same
+    template, with the parameters of the new request substituted in. Entries are
+    stored in a `ResponseCache` and keyed with `planner_fingerprint`, so editing
+    `agents.yaml` or the planner prompt invalidates them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 86400,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Parameters:
+        - max_entries (int): Maximum number of cached plans.
+        - ttl_seconds (float): Plans older than this are regenerated.
+        - cache_dir (str, optional): Directory for the on-disk tier, disabled when None.
+        """
+        self.entries = ResponseCache(max_entries, ttl_seconds, cache_dir)
+
+    @staticmethod
+    def make_key(template: str) -> str:
+        return hashlib.sha256(f"{planner_fingerprint()}\n{template}".encode("utf-8")).hexdigest()
+
+    def get(self, user_request: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the plan cached for a request template, adapted to the request.
+
+        Parameters:
+        - user_request (str): The user request.
+
+        Returns:
+        - dict: The plan, or None on a miss or if the adapted plan is not valid.
+        """
+        template, params = normalize_request(user_request)
+        entry = self.entries.get(self.make_key(template))
+        if entry is None or len(entry["params"]) != len(params):
+            return None
+
+        plan = substitute_parameters(entry["plan"], dict(zip(entry["params"], params)))
+        if not get_validator(planner_output_schema).is_valid(plan):
+            return None
+        return plan
+
+    def set(self, user_request: str, plan: Dict[str, Any]):
+        """
+        Cache a validated plan for the template of a request.
+        """
+        template, params = normalize_request(user_request)
+        self.entries.set(self.make_key(template), {"params": params, "plan": plan})
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.entries.stats()
+
+
+_plan_cache: Optional[PlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache:
+    """
+    Return the plan cache shared by every planner, created from the config on first use.
+    """
+    global _plan_cache
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            agents_config = app_config.agents_config
+            _plan_cache = PlanCache(
+                max_entries=agents_config.plan_cache_max_entries,
+                ttl_seconds=agents_config.plan_cache_ttl,
+                cache_dir=agents_config.plan_cache_dir or None,
+            )
+        return _plan_cache
+
+
+def reset_plan_cache():
+    """
+    Drop the shared plan cache instance so the next use is created from the current config.
+    """
+    global _plan_cache
+    with _plan_cache_lock:
+        _plan_cache = None
@@ -0,0 +1,334 @@
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Dict, List
+from services.cassette import Cassette
+
+# Split generated text into word-sized tokens for streamed replies
+TOKEN_PATTERN = re.compile(r"\s*\S+|\s+")
+# Rough number of characters per token, the replay server has no tokenizer
+CHARS_PER_TOKEN = 4
+
+
+class PromptCacheSimulator:
+    """
+    Approximate the prompt (KV) cache of an Ollama server.
+
+    The server keeps the evaluated prompt of its last calls, one per parallel
+    slot, and only evaluates the part of a new prompt after the longest prefix
+    it shares with one of them. The simulator reports the resulting prompt eval
+    counts and durations instead of the recorded ones.
+    """
+
+    def __init__(self, slots: int = 1, tokens_per_second: float = 1000.0):
+        """
+        Parameters:
+        - slots (int): Number of cached prompts, like OLLAMA_NUM_PARALLEL.
+        - tokens_per_second (float): Simulated prompt eval speed.
+        """
+        self.slots = max(1, slots)
+        self.tokens_per_second = tokens_per_second
+        self._prompts: "OrderedDict[int, str]" = OrderedDict()
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    def evaluate(self, payload: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Run a prompt through the cache and return Ollama's prompt eval statistics.
+        """
+        prompt = f"{payload.get('model', '')}\n{payload.get('system', '')}\n{payload.get('prompt', '')}"
+        with self._lock:
+            best_slot, cached_chars = max(
+                ((slot, len(os.path.commonprefix([cached, prompt]))) for slot, cached in self._prompts.items()),
+                key=lambda item: item[1],
+                default=(None, 0),
+            )
+            if best_slot is not None and cached_chars == len(self._prompts[best_slot]):
+                # The new prompt extends the cached one, keep it in the same slot
+                slot = best_slot
+            elif len(self._prompts) < self.slots:
+                slot, self._next_slot = self._next_slot, self._next_slot + 1
+            else:
+                # Evict the least recently used prompt, the shared prefix is copied over
+                slot, _ = self._prompts.popitem(last=False)
+            self._prompts[slot] = prompt
+            self._prompts.move_to_end(slot)
+
+        evaluated_tokens = max(1, (len(prompt) - cached_chars) // CHARS_PER_TOKEN)
+        return {
+            "prompt_eval_count": evaluated_tokens,
+            "prompt_eval_duration": int(evaluated_tokens / self.tokens_per_second * 1e9),
+        }
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serve recorded responses over Ollama's `/api/generate` protocol.
+    """
+
+    # Keep connections alive so clients exercise their connection pools
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/api/generate":
+            self._send_json(404, {"error": f"Unknown endpoint '{self.path}'"})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON payload: {str(e)}"})
+            return
+
+        replay = self.server.replay
+        replay.count_request(payload, len(body))
+        response = replay.cassette.find(payload, strict=replay.strict)
+        if response is None:
+            replay.count_unmatched()
+            self._send_json(404, {"error": "No recorded interaction matches this request"})
+            return
+
+        if replay.prompt_cache is not None and "error" not in response:
+            response = {**response, **replay.prompt_cache.evaluate(payload)}
+
+        replay.wait_for_latency()
+        if payload.get("stream"):
+            self._send_stream(payload, response)
+        else:
+            self._send_json(200, response)
+
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        content = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_stream(self, payload: Dict[str, Any], response: Dict[str, Any]):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        model = response.get("model", payload.get("model"))
+        if "error" in response:
+            self._write_chunk({"error": response["error"]})
+        else:
+            for token in TOKEN_PATTERN.findall(response.get("response", "")):
+                self._write_chunk(
+                    {
+                        "model": model,
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "response": token,
+                        "done": False,
+                    }
+                )
+                self.server.replay.wait_for_token()
+
+            final_chunk = {
+                key: value
+                for key, value in response.items()
+                if key not in ("response", "time_to_first_token")
+            }
+            final_chunk.update({"model": model, "response": "", "done": True})
+            self._write_chunk(final_chunk)
+
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_chunk(self, chunk: Dict[str, Any]):
+        line = (json.dumps(chunk) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean, request accounting is exposed through stats()
+        pass
+
+
+class ReplayServer:
+    """
+    A local stand-in for the Ollama server that replays a cassette.
+
+    Useful to run the workflow without a live model, e.g. for benchmarks and on
+    machines with no network access.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        token_latency: float = 0.0,
+        strict: bool = False,
+        prompt_cache_slots: int = 0,
+    ):
+        """
+        Initialize the replay server.
+
+        Parameters:
+        - cassette (Cassette): The recorded interactions to serve. Any object with a
+          compatible `find(payload, strict)` method (e.g. a scripted model) works too.
+        - host (str): Interface to bind.
+        - port (int): Port to bind, 0 picks a free one.
+        - latency (float): Seconds to wait before answering each request.
+        - jitter (float): Extra random delay, up to this many seconds, per request.
+        - token_latency (float): Seconds between chunks of a streamed reply.
+        - strict (bool): Only serve exact (timestamp-insensitive) matches.
+        - prompt_cache_slots (int): Report prompt eval statistics of a simulated
+          server prompt cache with this many slots, see `PromptCacheSimulator`.
+          Recorded statistics are served as they are when 0.
+        """
+        self.cassette = cassette
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.strict = strict
+        self.prompt_cache = (
+            PromptCacheSimulator(prompt_cache_slots) if prompt_cache_slots > 0 else None
+        )
+        self.requests = 0
+        self.unmatched = 0
+        self.prompt_bytes = 0
+        self.request_log: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        The `/api/generate` endpoint to use as MODEL_ENDPOINT.
+        """
+        return f"http://{self.host}:{self.port}/api/generate"
+
+    def start(self) -> "ReplayServer":
+        """
+        Start serving in a background thread.
+        """
+        self._httpd = ThreadingHTTPServer((self.host, self.port), ReplayRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop the server and wait for the serving thread to exit.
+        """
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+
+    def serve_forever(self):
+        """
+        Serve in the calling thread until interrupted.
+        """
+        self.start()
+        try:
+            self._thread.join()
+        except KeyboardInterrupt:
+            self.stop()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def count_request(self, payload: Dict[str, Any], size: int):
+        with self._lock:
+            self.requests += 1
+            self.prompt_bytes += size
+            self.request_log.append(
+                {
+                    "bytes": size,
+                    "system_bytes": len(payload.get("system", "").encode("utf-8")),
+                    "prompt_bytes": len(payload.get("prompt", "").encode("utf-8")),
+                }
+            )
+
+    def count_unmatched(self):
+        with self._lock:
+            self.unmatched += 1
+
+    def wait_for_latency(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def wait_for_token(self):
+        if self.token_latency > 0:
+            time.sleep(self.token_latency)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return request counters for the server's lifetime.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "unmatched": self.unmatched,
+                "prompt_bytes": self.prompt_bytes,
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded cassette over Ollama's /api/generate protocol."
+    )
+    parser.add_argument("--cassette", type=str, required=True, help="Cassette file to replay.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=11435, help="Port to bind.")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait before each response."
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Extra random delay per response, in seconds."
+    )
+    parser.add_argument(
+        "--token_latency",
+        type=float,
+        default=0.0,
+        help="Seconds between chunks of streamed responses.",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Only serve requests matching a recording."
+    )
+    parser.add_argument(
+        "--prompt_cache_slots",
+        type=int,
+        default=0,
+        help="Report prompt eval statistics of a simulated prompt cache with this many slots.",
+    )
+    args = parser.parse_args()
+
+    server = ReplayServer(
+        Cassette.load(args.cassette),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        token_latency=args.token_latency,
+        strict=args.strict,
+        prompt_cache_slots=args.prompt_cache_slots,
+    )
+    print(f"Replaying {args.cassette} at {server.url}")
+    server.serve_forever()
@@ -0,0 +1,180 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Content-addressed cache for model responses.
+
+    Entries are keyed by a hash of the request payload and kept in an in-memory
+    LRU, optionally backed by one JSON file per entry in `cache_dir` so that
+    responses survive across runs.
+    """
+
+    # Payload fields that do not change what the model generates
+    IGNORED_PAYLOAD_FIELDS = ("stream", "keep_alive")
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 86400,
+        cache_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Parameters:
+        - max_entries (int): Maximum number of entries kept in memory and on disk.
+        - ttl_seconds (float): Entries older than this are treated as misses.
+        - cache_dir (str, optional): Directory for the on-disk tier, disabled when None.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._prune_disk()
+
+    @classmethod
+    def make_key(cls, payload: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a payload prepared by `ModelService.prepare_payload`.
+
+        Parameters:
+        - payload (dict): The model request payload.
+
+        Returns:
+        - str: The SHA-256 hex digest of the canonicalized payload.
+        """
+        relevant = {
+            key: value
+            for key, value in payload.items()
+            if key not in cls.IGNORED_PAYLOAD_FIELDS
+        }
+        canonical = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for a key, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._read_from_disk(key)
+                if entry is not None:
+                    self._entries[key] = entry
+
+            if entry is None or self._is_expired(entry):
+                if entry is not None:
+                    self._evict(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["response"]
+
+    def set(self, key: str, response: Dict[str, Any]):
+        """
+        Store a response under the given key, evicting the least recently used entries.
+        """
+        entry = {"created_at": time.time(), "response": response}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._write_to_disk(key, entry)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key, _ = self._entries.popitem(last=False)
+                self._remove_from_disk(oldest_key)
+
+    def clear(self):
+        """
+        Drop every cached entry, in memory and on disk, and reset the counters.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                self._remove_from_disk(key)
+            self._entries.clear()
+            if self.cache_dir:
+                for file_name in os.listdir(self.cache_dir):
+                    if file_name.endswith(".json"):
+                        self._remove_from_disk(file_name[: -len(".json")])
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the current number of in-memory entries.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["created_at"] > self.ttl_seconds
+
+    def _evict(self, key: str):
+        self._entries.pop(key, None)
+        self._remove_from_disk(key)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._entry_path(key), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_to_disk(self, key: str, entry: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = f"{self._entry_path(key)}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, self._entry_path(key))
+
+    def _prune_disk(self):
+        """
+        Keep at most `max_entries` files from previous runs, dropping the oldest first.
+        """
+        entry_files = [
+            os.path.join(self.cache_dir, file_name)
+            for file_name in os.listdir(self.cache_dir)
+            if file_name.endswith(".json")
+        ]
+        entry_files.sort(key=os.path.getmtime, reverse=True)
+        for path in entry_files[self.max_entries :]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _remove_from_disk(self, key: str):
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
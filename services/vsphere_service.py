@@ -1,13 +1,26 @@
 from pyVim.connect import SmartConnect, Disconnect
 from config.vsphere_config import VsphereConfig
+from config.app_config import app_config
+from utils.log_utils import log_message
+from utils.metrics_utils import increment_counter
+from typing import Any, Callable, List, Optional, TypeVar
+import atexit
+import threading
+import time
 import ssl
 
+T = TypeVar("T")
+
+
 class VsphereService:
     def __init__(self, vsphereConfig: VsphereConfig):
         self.host = vsphereConfig.host
         self.user = vsphereConfig.user
         self.pwd = vsphereConfig.pwd
         self.service_instance = None
+        self.content = None
+        # Monotonic time the session was last known to be authenticated
+        self.last_verified_at = 0.0
 
     def connect_to_vsphere(self):
         # Disable SSL certificate verification for simplicity
@@ -17,12 +30,191 @@ class VsphereService:
             self.service_instance = SmartConnect(
                 host=self.host, user=self.user, pwd=self.pwd, sslContext=context
             )
-            print("Connected to vSphere")
+            self.content = self.service_instance.RetrieveContent()
+            self.last_verified_at = time.monotonic()
+            increment_counter("vsphere.logins")
+            log_message("system", message_type="info", custom_message=f"🔌 Connected to vSphere at {self.host}")
         except Exception as e:
-            print(f"Failed to connect to vSphere: {e}")
+            log_message("system", message_type="error", custom_message=f"❌ Failed to connect to vSphere: {e}")
             self.service_instance = None
+            self.content = None
 
     def disconnect_to_vsphere(self):
         if self.service_instance:
-            Disconnect(self.service_instance)
-            print("Disconnected from vSphere")
+            try:
+                Disconnect(self.service_instance)
+                log_message("system", message_type="info", custom_message="🔌 Disconnected from vSphere")
+            except Exception as e:
+                # An expired session cannot be logged out, there is nothing left to release
+                log_message(
+                    "system", message_type="warning", custom_message=f"⚠️ Failed to disconnect from vSphere: {e}"
+                )
+            self.service_instance = None
+            self.content = None
+
+    def is_session_alive(self) -> bool:
+        """
+        Check that the session is still authenticated, with a single property read.
+        """
+        try:
+            alive = self.service_instance.content.sessionManager.currentSession is not None
+        except Exception:
+            alive = False
+        if alive:
+            self.last_verified_at = time.monotonic()
+        return alive
+
+
+class VsphereSessionPool:
+    """
+    Authenticated vCenter sessions kept open and shared by the vSphere tools.
+
+    Each tool call borrows a session instead of logging in and out: a SmartConnect
+    login is a few SOAP round-trips, while borrowing a recently used session costs
+    nothing. Sessions idle for longer than `health_check_interval` are checked before
+    being reused, and expired ones are replaced by a new login. At most
+    `max_sessions` sessions are open at once, callers beyond that wait for one.
+    """
+
+    def __init__(
+        self,
+        vsphere_config: VsphereConfig,
+        max_sessions: int = 4,
+        health_check_interval: float = 300.0,
+    ):
+        """
+        Parameters:
+        - vsphere_config (VsphereConfig): The vCenter host and credentials.
+        - max_sessions (int): Maximum number of sessions open at the same time.
+        - health_check_interval (float): Idle seconds after which a session is checked before reuse.
+        """
+        self.vsphere_config = vsphere_config
+        self.max_sessions = max_sessions
+        self.health_check_interval = health_check_interval
+        self._idle: List[VsphereService] = []
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+
+    def run(self, operation: Callable[[Any, Any], T]) -> T:
+        """
+        Call an operation with a pooled session.
+
+        If the operation fails because the session expired while it ran, it is run
+        once more on a new session, so operations should be safe to repeat.
+
+        Parameters:
+        - operation (callable): Called with the ServiceInstance and its ServiceContent.
+
+        Returns:
+        - The operation result.
+
+        Raises:
+        - ConnectionError: If no session could be opened.
+        """
+        for attempt in range(2):
+            service = self._acquire()
+            try:
+                result = operation(service.service_instance, service.content)
+            except Exception:
+                expired = not service.is_session_alive()
+                self._release(service, discard=expired)
+                if expired and attempt == 0:
+                    increment_counter("vsphere.reauthentications")
+                    log_message(
+                        "system",
+                        message_type="warning",
+                        custom_message="🔄 vCenter session expired during a call, retrying with a new login.",
+                    )
+                    continue
+                raise
+            service.last_verified_at = time.monotonic()
+            self._release(service)
+            return result
+
+    def close(self):
+        """
+        Log out of every idle session. Sessions in use are logged out when released.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self.max_sessions = 0
+        for service in idle:
+            service.disconnect_to_vsphere()
+
+    def _acquire(self) -> VsphereService:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                service = self._idle.pop() if self._idle else None
+            if service is not None:
+                if self._is_healthy(service):
+                    increment_counter("vsphere.logins_avoided")
+                    return service
+                increment_counter("vsphere.reauthentications")
+                log_message(
+                    "system",
+                    message_type="info",
+                    custom_message="🔄 Pooled vCenter session expired, logging in again.",
+                )
+                service.disconnect_to_vsphere()
+
+            service = VsphereService(self.vsphere_config)
+            service.connect_to_vsphere()
+            if service.service_instance is None:
+                raise ConnectionError(f"Failed to connect to vCenter at {self.vsphere_config.host}.")
+            return service
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _is_healthy(self, service: VsphereService) -> bool:
+        if time.monotonic() - service.last_verified_at < self.health_check_interval:
+            return True
+        return service.is_session_alive()
+
+    def _release(self, service: VsphereService, discard: bool = False):
+        try:
+            with self._lock:
+                keep = not discard and len(self._idle) < self.max_sessions
+                if keep:
+                    self._idle.append(service)
+            if not keep:
+                service.disconnect_to_vsphere()
+        finally:
+            self._slots.release()
+
+
+_vsphere_pool: Optional[VsphereSessionPool] = None
+_vsphere_pool_lock = threading.Lock()
+
+
+def get_vsphere_pool() -> VsphereSessionPool:
+    """
+    Return the session pool shared by every vSphere tool, created from the config on first use.
+    """
+    global _vsphere_pool
+    with _vsphere_pool_lock:
+        if _vsphere_pool is None:
+            vsphere_config = app_config.vsphere_config
+            _vsphere_pool = VsphereSessionPool(
+                vsphere_config,
+                max_sessions=vsphere_config.pool_max_sessions,
+                health_check_interval=vsphere_config.session_check_interval,
+            )
+        return _vsphere_pool
+
+
+def reset_vsphere_pool():
+    """
+    Log out of the pooled sessions and drop the shared pool, so the next use is
+    created from the current config.
+    """
+    global _vsphere_pool
+    with _vsphere_pool_lock:
+        pool, _vsphere_pool = _vsphere_pool, None
+    if pool is not None:
+        pool.close()
+
+
+# Release the vCenter sessions instead of leaving them open until they time out
+atexit.register(reset_vsphere_pool)
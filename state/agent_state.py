@@ -1,17 +1,23 @@
-from typing import TypedDict, Annotated, List, Any
+import operator
+from typing import TypedDict, Annotated, Dict, List, Any
 from langchain_core.messages.human import HumanMessage
-from langgraph.graph.message import add_messages
 
 # Define the state object for the agent graph
+# Entries are raw model outputs (JSON strings and dicts), so the lists are
+# concatenated as-is instead of being coerced into chat messages
 class AgentGraphState(TypedDict):
     user_request: str
-    start_chain: Annotated[list, add_messages]
-    planner_response: Annotated[list, add_messages]
-    manager_response: Annotated[list, add_messages]
-    ocp_engineer_response: Annotated[list, add_messages]
-    vsphere_engineer_response: Annotated[list, add_messages]
-    reviewer_response: Annotated[list, add_messages]
-    end_chain: Annotated[list, add_messages]
+    start_chain: Annotated[list, operator.add]
+    planner_response: Annotated[list, operator.add]
+    manager_response: Annotated[list, operator.add]
+    ocp_engineer_response: Annotated[list, operator.add]
+    vsphere_engineer_response: Annotated[list, operator.add]
+    reviewer_response: Annotated[list, operator.add]
+    # Number of entries of each `{agent}_response` list the reviewer has reviewed
+    reviewer_cursor: Annotated[list, operator.add]
+    # Number of reviewer verdicts the manager has applied to the task list
+    manager_cursor: Annotated[list, operator.add]
+    end_chain: Annotated[list, operator.add]
 
 
 def get_agent_graph_state(state: AgentGraphState, state_key: str) -> Any:
@@ -74,3 +80,45 @@ def get_last_entry_from_state(state: AgentGraphState, state_key: str) -> Any:
     if isinstance(entries, list) and entries:
         return entries[-1]
     return None
+
+
+def copy_state(state: AgentGraphState) -> AgentGraphState:
+    """
+    Return a working copy of the graph state whose lists can be appended to freely.
+
+    Parameters:
+    - state (AgentGraphState): The state received by a node.
+
+    Returns:
+    - AgentGraphState: A shallow copy with every list copied.
+    """
+    return {
+        key: list(value) if isinstance(value, list) else value
+        for key, value in state.items()
+    }
+
+
+def get_state_updates(
+    state: AgentGraphState, working_state: AgentGraphState
+) -> Dict[str, List[Any]]:
+    """
+    Collect the entries appended to a working copy of the state.
+
+    Returning these from a node lets the graph apply them through its reducers,
+    so they are recorded by the checkpointer.
+
+    Parameters:
+    - state (AgentGraphState): The state received by the node.
+    - working_state (AgentGraphState): The copy the agent appended to.
+
+    Returns:
+    - Dict[str, List[Any]]: The new entries per state key.
+    """
+    updates = {}
+    for key, value in working_state.items():
+        if not isinstance(value, list):
+            continue
+        new_entries = value[len(state.get(key) or []) :]
+        if new_entries:
+            updates[key] = new_entries
+    return updates
@@ -0,0 +1,187 @@
+import json
+from typing import Any, List, Optional
+from config.app_config import app_config
+
+# Rough number of characters per token, used to estimate prompt sizes without a tokenizer
+CHARS_PER_TOKEN = 4
+# Maximum length of a single value in the digest of a compacted step
+DIGEST_VALUE_CHARS = 80
+# Keys of a JSON entry kept in the digest of a compacted step, in order. Thoughts
+# are left out, the action corrections carry what was learned from a failure.
+DIGEST_KEYS = (
+    "action",
+    "action_input",
+    "action_result",
+    "tool_result_success",
+    "action_correction",
+    "final_answer",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Shorten a text to at most `max_chars` characters, noting how much was cut.
+    """
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} chars]"
+
+
+class Scratchpad:
+    """
+    The bounded working memory an engineer renders into its prompts for one task.
+
+    Entries are grouped in steps, one per iteration of the engineer loop. The most
+    recent `max_steps` steps are rendered verbatim and older steps are compacted to
+    a one-line digest each, so the prompt stops growing with the iteration count.
+    If the rendered scratchpad still exceeds `max_tokens`, more steps are compacted
+    and the oldest digests dropped; the current step is always rendered verbatim.
+    """
+
+    def __init__(
+        self,
+        max_steps: int = None,
+        max_tokens: int = None,
+        max_result_chars: int = None,
+    ):
+        """
+        Parameters:
+        - max_steps (int, optional): Recent steps rendered verbatim. Defaults to the config.
+        - max_tokens (int, optional): Estimated token budget of the rendered scratchpad.
+          Defaults to the config.
+        - max_result_chars (int, optional): Length tool results are truncated to.
+          Defaults to the config.
+        """
+        agents_config = app_config.agents_config
+        self.max_steps = max(1, max_steps or agents_config.scratchpad_max_steps)
+        self.max_tokens = max_tokens or agents_config.scratchpad_max_tokens
+        self.max_result_chars = max_result_chars or agents_config.scratchpad_max_result_chars
+        self.steps: List[List[str]] = []
+        self._rendered: Optional[str] = None
+
+    @property
+    def step(self) -> int:
+        """
+        The number of the current step, 0 before the first one.
+        """
+        return len(self.steps)
+
+    def new_step(self) -> int:
+        """
+        Start a new step; later entries belong to it. Returns the step number.
+        """
+        self.steps.append([])
+        self._rendered = None
+        return self.step
+
+    def append(self, entry: Any):
+        """
+        Add an entry to the current step.
+
+        Parameters:
+        - entry: A model message, a tool result prompt or a note. Messages are
+          stored by content and tool results in JSON prompts are truncated.
+        """
+        if entry is None:
+            return
+        if not self.steps:
+            self.new_step()
+        self.steps[-1].append(self._normalize(entry))
+        self._rendered = None
+
+    def render(self) -> str:
+        """
+        Render the scratchpad for a prompt, within the token budget.
+        """
+        if self._rendered is None:
+            self._rendered = self._render()
+        return self._rendered
+
+    def __str__(self) -> str:
+        return self.render()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.steps)
+
+    def _normalize(self, entry: Any) -> str:
+        text = getattr(entry, "content", entry)
+        if not isinstance(text, str):
+            text = json.dumps(text) if isinstance(text, (dict, list)) else str(text)
+
+        parsed = self._parse(text)
+        if isinstance(parsed, dict) and isinstance(parsed.get("action_result"), str):
+            action_result = parsed["action_result"]
+            if len(action_result) > self.max_result_chars:
+                parsed["action_result"] = truncate_text(action_result, self.max_result_chars)
+                text = json.dumps(parsed, indent=4)
+        return text
+
+    def _render(self) -> str:
+        if not self.steps:
+            return ""
+
+        first_verbatim = max(0, len(self.steps) - self.max_steps)
+        digests = [self._digest(number, entries) for number, entries in self._numbered(0, first_verbatim)]
+        rendered = self._join(digests, first_verbatim, 0)
+
+        # Compact more steps, keeping the current one, until the budget is met
+        while estimate_tokens(rendered) > self.max_tokens and first_verbatim < len(self.steps) - 1:
+            digests.append(self._digest(first_verbatim + 1, self.steps[first_verbatim]))
+            first_verbatim += 1
+            rendered = self._join(digests, first_verbatim, 0)
+
+        # Then drop the oldest digests
+        omitted = 0
+        while estimate_tokens(rendered) > self.max_tokens and omitted < len(digests):
+            omitted += 1
+            rendered = self._join(digests, first_verbatim, omitted)
+
+        return rendered
+
+    def _join(self, digests: List[str], first_verbatim: int, omitted: int) -> str:
+        sections = []
+        if digests:
+            lines = digests[omitted:]
+            if omitted:
+                lines.insert(0, f"- {omitted} earlier steps omitted.")
+            sections.append("Earlier steps (summarized):\n" + "\n".join(lines))
+        for number, entries in self._numbered(first_verbatim, len(self.steps)):
+            sections.append(f"Step {number}:\n" + "\n".join(entries))
+        return "\n\n".join(sections)
+
+    def _numbered(self, start: int, end: int):
+        return ((index + 1, self.steps[index]) for index in range(start, end))
+
+    def _digest(self, number: int, entries: List[str]) -> str:
+        parts = [self._digest_entry(entry) for entry in entries]
+        return f"- Step {number}: " + " | ".join(part for part in parts if part)
+
+    def _digest_entry(self, entry: str) -> str:
+        parsed = self._parse(entry)
+        if not isinstance(parsed, dict):
+            return truncate_text(" ".join(entry.split()), DIGEST_VALUE_CHARS)
+
+        digest = {}
+        for key in DIGEST_KEYS:
+            if key not in parsed:
+                continue
+            value = parsed[key]
+            if not isinstance(value, (str, bool, int, float)) and value is not None:
+                value = json.dumps(value)
+            if isinstance(value, str):
+                value = truncate_text(" ".join(value.split()), DIGEST_VALUE_CHARS)
+            digest[key] = value
+        return json.dumps(digest)
+
+    @staticmethod
+    def _parse(text: str) -> Any:
+        if not text.lstrip().startswith("{"):
+            return None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,196 @@
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from state.agent_state import AgentGraphState
+
+
+class TaskStore:
+    """
+    A parsed, indexed snapshot of the manager's task list.
+
+    The store is built once per manager update and shared by every reader of that
+    update, see `get_task_store`. Accessors hand out copies of the tasks since
+    agents update task statuses locally.
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]], version: int = 0):
+        """
+        Build the indexes for a task list.
+
+        Parameters:
+        - tasks (List[Dict[str, Any]]): The valid tasks, in task list order.
+        - version (int): The number of manager updates the task list results from.
+        """
+        self.version = version
+        self.tasks = tasks
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_agent: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_status: Dict[str, List[Dict[str, Any]]] = {}
+        # Reverse dependency index: task ID -> IDs of the tasks depending on it
+        self.dependents: Dict[str, List[str]] = {}
+
+        for task in tasks:
+            task_id = task.get("task_id")
+            # The first task wins on duplicate IDs, like a linear scan would
+            self.by_id.setdefault(task_id, task)
+            self.by_agent.setdefault(task.get("agent"), []).append(task)
+            self.by_status.setdefault(task.get("status"), []).append(task)
+            for dependency in task.get("dependencies") or []:
+                self.dependents.setdefault(dependency, []).append(task_id)
+
+    @classmethod
+    def from_entry(cls, task_list: Any, version: int = 0) -> "TaskStore":
+        """
+        Parse a manager response, either a JSON string or an already parsed dict.
+
+        Raises:
+        - ValueError: If the task list cannot be parsed.
+        """
+        if not task_list:
+            return cls([], version)
+
+        if isinstance(task_list, dict):
+            tasks = task_list.get("tasks", [])
+        elif isinstance(task_list, str):
+            try:
+                tasks = json.loads(task_list).get("tasks", [])
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse task list as JSON. Error: {str(e)}")
+        else:
+            raise ValueError(f"Unexpected type for task list: {type(task_list)}")
+
+        # Filter out invalid tasks (empty tasks or tasks without a 'status' key)
+        valid_tasks = [
+            task for task in tasks if isinstance(task, dict) and task and "status" in task
+        ]
+        return cls(valid_tasks, version)
+
+    def get_tasks(self) -> List[Dict[str, Any]]:
+        return [dict(task) for task in self.tasks]
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        task = self.by_id.get(task_id)
+        return dict(task) if task is not None else None
+
+    def get_pending_tasks(self, agent_role: str = None) -> List[Dict[str, Any]]:
+        tasks = self.tasks if agent_role is None else self.by_agent.get(agent_role, [])
+        return [dict(task) for task in tasks if task.get("status") != "completed"]
+
+    def get_open_task_ids(self) -> Set[str]:
+        return {
+            task.get("task_id")
+            for status, tasks in self.by_status.items()
+            if status != "completed"
+            for task in tasks
+        }
+
+    def get_ready_tasks(self, agent_role: str = None) -> List[Dict[str, Any]]:
+        """
+        Return the pending tasks that do not depend on any open task.
+
+        Counts the open dependencies of every task through the reverse dependency
+        index, so the cost is O(tasks + edges).
+        """
+        open_dependencies: Dict[str, int] = {}
+        for task_id in self.get_open_task_ids():
+            for dependent_id in self.dependents.get(task_id, []):
+                open_dependencies[dependent_id] = open_dependencies.get(dependent_id, 0) + 1
+
+        return [
+            task
+            for task in self.get_pending_tasks(agent_role)
+            if not open_dependencies.get(task.get("task_id"))
+        ]
+
+    def get_dependents(self, task_id: str) -> List[Dict[str, Any]]:
+        """
+        Return the tasks depending directly on a task.
+        """
+        return [self.get_task(dependent_id) for dependent_id in self.dependents.get(task_id, [])]
+
+    def apply_patch(
+        self, operations: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Apply PM patch operations (see `pm_patch_schema`) to a copy of the task list.
+
+        Parameters:
+        - operations (List[Dict[str, Any]]): The operations, applied in order.
+
+        Returns:
+        - tuple: The patched task list and a message for every operation skipped
+          because it does not apply to the task list.
+        """
+        tasks = self.get_tasks()
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for task in tasks:
+            by_id.setdefault(task.get("task_id"), task)
+
+        skipped = []
+        for operation in operations:
+            if operation.get("op") == "update_status":
+                task = by_id.get(operation.get("task_id"))
+                if task is None:
+                    skipped.append(f"Cannot update unknown task '{operation.get('task_id')}'.")
+                    continue
+                task["status"] = operation.get("status")
+            elif operation.get("op") == "add_task":
+                new_task = dict(operation.get("task") or {})
+                if new_task.get("task_id") in by_id:
+                    skipped.append(f"Cannot add task '{new_task.get('task_id')}', the ID is taken.")
+                    continue
+                tasks.append(new_task)
+                by_id[new_task.get("task_id")] = new_task
+            else:
+                skipped.append(f"Unknown operation '{operation.get('op')}'.")
+
+        return tasks, skipped
+
+
+# Stores of the most recent manager updates, keyed by the raw response
+_stores: "OrderedDict[Any, TaskStore]" = OrderedDict()
+_stores_lock = threading.Lock()
+_MAX_STORES = 16
+
+
+def get_task_store(
+    state: AgentGraphState, task_state_key: str = "manager_response"
+) -> TaskStore:
+    """
+    Return the task store for the latest manager update in the state.
+
+    The task list is parsed and indexed once per manager update; later calls for
+    the same update reuse the store.
+
+    Parameters:
+    - state (AgentGraphState): The state holding the manager responses.
+    - task_state_key (str): The state key holding the task lists.
+
+    Returns:
+    - TaskStore: The store, versioned by the number of manager updates.
+
+    Raises:
+    - ValueError: If the task list cannot be parsed.
+    """
+    entries = state.get(task_state_key) or []
+    if not entries:
+        return TaskStore([], 0)
+
+    task_list = entries[-1]
+    raw = task_list if isinstance(task_list, str) else json.dumps(task_list, sort_keys=True)
+    key = (task_state_key, len(entries), raw)
+
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is not None:
+            _stores.move_to_end(key)
+            return store
+
+    store = TaskStore.from_entry(task_list, version=len(entries))
+
+    with _stores_lock:
+        _stores[key] = store
+        while len(_stores) > _MAX_STORES:
+            _stores.popitem(last=False)
+    return store
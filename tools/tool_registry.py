@@ -1,6 +1,6 @@
 from langchain.tools.render import render_text_description_and_args
 from termcolor import colored
-from typing import List
+from typing import Any, Callable, Dict, List
 from tools.openshift.openshift_tools import openshift_tools
 from tools.vsphere.vm_lifecycle_manager import vm_lifecycle_manager_tools
 from utils.helpers import loading_animation
@@ -15,6 +15,50 @@ CATEGORY_TOOLS_MAPPING = {
     "vsphere_lifecycle": vm_lifecycle_manager_tools,
 }
 
+
+def _returns_true(tool_input: Dict[str, Any], result: Any) -> bool:
+    return result is True
+
+
+def _vms_not_running(tool_input: Dict[str, Any], result: Any) -> bool:
+    if not isinstance(result, dict) or result.get("all_vms_not_running") is not True:
+        return False
+    vms = result.get("vms", {})
+    return all(
+        vms.get(vm_name, {}).get("status") in ("powered_off", "already_off")
+        for vm_name in tool_input.get("vm_names") or []
+    )
+
+
+def _plan_is_ready(tool_input: Dict[str, Any], result: Any) -> bool:
+    if not isinstance(result, dict):
+        return False
+    if result.get("metadata", {}).get("name") != tool_input.get("name"):
+        return False
+    conditions = result.get("status", {}).get("conditions", [])
+    return any(
+        condition.get("type") == "Ready" and condition.get("status") == "True"
+        for condition in conditions
+    )
+
+
+def _migration_started(tool_input: Dict[str, Any], result: Any) -> bool:
+    return isinstance(result, dict) and bool(result.get("metadata", {}).get("name"))
+
+
+# Success predicates per tool name. A predicate receives the tool input and the raw
+# tool result and returns True only if the result proves the tool achieved its
+# goal, so the engineer can complete the task without asking the model to reflect.
+# Tools returning free-form results (e.g. VM details) have no predicate.
+TOOL_SUCCESS_PREDICATES: Dict[str, Callable[[Dict[str, Any], Any], bool]] = {
+    "ensure_vms_not_running": _vms_not_running,
+    "ensure_openshift_project_access": _returns_true,
+    "ensure_openshift_providers_ready": _returns_true,
+    "create_migration_plan_tool": _plan_is_ready,
+    "start_migration_tool": _migration_started,
+}
+
+
 def generate_tool_descriptions(tools):
     """
     Generate tool descriptions using render_text_description_and_args.
@@ -29,7 +73,7 @@ def generate_tool_descriptions(tools):
     return render_text_description_and_args(tools).replace("{", "{{").replace("}", "}}")
 
 
-def register_tools(category_name, tools_list):
+def register_tools(category_name, tools_list, verbose: bool = True):
     """
     Register tools from the given list, including their generated descriptions,
     and print them immediately.
@@ -37,17 +81,23 @@ def register_tools(category_name, tools_list):
     Args:
         category_name (str): The category name (e.g., 'vSphere', 'OpenShift').
         tools_list (list): List of tool functions to register.
+        verbose (bool): Print the registered tools with the loading animation.
     """
-    print(colored(f"\n🔧 {category_name} Tools:\n", "blue", attrs=["bold"]))
-    loading_animation()
+    if verbose:
+        print(colored(f"\n🔧 {category_name} Tools:\n", "blue", attrs=["bold"]))
+        loading_animation()
 
     # Register the tools in the registry by their name and description
     for tool in tools_list:
         description = generate_tool_descriptions([tool])
         tool_registry[tool.name] = {"function": tool, "description": description}
-        print(colored(f"🔧 {tool.name}:", "yellow", attrs=["bold"]))
-        print(colored(f"  {description}\n", "white"))
-        time.sleep(0.5)
+        if verbose:
+            print(colored(f"🔧 {tool.name}:", "yellow", attrs=["bold"]))
+            print(colored(f"  {description}\n", "white"))
+            time.sleep(0.5)
+
+    if not verbose:
+        return
 
     print(
         colored(
@@ -58,16 +108,19 @@ def register_tools(category_name, tools_list):
     )
 
 
-def load_tools():
+def load_tools(verbose: bool = True):
     """
     Load and display tools from different categories (General, vSphere, OpenShift),
     including their descriptions.
+
+    Args:
+        verbose (bool): Print the registered tools with the loading animation.
     """
     # Register and display tools for vSphere Lifecycle Manager
-    register_tools("vSphere Lifecycle Manager", vm_lifecycle_manager_tools)
+    register_tools("vSphere Lifecycle Manager", vm_lifecycle_manager_tools, verbose)
 
     # Register and display tools for OpenShift
-    register_tools("OpenShift", openshift_tools)
+    register_tools("OpenShift", openshift_tools, verbose)
 
 
 def get_tool_by_name(tool_name):
@@ -80,6 +133,72 @@ def get_tool_by_name(tool_name):
     return None
 
 
+def register_success_predicate(
+    tool_name: str, predicate: Callable[[Dict[str, Any], Any], bool]
+):
+    """
+    Register the success predicate of a tool, replacing any existing one.
+
+    Args:
+        tool_name (str): The tool name.
+        predicate (callable): Receives the tool input and the raw tool result and
+            returns True if the result proves the tool achieved its goal.
+    """
+    TOOL_SUCCESS_PREDICATES[tool_name] = predicate
+
+
+def check_tool_success(
+    task: Dict[str, Any], tool_name: str, tool_input: Dict[str, Any], result: Any
+) -> bool:
+    """
+    Check whether a tool result proves a task is complete.
+
+    The tool must be the task's `tool_to_use`, its input must cover every value of
+    the task's `provided_inputs`, and its result must satisfy the tool's success
+    predicate. A multi-step task, or a preliminary check with another tool, is
+    left to the model to judge.
+
+    Args:
+        task (dict): The task the tool was called for.
+        tool_name (str): The tool that produced the result.
+        tool_input (dict): The input the tool was invoked with.
+        result: The raw tool result.
+
+    Returns:
+        bool: True if the tool has a predicate and the call and its result satisfy it.
+    """
+    predicate = TOOL_SUCCESS_PREDICATES.get(tool_name)
+    if predicate is None or task.get("tool_to_use") != tool_name:
+        return False
+    tool_input = tool_input or {}
+    if not _covers_provided_inputs(task.get("provided_inputs") or {}, tool_input):
+        return False
+    try:
+        return bool(predicate(tool_input, result))
+    except Exception:
+        # A result of an unexpected shape is left to the model to judge
+        return False
+
+
+def _covers_provided_inputs(provided_inputs: Dict[str, Any], tool_input: Dict[str, Any]) -> bool:
+    # Task inputs are not always named like the tool arguments (plan_name and name),
+    # a value without a matching argument name must equal one of the arguments
+    for key, expected in provided_inputs.items():
+        if expected in (None, "", []):
+            continue
+        candidates = [tool_input[key]] if key in tool_input else list(tool_input.values())
+        if not any(_same_input(expected, candidate) for candidate in candidates):
+            return False
+    return True
+
+
+def _same_input(expected: Any, actual: Any) -> bool:
+    if isinstance(expected, list) or isinstance(actual, list):
+        as_set = lambda value: {str(item) for item in (value if isinstance(value, list) else [value])}
+        return as_set(expected) == as_set(actual)
+    return str(expected) == str(actual)
+
+
 def get_tool_descriptions(tool_name):
     """
     Retrieve a tool function by its name from the tool registry.
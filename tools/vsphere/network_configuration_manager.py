@@ -2,9 +2,8 @@ from langchain.tools import tool
 from utils.vsphere_utils import (
     get_vm_network_details,
     change_vm_network,
-    connect_to_vsphere,
-    disconnect_from_vsphere,
 )
+from services.vsphere_service import get_vsphere_pool
 
 
 @tool(parse_docstring=True)
@@ -22,12 +21,7 @@ def network_configuration_manager(vm_name: str, action: str, new_network: str =
         str: A success message for the performed network action.
     """
 
-    si = None
-
-    try:
-        # Connect to vSphere
-        si = connect_to_vsphere(host, user, pwd)
-
+    def run_action(si, content):
         # Perform the requested network action
         if action == "get_network":
             return get_vm_network_details(si, vm_name)
@@ -40,9 +34,8 @@ def network_configuration_manager(vm_name: str, action: str, new_network: str =
         else:
             raise ValueError(f"Unsupported action: {action}")
 
+    try:
+        return get_vsphere_pool().run(run_action)
+
     except Exception as e:
         return f"Failed to execute {action} on VM '{vm_name}': {str(e)}"
-
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
@@ -3,9 +3,8 @@ from utils.vsphere_utils import (
     get_vm_storage_details,
     change_vm_storage,
     list_datastores,
-    connect_to_vsphere,
-    disconnect_from_vsphere,
 )
+from services.vsphere_service import get_vsphere_pool
 
 
 @tool(parse_docstring=True)
@@ -23,11 +22,7 @@ def storage_configuration_manager(vm_name: str, action: str, new_datastore: str
         str: A success message for the performed storage action or an error message in case of failure.
     """
 
-    si = None
-    try:
-        # Connect to vSphere
-        si = connect_to_vsphere()
-
+    def run_action(si, content):
         # Perform the requested storage action
         if action == "get_storage":
             return get_vm_storage_details(si, vm_name)
@@ -42,9 +37,8 @@ def storage_configuration_manager(vm_name: str, action: str, new_datastore: str
         else:
             raise ValueError(f"Unsupported action: {action}")
 
+    try:
+        return get_vsphere_pool().run(run_action)
+
     except Exception as e:
         return f"Failed to execute {action} on VM '{vm_name}': {str(e)}"
-
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
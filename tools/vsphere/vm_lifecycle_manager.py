@@ -1,12 +1,11 @@
 from langchain.tools import tool
 from typing import Union, List, Dict
-from config.app_config import app_config
+from services.vsphere_service import get_vsphere_pool
 from utils.vsphere_utils import (
     get_all_vms,
-    connect_to_vsphere,
-    disconnect_from_vsphere,
-    get_vm_details,
+    format_vm_details,
     get_vm_by_name,
+    get_vm_index,
     verify_vms_not_running,
 )
 
@@ -18,25 +17,13 @@ def list_vms() -> Union[List[str], str]:
     Returns:
         vms: A list of VM names or an error message if the operation fails.
     """
-    si = None
     try:
-        # Connect to vSphere
-        si, content = connect_to_vsphere(
-            host=app_config.vsphereConfig.host,
-            user=app_config.vsphereConfig.user,
-            pwd=app_config.vsphereConfig.pwd,
-        )
-
-        vms, vm_names = get_all_vms(si, content)
+        vms, vm_names = get_vsphere_pool().run(get_all_vms)
         return vm_names
 
     except Exception as e:
         return f"Failed to list vms. {str(e)}"
 
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
-
 
 @tool(parse_docstring=True)
 def retrieve_vm_details(vm_name: str) -> Union[Dict[str, Union[str, int, list]], str]:
@@ -49,35 +36,25 @@ def retrieve_vm_details(vm_name: str) -> Union[Dict[str, Union[str, int, list]],
     Returns:
         vm_details: A dictionary containing VM details or an error message if the operation fails or the VM is not found.
     """
-    si = None
-    try:
-        # Connect to vSphere
-        si, content = connect_to_vsphere(
-            host=app_config.vsphereConfig.host,
-            user=app_config.vsphereConfig.user,
-            pwd=app_config.vsphereConfig.pwd,
-        )
-
+    def retrieve(si, content):
         # Find the VM by name
         vm = get_vm_by_name(content, vm_name)
 
         if not vm:
             return f"VM '{vm_name}' not found."
 
-        # Get detailed information about the found VM
-        vm_details = get_vm_details(vm)
-        return vm_details
+        # Get detailed information about the found VM, cached by the VM index
+        return format_vm_details(get_vm_index().properties(content, vm))
+
+    try:
+        return get_vsphere_pool().run(retrieve)
 
     except Exception as e:
         return f"Failed to retrieve details for VM '{vm_name}': {str(e)}"
 
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
-
 
 @tool(parse_docstring=True)
-def ensure_vms_not_running(vm_names: List[str]) -> Union[bool, str]:
+def ensure_vms_not_running(vm_names: List[str]) -> Union[dict, str]:
     """
     A wrapper around a vSphere utility for ensuring that multiple virtual machines (VMs) are not running if 'warm' migration is not supported. If warm migration is not supported, the VMs will be powered off if they are running.
 
@@ -85,30 +62,24 @@ def ensure_vms_not_running(vm_names: List[str]) -> Union[bool, str]:
         vm_names: A list of virtual machine names to check.
 
     Returns:
-        bool: True if the operation was successful.
+        dict: If the operation was successful, "all_vms_not_running" set to True and
+            the "status" (powered_off or already_off) and "message" of each VM by name.
         str: An error message if the operation fails.
     """
-    si = None
     try:
-        # Connect to vSphere
-        si, content = connect_to_vsphere(
-            host=app_config.vsphereConfig.host,
-            user=app_config.vsphereConfig.user,
-            pwd=app_config.vsphereConfig.pwd,
-        )
-
         # Use the utility function to ensure VMs are not running
-        verify_vms_not_running(vm_names, si, content)
+        report = get_vsphere_pool().run(lambda si, content: verify_vms_not_running(vm_names, si, content))
 
-        # If the operation succeeds, return True
-        return True
+        # Report the VMs that were not found or could not be powered off
+        failures = [result["message"] for result in report.values() if result["status"] in ("not_found", "failed")]
+        if failures:
+            return f"Failed to ensure VMs are not running: {' '.join(failures)}"
+
+        # If the operation succeeds, report what was done to each VM
+        return {"all_vms_not_running": True, "vms": report}
 
     except Exception as e:
         # If an error occurs, return a detailed error message
         return f"Failed to ensure VMs are not running: {str(e)}"
 
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
-
 vm_lifecycle_manager_tools = [list_vms, retrieve_vm_details, ensure_vms_not_running]
@@ -0,0 +1,227 @@
+import copy
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*(?:```|$)", re.DOTALL)
+CLOSING_BRACKETS = {"{": "}", "[": "]"}
+
+
+def strip_code_fences(text: str) -> str:
+    """
+    Return the content of a Markdown code fence, or the text itself if there is none.
+    """
+    match = CODE_FENCE_PATTERN.search(text)
+    return match.group(1) if match else text
+
+
+def extract_json_text(text: str) -> str:
+    """
+    Drop any prose before the first opening bracket of a JSON document.
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    return text[min(starts):] if starts else text
+
+
+def close_brackets(text: str) -> str:
+    """
+    Complete a truncated JSON document.
+
+    Closes an unterminated string, drops a dangling comma or colon and appends the
+    closing brackets still open at the end of the text. Trailing commas before a
+    closing bracket are removed as well.
+
+    Parameters:
+    - text (str): The JSON text, possibly cut off.
+
+    Returns:
+    - str: The completed text. It is not guaranteed to be valid JSON.
+    """
+    return _close_brackets(text)[0]
+
+
+def _close_brackets(text: str) -> Tuple[str, str]:
+    """
+    Complete a truncated JSON document, see `close_brackets`.
+
+    Returns:
+    - tuple: The completed text and the closing brackets appended to it.
+    """
+    output = []
+    stack = []
+    in_string = False
+    escaped = False
+
+    for char in text:
+        if in_string:
+            output.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in CLOSING_BRACKETS:
+            stack.append(CLOSING_BRACKETS[char])
+        elif char in ("}", "]"):
+            _strip_dangling(output, ",")
+            if not stack or stack[-1] != char:
+                # A stray closing bracket, skip it
+                continue
+            stack.pop()
+            output.append(char)
+            if not stack:
+                # The document is complete, ignore anything after it
+                break
+            continue
+        output.append(char)
+
+    if in_string:
+        if escaped:
+            output.pop()
+        output.append('"')
+    _strip_dangling(output, ",:")
+    closers = "".join(reversed(stack))
+    output.append(closers)
+    return "".join(output), closers
+
+
+def _strip_dangling(output: List[str], characters: str):
+    while output and (output[-1].isspace() or output[-1] in characters):
+        output.pop()
+
+
+def coerce_to_schema(instance: Any, schema: Dict[str, Any]) -> Any:
+    """
+    Fix the schema violations that have an unambiguous correction.
+
+    Enum values are matched case-insensitively and replaced by their canonical
+    spelling, and missing object properties with a `default` in the schema are
+    filled in. Objects under a `oneOf`/`anyOf` are coerced to the single branch
+    whose `const` (or one-value `enum`) properties they match. Anything else is
+    left for the validator to report.
+
+    Parameters:
+    - instance: The parsed JSON document.
+    - schema (dict): The JSON schema the document should follow.
+
+    Returns:
+    - The corrected document, the input is not modified.
+    """
+    if not isinstance(schema, dict):
+        return instance
+
+    branch = _matching_branch(instance, schema.get("oneOf") or schema.get("anyOf"))
+    if branch is not None:
+        return coerce_to_schema(instance, branch)
+
+    if isinstance(instance, str) and "enum" in schema and instance not in schema["enum"]:
+        for value in schema["enum"]:
+            if isinstance(value, str) and value.lower() == instance.strip().lower():
+                return value
+        return instance
+
+    if isinstance(instance, dict):
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties")
+        coerced = {}
+        for key, value in instance.items():
+            if key in properties:
+                coerced[key] = coerce_to_schema(value, properties[key])
+            elif isinstance(additional, dict):
+                coerced[key] = coerce_to_schema(value, additional)
+            else:
+                coerced[key] = value
+        for key, property_schema in properties.items():
+            if key not in coerced and isinstance(property_schema, dict) and "default" in property_schema:
+                coerced[key] = copy.deepcopy(property_schema["default"])
+        return coerced
+
+    if isinstance(instance, list) and isinstance(schema.get("items"), dict):
+        return [coerce_to_schema(item, schema["items"]) for item in instance]
+
+    return instance
+
+
+def _matching_branch(instance: Any, branches: Optional[List[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Return the only branch whose constant properties the object matches, if any.
+    """
+    if not isinstance(instance, dict) or not branches:
+        return None
+
+    matches = []
+    for branch in branches:
+        constants = {
+            key: _constant(property_schema)
+            for key, property_schema in branch.get("properties", {}).items()
+            if _constant(property_schema) is not None
+        }
+        if constants and all(instance.get(key) == value for key, value in constants.items()):
+            matches.append(branch)
+    return matches[0] if len(matches) == 1 else None
+
+
+def _constant(schema: Any) -> Any:
+    """
+    Return the only value a schema allows, through `const` or a one-value `enum`.
+    """
+    if not isinstance(schema, dict):
+        return None
+    if "const" in schema:
+        return schema["const"]
+    if len(schema.get("enum", [])) == 1:
+        return schema["enum"][0]
+    return None
+
+
+def repair_json(text: str, schema: Dict[str, Any] = None) -> Tuple[Optional[Any], List[str]]:
+    """
+    Try to turn a malformed model output into a document matching a schema, locally.
+
+    Parameters:
+    - text (str): The raw model output.
+    - schema (dict, optional): Used to coerce enum casing and fill defaults.
+
+    Returns:
+    - tuple: The repaired document (None if it could not be parsed, or was cut off
+      inside an array) and the list of fixes applied.
+    """
+    fixes = []
+    candidate = text.strip()
+
+    unfenced = strip_code_fences(candidate)
+    if unfenced != candidate:
+        fixes.append("stripped code fences")
+        candidate = unfenced
+
+    extracted = extract_json_text(candidate)
+    if extracted != candidate:
+        fixes.append("dropped text before the JSON document")
+        candidate = extracted
+
+    try:
+        instance = json.loads(candidate)
+    except json.JSONDecodeError:
+        closed, closers = _close_brackets(candidate)
+        if "]" in closers:
+            # The output was cut inside an array, e.g. a task list, closing it would
+            # silently drop the items the model did not get to write
+            return None, fixes
+        try:
+            instance = json.loads(closed)
+        except json.JSONDecodeError:
+            return None, fixes
+        fixes.append("closed brackets")
+
+    if schema:
+        coerced = coerce_to_schema(instance, schema)
+        if coerced != instance:
+            fixes.append("coerced values to the schema")
+            instance = coerced
+
+    return instance, fixes
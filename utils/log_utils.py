@@ -1,4 +1,5 @@
 import logging
+import sys
 from termcolor import colored
 from config.app_config import app_config
 import datetime
@@ -85,6 +86,23 @@ def log_message(
     log(agent_role, message, level=message_type.upper())
 
 
+def log_stream_token(agent_role: str, token: str):
+    """
+    Echo a streamed model token to the terminal as it arrives, in the agent's color.
+    """
+    agent_info = app_config.agents_config.agent_display_config.get(agent_role, {})
+    sys.stdout.write(colored(token, agent_info.get("color", "white")))
+    sys.stdout.flush()
+
+
+def log_stream_end(agent_role: str):
+    """
+    Terminate the line of streamed tokens for an agent.
+    """
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
 def log_startup():
     print(
         colored(
@@ -0,0 +1,70 @@
+import threading
+from typing import Dict, List
+
+# Process-wide counters, e.g. model calls avoided by the engineer fast path
+_counters: Dict[str, int] = {}
+# Process-wide observed values, e.g. prompt bytes per engineer iteration
+_observations: Dict[str, List[float]] = {}
+_counters_lock = threading.Lock()
+
+
+def increment_counter(name: str, value: int = 1) -> int:
+    """
+    Add to a named counter and return its new value.
+
+    Parameters:
+    - name (str): The counter name, e.g. "reflect_calls_avoided".
+    - value (int): The amount to add.
+
+    Returns:
+    - int: The counter value after the increment.
+    """
+    with _counters_lock:
+        _counters[name] = _counters.get(name, 0) + value
+        return _counters[name]
+
+
+def get_counter(name: str) -> int:
+    with _counters_lock:
+        return _counters.get(name, 0)
+
+
+def get_counters() -> Dict[str, int]:
+    """
+    Return a snapshot of every counter.
+    """
+    with _counters_lock:
+        return dict(_counters)
+
+
+def observe_value(name: str, value: float):
+    """
+    Record a value under a name, e.g. the size of a prompt.
+    """
+    with _counters_lock:
+        _observations.setdefault(name, []).append(value)
+
+
+def get_observations() -> Dict[str, Dict[str, float]]:
+    """
+    Return the count, total, mean and max of the values observed under each name.
+    """
+    with _counters_lock:
+        return {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "max": max(values),
+            }
+            for name, values in sorted(_observations.items())
+        }
+
+
+def reset_counters():
+    """
+    Clear every counter and observed value.
+    """
+    with _counters_lock:
+        _counters.clear()
+        _observations.clear()
@@ -2,8 +2,10 @@ import configparser
 import os
 import logging
 import os
+from config.app_config import app_config
 from tools.tool_registry import load_tools
 from controllers.agents_manager import AgentsManager
+from services.inventory_mirror import start_inventory_mirror
 
 def load_config():
     # Load the configuration from .env.conf
@@ -22,6 +24,9 @@ def startup():
     agents_manager.display_agents()
 
     load_tools()
+
+    if app_config.vsphere_config.inventory_mirror:
+        start_inventory_mirror()
     
     # load_config()
 
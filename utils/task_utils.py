@@ -1,7 +1,6 @@
 # utils/task_utils.py
 
-import json
-from state.agent_state import get_last_entry_from_state
+from state.task_store import get_task_store
 
 
 def get_tasks_list(state, task_state_key: str = "manager_response") -> list:
@@ -18,33 +17,7 @@ def get_tasks_list(state, task_state_key: str = "manager_response") -> list:
     Raises:
     - ValueError: If the task list is not found or cannot be parsed.
     """
-    task_list = get_last_entry_from_state(state, task_state_key)
-
-    # Return an empty list if no tasks are found
-    if not task_list:
-        return []
-
-    # Ensure that task_list is a string, since we're expecting to parse it as JSON
-    if isinstance(task_list, dict):
-        # If it's a dict, it's likely that task_list is already parsed, just return the tasks field
-        tasks = task_list.get("tasks", [])
-    elif isinstance(task_list, str):
-        # If it's a string, attempt to parse it
-        try:
-            task_list_dict = json.loads(task_list)
-            tasks = task_list_dict.get("tasks", [])
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse task list as JSON. Error: {str(e)}")
-    else:
-        # If it's neither a string nor a dict, we cannot proceed
-        raise ValueError(f"Unexpected type for task list: {type(task_list)}")
-
-    # Filter out invalid tasks (empty tasks or tasks without a 'status' key)
-    valid_tasks = [
-        task for task in tasks if isinstance(task, dict) and task and "status" in task
-    ]
-
-    return valid_tasks
+    return get_task_store(state, task_state_key).get_tasks()
 
 def get_task_by_id(state, task_id: str) -> dict:
     """
@@ -60,11 +33,9 @@ def get_task_by_id(state, task_id: str) -> dict:
     Raises:
     - ValueError: If the task with the given ID is not found.
     """
-    task_list = get_tasks_list(state)
-
-    for task in task_list:
-        if task.get("task_id") == task_id:
-            return task
+    task = get_task_store(state).get_task(task_id)
+    if task is not None:
+        return task
 
     raise ValueError(f"Task with ID '{task_id}' not found in the task list.")
 
@@ -84,24 +55,7 @@ def get_pending_tasks(state, agent_role: str = None) -> list:
     Raises:
     - ValueError: If no pending tasks are found for the given role.
     """
-    task_list = get_tasks_list(
-        state
-    )  # Assume this function fetches the full task list from the state
-
-    pending_tasks = []
-    for task in task_list:
-        # Check if the task is pending (not 'completed')
-        if task.get("status") != "completed":
-            # If an agent_role is specified, filter by role; otherwise, add all pending tasks
-            if agent_role is None or task.get("agent") == agent_role:
-                pending_tasks.append(task)
-
-    # if not pending_tasks:
-    #     raise ValueError(
-    #         f"No pending tasks found{' for agent ' + agent_role if agent_role else ''}."
-    #     )
-
-    return pending_tasks
+    return get_task_store(state).get_pending_tasks(agent_role)
 
 def get_first_pending_task(state, agent_role: str = None) -> list:
     """
@@ -124,3 +78,31 @@ def get_first_pending_task(state, agent_role: str = None) -> list:
 
     first_task = pending_tasks[0]
     return first_task
+
+
+def get_open_task_ids(state) -> set:
+    """
+    Collect the IDs of the tasks that are not completed yet.
+
+    Parameters:
+    - state: The state object that contains task data.
+
+    Returns:
+    - set: The IDs of every task whose status is not 'completed'.
+    """
+    return get_task_store(state).get_open_task_ids()
+
+
+def get_ready_tasks(state, agent_role: str = None) -> list:
+    """
+    Fetch the pending tasks that do not depend on any open task.
+
+    Parameters:
+    - state: The state object that contains task data.
+    - agent_role (str, optional): The role of the agent whose tasks should be fetched.
+      If None, returns the ready tasks of every agent.
+
+    Returns:
+    - list: The ready tasks, in task list order.
+    """
+    return get_task_store(state).get_ready_tasks(agent_role)
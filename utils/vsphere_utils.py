@@ -1,7 +1,27 @@
 from pyVim.connect import SmartConnect, Disconnect
-from pyVmomi import vim
+from pyVmomi import vim, vmodl
+from config.app_config import app_config
+from utils.metrics_utils import increment_counter
+import math
 import ssl
-from typing import Any, Tuple, List, Optional
+import threading
+import time
+from typing import Any, Dict, Iterable, Tuple, List, Optional, Sequence
+
+# Property paths read by `get_vm_details`, fetched in bulk by `get_vms_details`
+VM_DETAIL_PROPERTIES = (
+    "summary.config.name",
+    "summary.config.guestFullName",
+    "config.hardware.numCPU",
+    "config.hardware.memoryMB",
+    "config.hardware.device",
+    "guest.net",
+    "runtime.powerState",
+    "runtime.connectionState",
+    "summary.overallStatus",
+)
+# Property paths cached per VM by the VM index
+VM_INDEX_PROPERTIES = ("name",) + VM_DETAIL_PROPERTIES
 
 def connect_to_vsphere(host: str, user: str, pwd: str):
     """
@@ -51,23 +71,17 @@ def get_all_vms(si, content) -> Tuple[List[vim.VirtualMachine], List[str]]:
     Raises:
         Exception: If there is an issue with retrieving the VMs.
     """
-    vm_names = []
     try:
-        # Create container view for Virtual Machines
-        container = content.viewManager.CreateContainerView(content.rootFolder, [vim.VirtualMachine], True)
-
-        # List all VMs
-        vms = container.view
+        # List all VMs, with their names, from the VM index
+        entries = get_vm_index().vms(content)
 
         # Check if any VMs were retrieved
-        if not vms:
+        if not entries:
             # print("No VMs found!")
             return
 
-        # Print the names of the VMs
-        for vm in vms:
-            # print(f"VM Name: {vm.name}")
-            vm_names.append(vm.name)
+        vms = [vm for vm, _ in entries]
+        vm_names = [name for _, name in entries]
 
         print (f"VMs in the vSphere environment: {', '.join(vm_names)}")
 
@@ -91,47 +105,189 @@ def get_vm_details(vm) -> dict:
         dict: A dictionary containing VM details.
     """
     try:
-        # Initialize the VM details dictionary
-        vm_info = {}
+        properties = {}
+        for path in VM_DETAIL_PROPERTIES:
+            value = vm
+            for attribute in path.split("."):
+                value = getattr(value, attribute)
+            properties[path] = value
 
-        # Get basic VM info
-        vm_info["name"] = vm.summary.config.name
-        vm_info["operating_system"] = vm.summary.config.guestFullName
+        return format_vm_details(properties)
 
-        # Resource allocations
-        vm_info["cpu"] = vm.config.hardware.numCPU
-        vm_info["memory_mb"] = vm.config.hardware.memoryMB
+    except Exception as e:
+        raise Exception(f"Failed to retrieve details for VM: {str(e)}")
 
-        # Disk allocations
-        vm_info["disks"] = []
-        for device in vm.config.hardware.device:
-            if isinstance(device, vim.vm.device.VirtualDisk):
-                disk_info = {
-                    "label": device.deviceInfo.label,
-                    "capacity_gb": device.capacityInKB
-                    / (1024 * 1024),  # Convert KB to GB
-                }
-                vm_info["disks"].append(disk_info)
-
-        # Network configuration
-        vm_info["networks"] = []
-        for net in vm.guest.net:
-            network_info = {
-                "network_name": net.network,
-                "ip_addresses": net.ipAddress,
-                "mac_address": net.macAddress,
+
+def format_vm_details(properties: Dict[str, Any]) -> dict:
+    """
+    Builds the VM details dictionary from the values of `VM_DETAIL_PROPERTIES`.
+
+    Args:
+        properties: The property values by path. Unset properties, e.g. the guest
+            networks of a VM without VMware Tools, may be missing.
+
+    Returns:
+        dict: A dictionary containing VM details.
+    """
+    # Initialize the VM details dictionary
+    vm_info = {}
+
+    # Get basic VM info
+    vm_info["name"] = properties.get("summary.config.name")
+    vm_info["operating_system"] = properties.get("summary.config.guestFullName")
+
+    # Resource allocations
+    vm_info["cpu"] = properties.get("config.hardware.numCPU")
+    vm_info["memory_mb"] = properties.get("config.hardware.memoryMB")
+
+    # Disk allocations
+    vm_info["disks"] = []
+    for device in properties.get("config.hardware.device") or []:
+        if isinstance(device, vim.vm.device.VirtualDisk):
+            disk_info = {
+                "label": device.deviceInfo.label,
+                "capacity_gb": device.capacityInKB
+                / (1024 * 1024),  # Convert KB to GB
             }
-            vm_info["networks"].append(network_info)
+            vm_info["disks"].append(disk_info)
+
+    # Network configuration
+    vm_info["networks"] = []
+    for net in properties.get("guest.net") or []:
+        network_info = {
+            "network_name": net.network,
+            "ip_addresses": net.ipAddress,
+            "mac_address": net.macAddress,
+        }
+        vm_info["networks"].append(network_info)
+
+    # Operational Status
+    vm_info["power_state"] = properties.get("runtime.powerState")
+    vm_info["connection_state"] = properties.get("runtime.connectionState")
+    vm_info["overall_status"] = properties.get("summary.overallStatus")
+
+    return vm_info
+
+
+def build_filter_spec(
+    content,
+    obj_type: type,
+    property_paths: Sequence[str],
+    objects: Optional[Sequence[Any]] = None,
+) -> Tuple[Any, Optional[vim.view.ContainerView]]:
+    """
+    Builds a PropertyCollector filter spec selecting property paths of managed objects.
+
+    Args:
+        content: The vim.ServiceContent object representing the vSphere content.
+        obj_type: The managed object type, e.g. vim.VirtualMachine.
+        property_paths: The property paths to select, e.g. "runtime.powerState".
+        objects: The objects to select, every object of `obj_type` in the inventory
+            when None.
+
+    Returns:
+        tuple: The filter spec, and the container view it traverses when `objects`
+        is None. The caller destroys the view once done with the filter.
+    """
+    collector_spec = vmodl.query.PropertyCollector
+    container = None
+    if objects is None:
+        # Traverse a container view of the whole inventory
+        container = content.viewManager.CreateContainerView(
+            content.rootFolder, [obj_type], True
+        )
+        traversal = collector_spec.TraversalSpec(
+            name="traverseView", path="view", skip=False, type=vim.view.ContainerView
+        )
+        object_specs = [collector_spec.ObjectSpec(obj=container, skip=True, selectSet=[traversal])]
+    else:
+        object_specs = [collector_spec.ObjectSpec(obj=obj, skip=False) for obj in objects]
+
+    filter_spec = collector_spec.FilterSpec(
+        objectSet=object_specs,
+        propSet=[collector_spec.PropertySpec(type=obj_type, pathSet=list(property_paths), all=False)],
+    )
+    return filter_spec, container
+
+
+def retrieve_properties(
+    content,
+    obj_type: type,
+    property_paths: Sequence[str],
+    objects: Optional[Sequence[Any]] = None,
+    page_size: int = 1000,
+) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    Retrieves properties of many managed objects with the PropertyCollector, in one
+    `RetrievePropertiesEx` call per page of objects instead of one call per object
+    and property.
+
+    Args:
+        content: The vim.ServiceContent object representing the vSphere content.
+        obj_type: The managed object type, e.g. vim.VirtualMachine.
+        property_paths: The property paths to retrieve, e.g. "runtime.powerState".
+        objects: The objects to retrieve the properties of, every object of
+            `obj_type` in the inventory when None.
+        page_size: Maximum number of objects per result page.
 
-        # Operational Status
-        vm_info["power_state"] = vm.runtime.powerState
-        vm_info["connection_state"] = vm.runtime.connectionState
-        vm_info["overall_status"] = vm.summary.overallStatus
+    Returns:
+        list: (managed object, {property path: value}) pairs. Unset properties are
+        missing from the dictionaries.
+
+    Raises:
+        Exception: If the properties cannot be retrieved.
+    """
+    if objects is not None and not objects:
+        return []
 
-        return vm_info
+    container = None
+    try:
+        filter_spec, container = build_filter_spec(content, obj_type, property_paths, objects)
+        collector = content.propertyCollector
+        result = collector.RetrievePropertiesEx(
+            specSet=[filter_spec],
+            options=vmodl.query.PropertyCollector.RetrieveOptions(maxObjects=page_size),
+        )
+
+        retrieved = []
+        while result:
+            for object_content in result.objects:
+                properties = {prop.name: prop.val for prop in object_content.propSet or []}
+                retrieved.append((object_content.obj, properties))
+            if not result.token:
+                break
+            result = collector.ContinueRetrievePropertiesEx(token=result.token)
+        return retrieved
 
     except Exception as e:
-        raise Exception(f"Failed to retrieve details for VM: {str(e)}")
+        raise Exception(f"Failed to retrieve {obj_type.__name__} properties: {str(e)}")
+
+    finally:
+        if container:
+            container.Destroy()
+
+
+def get_vms_details(content, vms: Optional[Sequence[vim.VirtualMachine]] = None) -> list:
+    """
+    Retrieves the details returned by `get_vm_details` for many virtual machines (VMs)
+    at once, with a single bulk property retrieval.
+
+    Args:
+        content: The vim.ServiceContent object representing the vSphere content.
+        vms: The VMs to retrieve details for, every VM in the inventory when None.
+
+    Returns:
+        list: A list of VM details dictionaries, in the order of `vms` when given.
+
+    Raises:
+        Exception: If the details cannot be retrieved.
+    """
+    retrieved = retrieve_properties(content, vim.VirtualMachine, VM_DETAIL_PROPERTIES, vms)
+    if vms is not None:
+        # Results are not ordered like the object specs
+        by_vm = dict(retrieved)
+        retrieved = [(vm, by_vm[vm]) for vm in vms if vm in by_vm]
+    return [format_vm_details(properties) for _, properties in retrieved]
 
 
 def get_all_vm_details(content) -> list:
@@ -150,19 +306,264 @@ def get_all_vm_details(content) -> list:
     Raises:
         Exception: If an error occurs during retrieval of VM details.
     """
-    vm_details_list = []
+    return get_vms_details(content)
 
-    # Traverse all VMs in the vSphere inventory
-    container = content.viewManager.CreateContainerView(
-        content.rootFolder, [vim.VirtualMachine], True
-    )
-    for vm in container.view:
-        vm_details = get_vm_details(vm)
-        vm_details_list.append(vm_details)
 
-    container.Destroy()
+class VmIndex:
+    """
+    An in-process index of the VM inventory: name to VM, and VM to the properties
+    of `VM_INDEX_PROPERTIES`, built from one bulk property retrieval.
+
+    Lookups are dictionary reads instead of a scan of every VM through a container
+    view. The index is rebuilt when it is older than `ttl_seconds`, or on a lookup
+    of a name it does not know, e.g. a VM created since, unless it was rebuilt less
+    than `miss_refresh_seconds` ago. Cached properties of a VM are dropped with
+    `invalidate` after changing it, e.g. after a power-off.
+
+    While an inventory mirror keeps the index current with `apply_updates`, it is
+    marked live and is never rebuilt by lookups.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, miss_refresh_seconds: float = 5.0):
+        """
+        Args:
+            ttl_seconds: Age after which the index is rebuilt on the next lookup.
+            miss_refresh_seconds: Minimum age for a lookup of unknown names to
+                rebuild the index, so repeated bad names do not rescan the inventory.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.miss_refresh_seconds = miss_refresh_seconds
+        # VM names are only unique per folder, a name maps to the first VM found
+        self._by_name: Dict[str, vim.VirtualMachine] = {}
+        # Every VM, its name and its properties, by managed object ID
+        self._vms: Dict[str, vim.VirtualMachine] = {}
+        self._names: Dict[str, str] = {}
+        self._properties: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._live = False
+        self._lock = threading.Lock()
+
+    @property
+    def live(self) -> bool:
+        return self._live
+
+    def refresh(self, content):
+        """
+        Rebuilds the index from the inventory.
+
+        Args:
+            content: The vim.ServiceContent object representing the vSphere content.
+        """
+        self.load(retrieve_properties(content, vim.VirtualMachine, VM_INDEX_PROPERTIES))
+        increment_counter("vm_index.refreshes")
+
+    def load(self, entries: Iterable[Tuple[vim.VirtualMachine, Dict[str, Any]]], live: bool = False):
+        """
+        Replaces the index content.
+
+        Args:
+            entries: (VM, {property path: value}) pairs of the whole inventory.
+            live: Whether updates will keep the index current from now on.
+        """
+        by_name = {}
+        vms = {}
+        names = {}
+        properties = {}
+        for vm, vm_properties in entries:
+            by_name.setdefault(vm_properties.get("name"), vm)
+            vms[vm._moId] = vm
+            names[vm._moId] = vm_properties.get("name")
+            properties[vm._moId] = vm_properties
+
+        with self._lock:
+            self._by_name = by_name
+            self._vms = vms
+            self._names = names
+            self._properties = properties
+            self._loaded_at = time.monotonic()
+            self._live = live
+
+    def apply_updates(self, updates: Iterable[Tuple[str, vim.VirtualMachine, Dict[str, Any], Sequence[str]]]):
+        """
+        Applies inventory changes at once, so readers see all of them or none.
+
+        Args:
+            updates: (kind, VM, {property path: new value}, unset property paths)
+                tuples, with the kinds of a PropertyCollector update: "enter",
+                "modify" or "leave".
+        """
+        with self._lock:
+            for kind, vm, changes, removed in updates:
+                key = vm._moId
+                old_name = self._names.get(key)
+                if kind == "leave":
+                    self._vms.pop(key, None)
+                    self._names.pop(key, None)
+                    self._properties.pop(key, None)
+                    self._unname(vm, old_name)
+                    continue
+
+                self._vms[key] = vm
+
+                base = {} if kind == "enter" else self._properties.get(key)
+                if base is not None:
+                    # Replace the properties instead of mutating what readers hold
+                    vm_properties = {**base, **changes}
+                    for path in removed:
+                        vm_properties.pop(path, None)
+                    self._properties[key] = vm_properties
+
+                if "name" in changes and changes["name"] != old_name:
+                    self._names[key] = changes["name"]
+                    self._unname(vm, old_name)
+                    self._by_name.setdefault(changes["name"], vm)
+
+    def set_live(self, live: bool):
+        """
+        Marks whether updates keep the index current. An index that is no longer
+        live is rebuilt on the next lookup.
+        """
+        with self._lock:
+            self._live = live
+            if not live:
+                self._loaded_at = None
+
+    def find(self, content, vm_names: Sequence[str]) -> Dict[str, Optional[vim.VirtualMachine]]:
+        """
+        Looks up VMs by name, rebuilding the index at most once.
+
+        Args:
+            content: The vim.ServiceContent object representing the vSphere content.
+            vm_names: The names of the VMs to look up.
+
+        Returns:
+            dict: The VM object by name, None for the names not found.
+        """
+        refreshed = self._refresh_if_stale(content)
+        found = self._lookup(vm_names)
+        missed = any(vm is None for vm in found.values())
+        if not refreshed and missed and self._is_older_than(self.miss_refresh_seconds):
+            self.refresh(content)
+            found = self._lookup(vm_names)
+
+        misses = sum(1 for vm in found.values() if vm is None)
+        increment_counter("vm_index.hits", len(found) - misses)
+        if misses:
+            increment_counter("vm_index.misses", misses)
+        return {name: vm and _bind(vm, content) for name, vm in found.items()}
+
+    def get(self, content, vm_name: str) -> Optional[vim.VirtualMachine]:
+        """
+        Looks up a VM by name, see `find`.
+        """
+        return self.find(content, [vm_name])[vm_name]
+
+    def vms(self, content) -> List[Tuple[vim.VirtualMachine, str]]:
+        """
+        Returns every indexed VM with its name, including VMs sharing a name.
+        """
+        self._refresh_if_stale(content)
+        with self._lock:
+            entries = [(vm, self._names.get(key)) for key, vm in self._vms.items()]
+        return [(_bind(vm, content), name) for vm, name in entries]
+
+    def properties(self, content, vm: vim.VirtualMachine) -> Dict[str, Any]:
+        """
+        Returns the cached properties of a VM, retrieving them if they were invalidated.
+
+        Args:
+            content: The vim.ServiceContent object representing the vSphere content.
+            vm: The VM, as returned by a lookup.
+
+        Returns:
+            dict: The values of `VM_INDEX_PROPERTIES` by property path.
+        """
+        self._refresh_if_stale(content)
+        with self._lock:
+            cached = self._properties.get(vm._moId)
+        if cached is not None:
+            return cached
+
+        retrieved = retrieve_properties(content, vim.VirtualMachine, VM_INDEX_PROPERTIES, [vm])
+        vm_properties = retrieved[0][1] if retrieved else {}
+        with self._lock:
+            self._properties[vm._moId] = vm_properties
+        return vm_properties
+
+    def invalidate(self, vm: Optional[vim.VirtualMachine] = None):
+        """
+        Drops the cached properties of a VM, or the whole index when no VM is given.
+        """
+        with self._lock:
+            if vm is None:
+                self._loaded_at = None
+            else:
+                self._properties.pop(vm._moId, None)
+
+    def _refresh_if_stale(self, content) -> bool:
+        stale = self._is_older_than(self.ttl_seconds)
+        if stale:
+            self.refresh(content)
+        return stale
+
+    def _is_older_than(self, seconds: float) -> bool:
+        # A live index is kept current by its updates and never goes stale
+        with self._lock:
+            return not self._live and (
+                self._loaded_at is None or time.monotonic() - self._loaded_at >= seconds
+            )
+
+    def _unname(self, vm: vim.VirtualMachine, name: Optional[str]):
+        # Called with the lock held. Hand the name over to another VM sharing it.
+        if self._by_name.get(name) != vm:
+            return
+        del self._by_name[name]
+        for key, other_name in self._names.items():
+            if other_name == name:
+                self._by_name[name] = self._vms[key]
+                break
+
+    def _lookup(self, vm_names: Sequence[str]) -> Dict[str, Optional[vim.VirtualMachine]]:
+        with self._lock:
+            return {name: self._by_name.get(name) for name in vm_names}
+
+
+def _bind(obj, content):
+    # Indexed objects may come from a session the pool has replaced since, bind
+    # them to the session of the caller
+    stub = getattr(content.propertyCollector, "_stub", None)
+    if stub is None or obj._stub is stub:
+        return obj
+    return type(obj)(obj._moId, stub)
+
+
+_vm_index: Optional[VmIndex] = None
+_vm_index_lock = threading.Lock()
+
+
+def get_vm_index() -> VmIndex:
+    """
+    Returns the VM index shared by every vSphere util, created from the config on first use.
+    """
+    global _vm_index
+    with _vm_index_lock:
+        if _vm_index is None:
+            vsphere_config = app_config.vsphere_config
+            _vm_index = VmIndex(
+                ttl_seconds=vsphere_config.vm_index_ttl,
+                miss_refresh_seconds=vsphere_config.vm_index_miss_refresh,
+            )
+        return _vm_index
+
+
+def reset_vm_index():
+    """
+    Drops the shared VM index, so the next use rebuilds it from the current config.
+    """
+    global _vm_index
+    with _vm_index_lock:
+        _vm_index = None
 
-    return vm_details_list
 
 def verify_vm_not_running(
     vm: vim.VirtualMachine, 
@@ -188,6 +589,7 @@ def verify_vm_not_running(
             # Power off the VM
             task = vm.PowerOff()
             task.WaitForCompletion()
+            get_vm_index().invalidate(vm)
             return (
                 f"VM '{vm.name}' was powered on and has been powered off for migration."
             )
@@ -198,40 +600,211 @@ def verify_vm_not_running(
         return f"Failed to manage power state for VM '{vm.name}': {str(e)}"
 
 
+def power_off_vms(
+    content,
+    vms: Sequence[vim.VirtualMachine],
+    max_concurrent: int = 16,
+    wait_seconds: int = 30,
+    timeout_seconds: float = 600.0,
+) -> Dict[vim.VirtualMachine, Optional[str]]:
+    """
+    Powers off virtual machines (VMs) concurrently.
+
+    PowerOff tasks are submitted up front, at most `max_concurrent` running at once,
+    and their states are awaited together with one PropertyCollector, instead of
+    waiting for each task before submitting the next. Powering off a wave of VMs
+    takes about as long as the slowest shutdown, rather than the sum of them.
+
+    Args:
+        content: The vim.ServiceContent object representing the vSphere content.
+        vms: The VMs to power off.
+        max_concurrent: Maximum number of PowerOff tasks running at the same time.
+        wait_seconds: Longest wait for a task update per PropertyCollector call.
+        timeout_seconds: Longest wait for all the VMs. VMs still powering off, or
+            not submitted yet, when it expires get a "timed out" error.
+
+    Returns:
+        dict: The error message for each VM, None for the VMs powered off.
+    """
+    collector_spec = vmodl.query.PropertyCollector
+    deadline = time.monotonic() + timeout_seconds
+    pending = list(reversed(vms))
+    # Task moId -> (VM, task filter, task properties received so far)
+    running: Dict[str, Tuple[vim.VirtualMachine, Any, Dict[str, Any]]] = {}
+    results: Dict[vim.VirtualMachine, Optional[str]] = {}
+
+    collector = content.propertyCollector.CreatePropertyCollector()
+    try:
+        version = ""
+        while pending or running:
+            # Submit tasks up to the concurrency cap
+            while pending and len(running) < max_concurrent:
+                vm = pending.pop()
+                try:
+                    task = vm.PowerOff()
+                    task_filter = collector.CreateFilter(
+                        collector_spec.FilterSpec(
+                            objectSet=[collector_spec.ObjectSpec(obj=task, skip=False)],
+                            propSet=[
+                                collector_spec.PropertySpec(
+                                    type=vim.Task, pathSet=["info.state", "info.error"], all=False
+                                )
+                            ],
+                        ),
+                        partialUpdates=False,
+                    )
+                except Exception as e:
+                    results[vm] = str(e)
+                    continue
+                running[task._moId] = (vm, task_filter, {})
+            if not running:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # A task stuck in the running state must not block the caller for ever
+                message = f"Timed out after {timeout_seconds:g}s waiting for the VM to power off."
+                for vm, task_filter, _ in running.values():
+                    results[vm] = message
+                    get_vm_index().invalidate(vm)
+                    try:
+                        task_filter.Destroy()
+                    except Exception:
+                        pass
+                for vm in pending:
+                    results[vm] = message
+                running.clear()
+                break
+
+            update_set = collector.WaitForUpdatesEx(
+                version=version,
+                options=collector_spec.WaitOptions(maxWaitSeconds=max(1, min(wait_seconds, math.ceil(remaining)))),
+            )
+            if update_set is None:
+                continue
+            version = update_set.version
+
+            for filter_update in update_set.filterSet or []:
+                for object_update in filter_update.objectSet or []:
+                    entry = running.get(object_update.obj._moId)
+                    if entry is None:
+                        continue
+                    vm, task_filter, info = entry
+                    for change in object_update.changeSet or []:
+                        info[change.name] = change.val
+
+                    state = info.get("info.state")
+                    if state not in (vim.TaskInfo.State.success, vim.TaskInfo.State.error):
+                        continue
+                    error = info.get("info.error")
+                    results[vm] = (
+                        None
+                        if state == vim.TaskInfo.State.success
+                        else getattr(error, "localizedMessage", None) or str(error)
+                    )
+                    del running[object_update.obj._moId]
+                    get_vm_index().invalidate(vm)
+                    try:
+                        task_filter.Destroy()
+                    except Exception:
+                        pass
+
+        return results
+
+    finally:
+        try:
+            collector.DestroyPropertyCollector()
+        except Exception:
+            pass
+
+
 def verify_vms_not_running(
     vm_names: List[str],
     si,
     content,
     warm_migration_supported: bool = False,
-) -> None:
+    max_concurrent: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+) -> Dict[str, Dict[str, str]]:
     """
     Ensures that all VMs in the list are not running if 'warm' migration is not supported.
 
+    Running VMs are powered off concurrently, see `power_off_vms`.
+
     Args:
         vm_names (List[str]): A list of VM names targeted for migration.
         warm_migration_supported (bool): Whether warm migration (live migration) is supported.
+        max_concurrent (int, optional): Maximum number of VMs powering off at the
+            same time. Defaults to the config.
+        timeout_seconds (float, optional): Longest wait for the VMs to power off.
+            Defaults to the config.
 
     Returns:
-        None
+        Dict[str, Dict[str, str]]: The result for each VM name, with a "status" of
+        "powered_off", "already_off", "unchanged" (warm migration), "not_found" or
+        "failed", and a "message".
+
+    Raises:
+        Exception: If the power states cannot be retrieved or changed.
     """
+    if max_concurrent is None:
+        max_concurrent = app_config.vsphere_config.max_concurrent_power_offs
+    if timeout_seconds is None:
+        timeout_seconds = app_config.vsphere_config.power_off_timeout
+
     try:
+        # Look up every VM at once, rebuilding the VM index at most once
+        vms = get_vm_index().find(content, vm_names)
+        found = list({vm: None for vm in vms.values() if vm})
+
+        # Read the current power states in one call, cached ones may be stale
+        power_states = {
+            vm: properties.get("runtime.powerState")
+            for vm, properties in retrieve_properties(
+                content, vim.VirtualMachine, ["runtime.powerState"], found
+            )
+        }
+
+        to_power_off = []
+        if not warm_migration_supported:
+            to_power_off = [
+                vm for vm in found if power_states.get(vm) == vim.VirtualMachinePowerState.poweredOn
+            ]
+        errors = (
+            power_off_vms(content, to_power_off, max_concurrent, timeout_seconds=timeout_seconds)
+            if to_power_off
+            else {}
+        )
 
+        report = {}
         for vm_name in vm_names:
-            vm = get_vm_by_name(content, vm_name)
+            vm = vms[vm_name]
             if not vm:
-                print(f"VM '{vm_name}' not found.")
-                continue
+                report[vm_name] = {"status": "not_found", "message": f"VM '{vm_name}' not found."}
+            elif warm_migration_supported:
+                report[vm_name] = {
+                    "status": "unchanged",
+                    "message": f"VM '{vm_name}' is currently {power_states.get(vm)}. No action needed.",
+                }
+            elif vm not in errors:
+                report[vm_name] = {"status": "already_off", "message": f"VM '{vm_name}' is already powered off."}
+            elif errors[vm] is None:
+                report[vm_name] = {
+                    "status": "powered_off",
+                    "message": f"VM '{vm_name}' was powered on and has been powered off for migration.",
+                }
+            else:
+                report[vm_name] = {
+                    "status": "failed",
+                    "message": f"Failed to manage power state for VM '{vm_name}': {errors[vm]}",
+                }
+            print(report[vm_name]["message"])
 
-            # Ensure VM is not running if warm migration is not supported
-            result = verify_vm_not_running(vm, warm_migration_supported)
-            print(result)
+        return report
 
     except Exception as e:
         print(f"Error during the operation: {str(e)}")
-
-    finally:
-        if si:
-            disconnect_from_vsphere(si)
+        raise
 
 
 def get_vm_by_name(content, vm_name: str) -> Optional[vim.VirtualMachine]:
@@ -246,28 +819,14 @@ def get_vm_by_name(content, vm_name: str) -> Optional[vim.VirtualMachine]:
         Optional[vim.VirtualMachine]: The VM object if found, or None if the VM is not found.
     """
     try:
-        # Create a container view for Virtual Machines
-        container = content.viewManager.CreateContainerView(
-            content.rootFolder, [vim.VirtualMachine], True
-        )
-
-        # Iterate over all VMs in the container and search for the VM by name
-        for vm in container.view:
-            if vm.name == vm_name:
-                return vm
-
         # Return None if the VM was not found
-        return None
+        return get_vm_index().get(content, vm_name)
 
     except Exception as e:
         raise Exception(f"Failed to retrieve VM by name '{vm_name}': {str(e)}")
 
-    finally:
-        if container:
-            container.Destroy()
-
 
-def find_vm_by_name(si, vm_name: str) -> str:
+def find_vm_by_name(si, vm_name: str) -> vim.VirtualMachine:
     """
     Finds a specific virtual machine (VM) by its name in the vSphere environment.
 
@@ -276,7 +835,7 @@ def find_vm_by_name(si, vm_name: str) -> str:
         vm_name: The name of the VM to find.
 
     Returns:
-        str: A message indicating the VM was found, or an error message if not found.
+        vim.VirtualMachine: The VM object.
 
     Raises:
         Exception: If there is an issue with finding the VM or it doesn't exist.
@@ -285,10 +844,10 @@ def find_vm_by_name(si, vm_name: str) -> str:
     try:
         content = si.RetrieveContent()
 
-        for datacenter in content.rootFolder.childEntity:
-            for vm in datacenter.vmFolder.childEntity:
-                if vm.name == vm_name:
-                    return f"VM '{vm_name}' found. Power state: {vm.runtime.powerState}"
+        # The VM index covers every folder, not only the top level of each datacenter
+        vm = get_vm_index().get(content, vm_name)
+        if vm:
+            return vm
 
         raise Exception(f"VM '{vm_name}' not found.")
 
@@ -316,6 +875,7 @@ def power_on_vm(si, vm_name: str) -> str:
 
         if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOn:
             vm.PowerOn()
+            get_vm_index().invalidate(vm)
             return f"VM '{vm_name}' powered on."
         else:
             return f"VM '{vm_name}' is already powered on."
@@ -344,6 +904,7 @@ def power_off_vm(si, vm_name: str) -> str:
 
         if vm.runtime.powerState != vim.VirtualMachinePowerState.poweredOff:
             vm.PowerOff()
+            get_vm_index().invalidate(vm)
             return f"VM '{vm_name}' powered off."
         else:
             return f"VM '{vm_name}' is already powered off."
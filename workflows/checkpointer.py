@@ -0,0 +1,87 @@
+import os
+import sqlite3
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import InMemorySaver
+from config.checkpoint_config import CheckpointConfig
+
+# Backends that persist nothing, the workflow then runs without a checkpointer
+DISABLED_BACKENDS = ("", "none", "off")
+
+
+def create_checkpointer(checkpoint_config: CheckpointConfig) -> BaseCheckpointSaver:
+    """
+    Create the checkpointer used to persist the workflow state after every node.
+
+    Parameters:
+    - checkpoint_config (CheckpointConfig): Selects the backend and its location.
+
+    Returns:
+    - BaseCheckpointSaver: The checkpointer, or None if checkpointing is disabled.
+
+    Raises:
+    - ValueError: If the backend is unknown.
+    """
+    backend = (checkpoint_config.backend or "").lower()
+    if backend in DISABLED_BACKENDS:
+        return None
+    if backend == "memory":
+        return InMemorySaver()
+    if backend == "sqlite":
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        _ensure_parent_directory(checkpoint_config.sqlite_path)
+        # Parallel engineer nodes run in worker threads and share the connection
+        connection = sqlite3.connect(checkpoint_config.sqlite_path, check_same_thread=False)
+        return SqliteSaver(connection)
+    raise ValueError(f"Unknown checkpoint backend '{checkpoint_config.backend}'.")
+
+
+def acreate_checkpointer(checkpoint_config: CheckpointConfig) -> BaseCheckpointSaver:
+    """
+    Create a checkpointer usable with `astream`/`ainvoke`.
+
+    Must be called from within the running event loop.
+
+    Parameters:
+    - checkpoint_config (CheckpointConfig): Selects the backend and its location.
+
+    Returns:
+    - BaseCheckpointSaver: The checkpointer, or None if checkpointing is disabled.
+
+    Raises:
+    - ValueError: If the backend is unknown.
+    """
+    backend = (checkpoint_config.backend or "").lower()
+    if backend == "sqlite":
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        _ensure_parent_directory(checkpoint_config.sqlite_path)
+        return AsyncSqliteSaver(aiosqlite.connect(checkpoint_config.sqlite_path))
+    return create_checkpointer(checkpoint_config)
+
+
+def close_checkpointer(checkpointer: BaseCheckpointSaver):
+    """
+    Close the database connection held by a SQLite checkpointer, if any.
+    """
+    connection = getattr(checkpointer, "conn", None)
+    if isinstance(connection, sqlite3.Connection):
+        connection.close()
+
+
+async def aclose_checkpointer(checkpointer: BaseCheckpointSaver):
+    """
+    Close the database connection held by an async SQLite checkpointer, if any.
+    """
+    connection = getattr(checkpointer, "conn", None)
+    if connection is not None and not isinstance(connection, sqlite3.Connection):
+        await connection.close()
+    else:
+        close_checkpointer(checkpointer)
+
+
+def _ensure_parent_directory(path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
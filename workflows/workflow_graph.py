@@ -1,11 +1,14 @@
+import asyncio
+import functools
 from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from agents.planner.planner_agent import PlannerAgent
 from agents.pm.pm_agent import PMAgent
 from agents.architect.architect_agent import ArchitectAgent
 from agents.engineer.engineer_agent import EngineerAgent
 from agents.engineer.jr_engineer_agent import JrEngineerAgent
 from agents.reviewer.reviewer_agent import ReviewerAgent
-from state.agent_state import get_last_entry_from_state
+from state.agent_state import get_last_entry_from_state, copy_state, get_state_updates
 from config.app_config import app_config
 from utils.helpers import get_current_utc_datetime
 from termcolor import colored
@@ -14,6 +17,41 @@ from utils import task_utils
 # Define state data structure (assuming you have AgentGraphState defined in one of the agent modules)
 from agents.base_agent import AgentGraphState
 
+
+def returns_state_updates(node_function):
+    """
+    Run a node on a working copy of the state and return the entries it appended.
+
+    Agents append to the state lists they are given. Handing them a copy and
+    returning the new entries lets the graph apply them through its reducers,
+    so every node's output is recorded by the checkpointer.
+
+    Parameters:
+    - node_function (callable): A sync or async node function mutating its state.
+
+    Returns:
+    - callable: A node function returning its state updates.
+    """
+    if asyncio.iscoroutinefunction(node_function):
+
+        @functools.wraps(node_function)
+        async def async_wrapper(state: AgentGraphState):
+            working_state = copy_state(state)
+            await node_function(working_state)
+            return get_state_updates(state, working_state)
+
+        return async_wrapper
+
+    @functools.wraps(node_function)
+    def wrapper(state: AgentGraphState):
+        working_state = copy_state(state)
+        node_function(working_state)
+        return get_state_updates(state, working_state)
+
+    return wrapper
+
+
+@returns_state_updates
 def planner_node_function(state: AgentGraphState):
     PlannerAgent(
         state=state,
@@ -23,6 +61,7 @@ def planner_node_function(state: AgentGraphState):
         user_request=state["user_request"],
         )
 
+@returns_state_updates
 def pm_node_function(state: AgentGraphState):
     PMAgent(
         state=state,
@@ -33,6 +72,7 @@ def pm_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
 def architect_node_function(state: AgentGraphState):
     ArchitectAgent(
         state=state,
@@ -43,6 +83,7 @@ def architect_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
 def ocp_engineer_node_function(state: AgentGraphState):
     EngineerAgent(
         state=state,
@@ -53,6 +94,7 @@ def ocp_engineer_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
 def vsphere_engineer_node_function(state: AgentGraphState):
     EngineerAgent(
         state=state,
@@ -63,6 +105,7 @@ def vsphere_engineer_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
 def jr_engineer_node_function(state: AgentGraphState):
     JrEngineerAgent(
         state=state,
@@ -73,6 +116,7 @@ def jr_engineer_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
 def reviewer_node_function(state: AgentGraphState):
     ReviewerAgent(
         state=state,
@@ -84,6 +128,50 @@ def reviewer_node_function(state: AgentGraphState):
     )
 
 
+@returns_state_updates
+async def aplanner_node_function(state: AgentGraphState):
+    await PlannerAgent(
+        state=state,
+        role="planner",
+        model_config=app_config.model_config,
+    ).ainvoke(
+        user_request=state["user_request"],
+    )
+
+
+@returns_state_updates
+async def apm_node_function(state: AgentGraphState):
+    await PMAgent(
+        state=state,
+        role="manager",
+        model_config=app_config.model_config,
+    ).ainvoke(
+        user_request=state["user_request"],
+    )
+
+
+async def avsphere_engineer_node_function(state: AgentGraphState):
+    # Engineer tools wrap blocking vSphere/OpenShift SDKs, so run them off the event loop
+    return await asyncio.to_thread(vsphere_engineer_node_function, state)
+
+
+async def ajr_engineer_node_function(state: AgentGraphState):
+    # Engineer tools wrap blocking vSphere/OpenShift SDKs, so run them off the event loop
+    return await asyncio.to_thread(jr_engineer_node_function, state)
+
+
+@returns_state_updates
+async def areviewer_node_function(state: AgentGraphState):
+    await ReviewerAgent(
+        state=state,
+        role="reviewer",
+        model_config=app_config.model_config,
+    ).ainvoke(
+        user_request=state["user_request"],
+        agent_update=get_last_entry_from_state(state, "ocp_engineer_response"),
+    )
+
+
 def should_continue(state):
     """
     Determines the next step in the workflow based on the agent's output.
@@ -96,23 +184,13 @@ def should_continue(state):
     """
     # Check if the tools_response contains a final answer or indication to stop
 
-    tasks_list = task_utils.get_tasks_list(state)
-
-    # Collect agents with pending tasks that have no open dependencies
+    # Collect agents with pending tasks that have no open dependencies, each agent
+    # once, so their engineer nodes fan out in parallel
     pending_agents = []
 
-    for task in tasks_list:
-        # Check if task is not completed and has no open dependencies
-        if task["status"] != "completed":
-            # Check dependencies
-            dependencies_completed = all(
-                dep_task["status"] == "completed"
-                for dep_task in tasks_list
-                if dep_task["task_id"] in task["dependencies"]
-            )
-            # Only add the agent if all dependencies are completed
-            if dependencies_completed:
-                pending_agents.append(task["agent"])
+    for task in task_utils.get_ready_tasks(state):
+        if task["agent"] not in pending_agents:
+            pending_agents.append(task["agent"])
 
     if pending_agents:
         print(
@@ -133,10 +211,14 @@ def should_continue(state):
         return END
 
 
-def create_graph() -> StateGraph:
+def create_graph(use_async: bool = False) -> StateGraph:
     """
     Create the state graph by defining nodes and edges.
-    
+
+    Parameters:
+    - use_async (bool): Use the async node functions so the compiled workflow
+      can be driven with `astream`/`ainvoke`.
+
     Returns:
     - StateGraph: The compiled state graph ready for execution.
     """
@@ -145,11 +227,18 @@ def create_graph() -> StateGraph:
     agents = ["ocp_engineer", "vsphere_engineer", END]
 
     # Add nodes
-    graph.add_node("planner", planner_node_function)
-    graph.add_node("manager", pm_node_function)
-    graph.add_node("ocp_engineer", jr_engineer_node_function)
-    graph.add_node("vsphere_engineer", vsphere_engineer_node_function)
-    graph.add_node("reviewer", reviewer_node_function)
+    if use_async:
+        graph.add_node("planner", aplanner_node_function)
+        graph.add_node("manager", apm_node_function)
+        graph.add_node("ocp_engineer", ajr_engineer_node_function)
+        graph.add_node("vsphere_engineer", avsphere_engineer_node_function)
+        graph.add_node("reviewer", areviewer_node_function)
+    else:
+        graph.add_node("planner", planner_node_function)
+        graph.add_node("manager", pm_node_function)
+        graph.add_node("ocp_engineer", jr_engineer_node_function)
+        graph.add_node("vsphere_engineer", vsphere_engineer_node_function)
+        graph.add_node("reviewer", reviewer_node_function)
 
     # Define the flow of the graph
     graph.add_edge(START, "planner")
@@ -163,15 +252,17 @@ def create_graph() -> StateGraph:
 
     return graph
 
-def compile_workflow(graph: StateGraph):
+def compile_workflow(graph: StateGraph, checkpointer: BaseCheckpointSaver = None):
     """
     Compile the workflow graph into an executable workflow.
-    
+
     Parameters:
     - graph (StateGraph): The graph to be compiled.
+    - checkpointer (BaseCheckpointSaver, optional): Persists the state after every
+      node so an interrupted run can be resumed by its `thread_id`.
 
     Returns:
     - The compiled workflow.
     """
-    workflow = graph.compile()
+    workflow = graph.compile(checkpointer=checkpointer)
     return workflow